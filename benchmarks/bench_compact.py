@@ -0,0 +1,64 @@
+"""Compare parse time and retained memory of UserDict and compact models.
+
+Run with ``python -m benchmarks.bench_compact``.
+"""
+
+import gc
+import time
+import tracemalloc
+
+from lxml import etree
+
+from pymusicbrainz.compact import CompactRoot
+from pymusicbrainz.model import Parser, Root
+
+from . import fixtures
+
+
+def parse(root, data):
+    parser = etree.XMLParser(target=Parser(root))
+    parser.feed(data)
+    return parser.close()
+
+
+def retained(root, data):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        tree = parse(root, data)
+        gc.collect()
+        return tracemalloc.get_traced_memory()[0] - before, tree
+    finally:
+        tracemalloc.stop()
+
+
+def best_time(root, data, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse(root, data)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(repeat=5):
+    cases = [
+        ("release 1x12", fixtures.release(1, 12)),
+        ("release 10x30", fixtures.release(10, 30)),
+        ("release 50x40", fixtures.release(50, 40)),
+        ("artist 2000 rels", fixtures.artist_relations(2000)),
+    ]
+    print(f"{'case':<18}{'model':<10}{'parse ms':>10}{'retained KiB':>14}")
+    for name, data in cases:
+        for label, root in (("userdict", Root), ("compact", CompactRoot)):
+            seconds = best_time(root, data, repeat)
+            size, _ = retained(root, data)
+            print(
+                f"{name:<18}{label:<10}{seconds * 1000:>10.2f}"
+                f"{size / 1024:>14.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
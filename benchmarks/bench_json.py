@@ -0,0 +1,77 @@
+"""Compare end-to-end parse throughput of XML and ``fmt=json`` responses.
+
+Both paths start from the response body and end with the same model tree.
+Run with ``python -m benchmarks.bench_json``.
+"""
+
+import time
+
+from lxml import etree
+
+from pymusicbrainz import jsonparser
+from pymusicbrainz.jsonparser import JSONParser
+from pymusicbrainz.model import Parser
+
+from . import fixtures
+
+
+def parse_xml(data, entity):
+    parser = etree.XMLParser(target=Parser())
+    parser.feed(data)
+    return parser.close()
+
+
+def parse_json(data, entity):
+    parser = JSONParser(entity=entity)
+    parser.feed(data)
+    return parser.close()
+
+
+def best_time(parse, data, entity, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse(data, entity)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(repeat=5):
+    decoder = "orjson" if jsonparser.orjson is not None else "json"
+    cases = [
+        (
+            "release 1x12",
+            "release",
+            fixtures.release(1, 12),
+            fixtures.release_json(1, 12),
+        ),
+        (
+            "release 10x30",
+            "release",
+            fixtures.release(10, 30),
+            fixtures.release_json(10, 30),
+        ),
+        (
+            "artist 2000 rels",
+            "artist",
+            fixtures.artist_relations(2000),
+            fixtures.artist_relations_json(2000),
+        ),
+    ]
+    print(f"json decoder: {decoder}")
+    print(f"{'case':<18}{'format':<8}{'KiB':>8}{'ms':>10}{'MB/s':>8}")
+    for name, entity, xml, json in cases:
+        assert parse_xml(xml, entity) == parse_json(json, entity)
+        for label, parse, data in (
+            ("xml", parse_xml, xml),
+            ("json", parse_json, json),
+        ):
+            seconds = best_time(parse, data, entity, repeat)
+            print(
+                f"{name:<18}{label:<8}{len(data) / 1024:>8.1f}"
+                f"{seconds * 1000:>10.2f}{len(data) / seconds / 1e6:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
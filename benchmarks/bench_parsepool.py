@@ -0,0 +1,59 @@
+"""Event loop stalls and wall time when parsing large responses.
+
+Parses several large releases concurrently inline, in a thread pool and
+in a process pool, while a ticker coroutine records the longest delay it
+sees.  Run with ``python -m benchmarks.bench_parsepool``.
+"""
+
+import asyncio
+import time
+
+from pymusicbrainz.parsepool import ParsePool, parse
+
+from . import fixtures
+
+ARGS = ("release", (), "xml", False, False)
+
+
+async def ticker(stop, lags):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.001)
+        lags.append(time.perf_counter() - start - 0.001)
+
+
+async def run(pool, bodies):
+    stop = asyncio.Event()
+    lags = []
+    tick = asyncio.ensure_future(ticker(stop, lags))
+    await asyncio.sleep(0.01)
+    start = time.perf_counter()
+    if pool is None:
+        for data in bodies:
+            parse(data, *ARGS)
+            await asyncio.sleep(0)
+    else:
+        await asyncio.gather(*(pool.parse(data, *ARGS) for data in bodies))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await tick
+    return elapsed, max(lags)
+
+
+async def main(count=8):
+    bodies = [fixtures.release(20, 30) for _ in range(count)]
+    print(f"{count} releases of {len(bodies[0]) / 1024:.0f} KiB")
+    print(f"{'mode':<10}{'wall ms':>10}{'max stall ms':>14}")
+    for name in ("inline", "thread", "process"):
+        pool = None if name == "inline" else ParsePool(name, threshold=0)
+        if pool is not None:
+            # start the workers before measuring
+            await pool.parse(fixtures.release(1, 1), *ARGS)
+        elapsed, stall = await run(pool, bodies)
+        if pool is not None:
+            pool.close()
+        print(f"{name:<10}{elapsed * 1000:>10.1f}{stall * 1000:>14.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.get_event_loop().run_until_complete(main())
@@ -0,0 +1,51 @@
+"""Compare full and projected parsing of a large release.
+
+Run with ``python -m benchmarks.bench_projection``.
+"""
+
+import time
+
+from lxml import etree
+
+from pymusicbrainz.model import Parser, Release
+from pymusicbrainz.projection import ProjectingParser, compile_fields
+
+from . import fixtures
+
+
+def parse(data, fields=None):
+    if fields is None:
+        target = Parser()
+    else:
+        plan = compile_fields(Release, tuple(fields))
+        target = ProjectingParser(plan={"metadata": {"release": plan}})
+    parser = etree.XMLParser(target=target)
+    parser.feed(data)
+    return parser.close()
+
+
+def best_time(data, fields, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse(data, fields)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(repeat=5):
+    data = fixtures.release(20, 30)
+    projections = [
+        ("full", None),
+        ("title", ["title"]),
+        ("track ids", ["title", "medium-list/track-list"]),
+        ("recordings", ["medium-list/track-list/recording/title"]),
+    ]
+    print(f"release 20x30, {len(data) / 1024:.0f} KiB")
+    print(f"{'fields':<14}{'ms':>10}")
+    for name, fields in projections:
+        print(f"{name:<14}{best_time(data, fields, repeat) * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
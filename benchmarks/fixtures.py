@@ -0,0 +1,281 @@
+"""Synthetic web service responses shaped like real MusicBrainz data."""
+
+import json
+import uuid
+from xml.sax.saxutils import escape
+
+HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<metadata xmlns="http://musicbrainz.org/ns/mmd-2.0#">'
+)
+FOOTER = "</metadata>"
+
+
+def mbid(*seed):
+    return str(uuid.uuid5(uuid.NAMESPACE_OID, "/".join(map(str, seed))))
+
+
+def artist_credit(seed):
+    return (
+        "<artist-credit><name-credit>"
+        f'<artist id="{mbid("artist", seed)}">'
+        f"<name>Artist {seed}</name>"
+        f"<sort-name>Artist {seed}</sort-name>"
+        "</artist></name-credit></artist-credit>"
+    )
+
+
+def track(medium, position):
+    seed = f"{medium}-{position}"
+    return (
+        f'<track id="{mbid("track", seed)}">'
+        f"<position>{position}</position><number>{position}</number>"
+        f"<length>{200000 + position}</length>"
+        + artist_credit(position % 7)
+        + f'<recording id="{mbid("recording", seed)}">'
+        f"<title>{escape(f'Track {seed} & more')}</title>"
+        f"<length>{200000 + position}</length>"
+        + artist_credit(position % 7)
+        + "</recording></track>"
+    )
+
+
+def _release(seed, media, tracks):
+    parts = [
+        f'<release id="{mbid("release", seed, media, tracks)}">',
+        "<title>Big Box</title>",
+        '<status id="4e304316-386d-3409-af2e-78857eec5cfe">Official</status>',
+        "<quality>normal</quality>",
+        "<text-representation><language>eng</language>"
+        "<script>Latn</script></text-representation>",
+        artist_credit(0),
+        "<date>2001-01-01</date><country>XW</country>",
+        "<barcode>0123456789012</barcode>",
+        "<cover-art-archive><artwork>true</artwork><count>3</count>"
+        "<front>true</front><back>true</back></cover-art-archive>",
+        f'<medium-list count="{media}">',
+    ]
+    for medium in range(1, media + 1):
+        parts.append(
+            f"<medium><position>{medium}</position>"
+            '<format id="9712d52a-4509-3d4b-a1a2-67c88c643e31">CD</format>'
+            f'<track-list count="{tracks}" offset="0">'
+        )
+        parts.extend(
+            track(medium, position) for position in range(1, tracks + 1)
+        )
+        parts.append("</track-list></medium>")
+    parts.append("</medium-list></release>")
+    return parts
+
+
+def release(media=1, tracks=12):
+    """A release looked up with ``recordings artist-credits``."""
+    parts = [HEADER]
+    parts.extend(_release(None, media, tracks))
+    parts.append(FOOTER)
+    return "".join(parts).encode()
+
+
+def release_browse(count=100, media=2, tracks=12):
+    """A page of ``/ws/2/release?artist=...&inc=recordings``."""
+    parts = [HEADER, f'<release-list count="{count * 10}" offset="0">']
+    for i in range(count):
+        parts.extend(_release(i, media, tracks))
+    parts.append("</release-list>")
+    parts.append(FOOTER)
+    return "".join(parts).encode()
+
+
+def artist_relations(count=200):
+    """An artist looked up with ``artist-rels url-rels aliases tags``."""
+    parts = [
+        HEADER,
+        f'<artist id="{mbid("artist", "rels", count)}" type="Group">',
+        "<name>Big Band</name><sort-name>Big Band</sort-name>",
+        "<country>KR</country>",
+        "<life-span><begin>2011-12-23</begin></life-span>",
+        f'<alias-list count="{count // 10}">',
+    ]
+    parts.extend(
+        f'<alias sort-name="Alias {i}" locale="en" primary="primary">'
+        f"Alias {i}</alias>"
+        for i in range(count // 10)
+    )
+    parts.append('</alias-list><relation-list target-type="artist">')
+    for i in range(count):
+        parts.append(
+            '<relation type="member of band"'
+            ' type-id="5be4c609-9afa-4ea0-910b-12ffb71e3821">'
+            f"<target>{mbid('member', i)}</target>"
+            "<direction>backward</direction>"
+            "<begin>2011-12</begin><end>2014-10-10</end><ended>true</ended>"
+            "<attribute-list><attribute"
+            ' type-id="4fd3b255-a7d7-4424-9a63-40fa543b601c">original'
+            "</attribute></attribute-list>"
+            f'<artist id="{mbid("member", i)}">'
+            f"<name>Member {i}</name><sort-name>Member {i}</sort-name>"
+            "</artist></relation>"
+        )
+    parts.append('</relation-list><tag-list count="20">')
+    parts.extend(
+        f'<tag count="{i}"><name>tag {i}</name></tag>' for i in range(20)
+    )
+    parts.append("</tag-list></artist>")
+    parts.append(FOOTER)
+    return "".join(parts).encode()
+
+
+def recording_browse(count=100, offset=0):
+    """A page of ``/ws/2/recording?artist=...``."""
+    parts = [HEADER, f'<recording-list count="{count * 40}" offset="{offset}">']
+    for i in range(offset, offset + count):
+        parts.append(
+            f'<recording id="{mbid("recording", "browse", i)}">'
+            f"<title>Recording {i}</title><length>{180000 + i}</length>"
+            "<disambiguation>live</disambiguation>"
+            f'<isrc-list count="1"><isrc id="USRC1{i:07d}"/></isrc-list>'
+            "</recording>"
+        )
+    parts.append("</recording-list>")
+    parts.append(FOOTER)
+    return "".join(parts).encode()
+
+
+def _artist_credit_json(seed):
+    return [
+        {
+            "name": f"Artist {seed}",
+            "joinphrase": "",
+            "artist": {
+                "id": mbid("artist", seed),
+                "name": f"Artist {seed}",
+                "sort-name": f"Artist {seed}",
+                "disambiguation": "",
+                "type": None,
+                "type-id": None,
+            },
+        }
+    ]
+
+
+def release_json(media=1, tracks=12):
+    """The ``fmt=json`` counterpart of :func:`release`."""
+    return json.dumps(
+        {
+            "id": mbid("release", None, media, tracks),
+            "title": "Big Box",
+            "status": "Official",
+            "status-id": "4e304316-386d-3409-af2e-78857eec5cfe",
+            "quality": "normal",
+            "text-representation": {"language": "eng", "script": "Latn"},
+            "artist-credit": _artist_credit_json(0),
+            "date": "2001-01-01",
+            "country": "XW",
+            "barcode": "0123456789012",
+            "asin": None,
+            "disambiguation": "",
+            "packaging": None,
+            "packaging-id": None,
+            "cover-art-archive": {
+                "artwork": True,
+                "count": 3,
+                "front": True,
+                "back": True,
+            },
+            "media": [
+                {
+                    "position": medium,
+                    "title": "",
+                    "format": "CD",
+                    "format-id": "9712d52a-4509-3d4b-a1a2-67c88c643e31",
+                    "track-count": tracks,
+                    "track-offset": 0,
+                    "tracks": [
+                        {
+                            "id": mbid("track", f"{medium}-{position}"),
+                            "position": position,
+                            "number": str(position),
+                            "title": f"Track {medium}-{position} & more",
+                            "length": 200000 + position,
+                            "artist-credit": _artist_credit_json(position % 7),
+                            "recording": {
+                                "id": mbid("recording", f"{medium}-{position}"),
+                                "title": f"Track {medium}-{position} & more",
+                                "length": 200000 + position,
+                                "video": False,
+                                "disambiguation": "",
+                                "artist-credit": _artist_credit_json(
+                                    position % 7
+                                ),
+                            },
+                        }
+                        for position in range(1, tracks + 1)
+                    ],
+                }
+                for medium in range(1, media + 1)
+            ],
+        }
+    ).encode()
+
+
+def artist_relations_json(count=200):
+    """The ``fmt=json`` counterpart of :func:`artist_relations`."""
+    return json.dumps(
+        {
+            "id": mbid("artist", "rels", count),
+            "type": "Group",
+            "type-id": None,
+            "name": "Big Band",
+            "sort-name": "Big Band",
+            "disambiguation": "",
+            "country": "KR",
+            "gender": None,
+            "gender-id": None,
+            "isnis": [],
+            "ipis": [],
+            "life-span": {"begin": "2011-12-23", "end": None, "ended": False},
+            "aliases": [
+                {
+                    "name": f"Alias {i}",
+                    "sort-name": f"Alias {i}",
+                    "locale": "en",
+                    "primary": True,
+                    "type": None,
+                    "type-id": None,
+                    "begin": None,
+                    "end": None,
+                    "ended": False,
+                }
+                for i in range(count // 10)
+            ],
+            "relations": [
+                {
+                    "type": "member of band",
+                    "type-id": "5be4c609-9afa-4ea0-910b-12ffb71e3821",
+                    "target-type": "artist",
+                    "direction": "backward",
+                    "begin": "2011-12",
+                    "end": "2014-10-10",
+                    "ended": True,
+                    "attributes": ["original"],
+                    "attribute-ids": {
+                        "original": "4fd3b255-a7d7-4424-9a63-40fa543b601c"
+                    },
+                    "attribute-values": {},
+                    "target-credit": "",
+                    "source-credit": "",
+                    "artist": {
+                        "id": mbid("member", i),
+                        "name": f"Member {i}",
+                        "sort-name": f"Member {i}",
+                        "disambiguation": "",
+                        "type": None,
+                        "type-id": None,
+                    },
+                }
+                for i in range(count)
+            ],
+            "tags": [{"count": i, "name": f"tag {i}"} for i in range(20)],
+        }
+    ).encode()
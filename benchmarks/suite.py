@@ -0,0 +1,217 @@
+"""Offline parser and model benchmark suite.
+
+For every fixture it measures
+
+* ``tokenize_s``: lxml parsing into a target doing nothing, the floor,
+* ``parse_s``: parsing with :class:`~pymusicbrainz.model.Parser`, also
+  given as elements/s and MB/s,
+* ``model_s``: replaying recorded parser events into ``Parser`` without
+  XML, i.e. the cost of ``model.py`` alone,
+* ``peak_bytes``: peak Python memory while parsing, from tracemalloc.
+
+Times are the best of ``--repeat`` runs.  Results go to stdout as a table
+and, with ``--json PATH``, to a JSON file; ``--compare PATH`` exits with
+status 1 if ``parse_s`` or ``model_s`` of any fixture got slower than the
+given baseline by more than ``--tolerance``.
+
+Run with ``python -m benchmarks.suite``.
+"""
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import lxml
+from lxml import etree
+
+from pymusicbrainz.model import Parser
+
+from . import fixtures
+
+test_data = Path(__file__).parent.parent / "tests" / "data"
+
+
+def fixture_set():
+    cases = [
+        (f"small/{path.stem[:8]}", path.read_bytes())
+        for path in sorted(test_data.glob("*/*.xml"))
+    ]
+    cases += [
+        ("small/release", fixtures.release(1, 12)),
+        ("small/artist-rels", fixtures.artist_relations(20)),
+        ("small/browse", fixtures.recording_browse(25)),
+        ("medium/release", fixtures.release(10, 30)),
+        ("medium/artist-rels", fixtures.artist_relations(500)),
+        ("medium/browse", fixtures.recording_browse(100)),
+        ("huge/release", fixtures.release(100, 40)),
+        ("huge/artist-rels", fixtures.artist_relations(10000)),
+        ("huge/browse", fixtures.release_browse(100, 2, 15)),
+    ]
+    return cases
+
+
+class NullTarget(object):
+    def start(self, tag, attrs):
+        pass
+
+    def end(self, tag):
+        pass
+
+    def data(self, data):
+        pass
+
+    def close(self):
+        pass
+
+
+class Recorder(object):
+    def __init__(self):
+        self.events = []
+        self.elements = 0
+
+    def start(self, tag, attrs):
+        self.elements += 1
+        self.events.append((0, tag, attrs))
+
+    def end(self, tag):
+        self.events.append((1, tag, None))
+
+    def data(self, data):
+        self.events.append((2, data, None))
+
+    def close(self):
+        return self
+
+
+def feed(target, data):
+    parser = etree.XMLParser(target=target)
+    parser.feed(data)
+    return parser.close()
+
+
+def replay(events):
+    parser = Parser()
+    for kind, value, attrs in events:
+        if kind == 0:
+            parser.start(value, attrs)
+        elif kind == 1:
+            parser.end(value)
+        else:
+            parser.data(value)
+    return parser.close()
+
+
+def best_time(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peak_memory(func):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(name, data, repeat):
+    recorder = feed(Recorder(), data)
+    # huge fixtures take long enough that fewer runs are as stable
+    if len(data) > 4 * 1024 * 1024:
+        repeat = max(1, repeat // 3)
+    tokenize = best_time(lambda: feed(NullTarget(), data), repeat)
+    parse = best_time(lambda: feed(Parser(), data), repeat)
+    model = best_time(lambda: replay(recorder.events), repeat)
+    return {
+        "fixture": name,
+        "bytes": len(data),
+        "elements": recorder.elements,
+        "tokenize_s": tokenize,
+        "parse_s": parse,
+        "model_s": model,
+        "elements_per_s": recorder.elements / parse,
+        "mb_per_s": len(data) / parse / 1e6,
+        "peak_bytes": peak_memory(lambda: feed(Parser(), data)),
+    }
+
+
+def compare(results, baseline, tolerance):
+    baseline = {result["fixture"]: result for result in baseline["results"]}
+    regressions = []
+    for result in results:
+        old = baseline.get(result["fixture"])
+        if old is None:
+            continue
+        for key in ("parse_s", "model_s"):
+            if result[key] > old[key] * (1 + tolerance):
+                regressions.append(
+                    f"{result['fixture']} {key}: {old[key] * 1000:.2f} ms"
+                    f" -> {result[key] * 1000:.2f} ms"
+                )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", help="baseline results to compare to")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument(
+        "--filter", default="", help="only run fixtures containing this"
+    )
+    args = parser.parse_args(argv)
+
+    results = []
+    print(
+        f"{'fixture':<22}{'KiB':>9}{'elements':>10}{'elem/s':>11}"
+        f"{'MB/s':>7}{'lxml ms':>9}{'parse ms':>10}{'model ms':>10}"
+        f"{'peak KiB':>10}"
+    )
+    for name, data in fixture_set():
+        if args.filter not in name:
+            continue
+        result = measure(name, data, args.repeat)
+        results.append(result)
+        print(
+            f"{name:<22}{result['bytes'] / 1024:>9.1f}"
+            f"{result['elements']:>10}{result['elements_per_s']:>11.0f}"
+            f"{result['mb_per_s']:>7.1f}{result['tokenize_s'] * 1000:>9.2f}"
+            f"{result['parse_s'] * 1000:>10.2f}"
+            f"{result['model_s'] * 1000:>10.2f}"
+            f"{result['peak_bytes'] / 1024:>10.0f}"
+        )
+
+    report = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "lxml": lxml.__version__,
+        "machine": platform.machine(),
+        "results": results,
+    }
+    if args.json:
+        with open(args.json, "w") as fp:
+            json.dump(report, fp, indent=2)
+    if args.compare:
+        with open(args.compare) as fp:
+            regressions = compare(results, json.load(fp), args.tolerance)
+        for regression in regressions:
+            print(f"regression: {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -15,4 +15,8 @@ from .model import (
     Series,
     Work,
     Url,
+    ListItem,
 )
+from .ratelimit import RateLimiter, LocalRateLimiter, FileRateLimiter
+from .exceptions import MusicBrainzError, ResponseError, NotFound
+from .scheduler import Priority
@@ -0,0 +1,111 @@
+import json
+import os
+import sqlite3
+import time
+import zlib
+
+from . import serialize
+from .exceptions import NotFound
+
+
+class Checkpoint(object):
+    """Progress of a batch lookup or crawl, kept in a SQLite file.
+
+    Finished lookups and their results are buffered and written together
+    with the job state at most every ``interval`` seconds, so a restarted
+    job loses no more than that.  Entities not found are finished too,
+    with ``None`` as result; other errors are retried on resume.
+    """
+
+    def __init__(self, path, interval=10.0):
+        self.interval = interval
+        self._db = sqlite3.connect(os.fspath(path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS done (entity TEXT NOT NULL,"
+            " id TEXT NOT NULL, data BLOB, PRIMARY KEY (entity, id))"
+            " WITHOUT ROWID"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS state (name TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL)"
+        )
+        self._db.commit()
+        self._done = []
+        self._state = {}
+        self._flushed = time.monotonic()
+
+    def completed(self, entity=None):
+        """Ids finished so far, as ``(entity, id)`` or of ``entity``."""
+        self.flush()
+        if entity is None:
+            return set(self._db.execute("SELECT entity, id FROM done"))
+        rows = self._db.execute(
+            "SELECT id FROM done WHERE entity = ?", (entity,)
+        )
+        return {row[0] for row in rows}
+
+    def results(self, entity=None):
+        """Yield ``(entity, id, result)`` of everything finished so far."""
+        self.flush()
+        rows = self._db.execute("SELECT entity, id, data FROM done")
+        for name, id, data in rows:
+            if entity is not None and name != entity:
+                continue
+            if data is not None:
+                data = serialize.loads(zlib.decompress(data))
+            yield name, id, data
+
+    def finish(self, entity, id, result):
+        """Record a finished lookup; ``result`` may be the error it raised.
+
+        Returns whether the lookup counts as finished.
+        """
+        if isinstance(result, NotFound):
+            result = None
+        elif isinstance(result, Exception):
+            return False
+        if result is not None:
+            result = zlib.compress(serialize.dumps(result), 1)
+        self._done.append((entity, id.lower(), result))
+        return True
+
+    def state(self, name, default=None):
+        if name in self._state:
+            return self._state[name]
+        row = self._db.execute(
+            "SELECT value FROM state WHERE name = ?", (name,)
+        ).fetchone()
+        if row is None:
+            return default
+        return json.loads(row[0])
+
+    def set_state(self, name, value):
+        """Set job state, any JSON value, to be written with the next
+        flush."""
+        self._state[name] = value
+
+    def due(self):
+        return time.monotonic() - self._flushed >= self.interval
+
+    def flush(self):
+        with self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO done (entity, id, data)"
+                " VALUES (?, ?, ?)",
+                self._done,
+            )
+            self._db.executemany(
+                "INSERT OR REPLACE INTO state (name, value) VALUES (?, ?)",
+                [
+                    (name, json.dumps(value))
+                    for name, value in self._state.items()
+                ],
+            )
+        self._done = []
+        self._state = {}
+        self._flushed = time.monotonic()
+
+    def close(self):
+        self.flush()
+        self._db.close()
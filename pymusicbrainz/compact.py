@@ -0,0 +1,160 @@
+import decimal
+from collections.abc import Mapping
+
+from . import model
+from .lazy import Lazy
+
+
+class Record(Mapping):
+    """Read-only mapping stored as a shared key layout plus a value tuple.
+
+    Records with the same keys in the same order share one ``_shape`` dict,
+    so each node costs one slotted object and one tuple instead of the
+    instance dict and data dict of a ``UserDict``.
+    """
+
+    __slots__ = ("_shape", "_values")
+
+    _shapes = {}
+
+    def __init__(self, attrs, childs, data):
+        self._set(self._fields(attrs, childs, data))
+
+    def _set(self, fields):
+        keys = tuple(fields)
+        shape = self._shapes.get(keys)
+        if shape is None:
+            shape = self._shapes.setdefault(
+                keys, {key: index for index, key in enumerate(keys)}
+            )
+        self._shape = shape
+        self._values = tuple(fields.values())
+
+    @classmethod
+    def from_dict(cls, fields):
+        record = cls.__new__(cls)
+        record._set(fields)
+        return record
+
+    def __getitem__(self, key):
+        index = self._shape[key]
+        value = self._values[index]
+        if type(value) is Lazy:
+            value = self._materialize(index, value)
+        return value
+
+    def _materialize(self, index, lazy):
+        value = lazy.materialize()
+        values = self._values
+        self._values = values[:index] + (value,) + values[index + 1 :]
+        return value
+
+    def __contains__(self, key):
+        return key in self._shape
+
+    def __iter__(self):
+        return iter(self._shape)
+
+    def __len__(self):
+        return len(self._values)
+
+    def get(self, key, default=None):
+        if key in self._shape:
+            return self[key]
+        return default
+
+    @property
+    def data(self):
+        return dict(self.items())
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.data!r})"
+
+
+def _fields(attrs, childs, data):
+    fields = dict(attrs)
+    for key, values in childs.items():
+        fields[key] = values[0]
+    return fields
+
+
+def _entity_fields(attrs, childs, data):
+    fields = dict(attrs)
+    for key, values in childs.items():
+        fields[key] = values if key == "relation-list" else values[0]
+    return fields
+
+
+def _child_fields(attrs, childs, data):
+    fields = dict(attrs)
+    fields["data"] = data
+    return fields
+
+
+def _rating_fields(attrs, childs, data):
+    fields = dict(attrs)
+    fields["data"] = decimal.Decimal(data)
+    return fields
+
+
+def _childs_only_fields(attrs, childs, data):
+    return {key: values[0] for key, values in childs.items()}
+
+
+def _list_fields(tag):
+    def fields(attrs, childs, data):
+        fields = dict(attrs)
+        fields["data"] = childs[tag]
+        return fields
+
+    return fields
+
+
+def _fields_for(cls):
+    if hasattr(cls, "tag"):
+        return _list_fields(cls.tag)
+    if issubclass(cls, model.Entity):
+        return _entity_fields
+    if issubclass(cls, model.Child):
+        return _child_fields
+    if cls is model.Rating:
+        return _rating_fields
+    if cls in (model.LifeSpan, model.TextRepresentation, model.Coordinates):
+        return _childs_only_fields
+    return _fields
+
+
+_classes = {}
+
+
+def compact_class(cls):
+    """Return the :class:`Record` counterpart of a model class.
+
+    Parse functions such as ``parse_str`` are returned unchanged, so the
+    result can stand in for ``cls`` anywhere in a ``mapping``.
+    """
+    if not isinstance(cls, type):
+        return cls
+    compact = _classes.get(cls)
+    if compact is None:
+        compact = _classes[cls] = type(
+            cls.__name__,
+            (Record,),
+            {
+                "__slots__": (),
+                "__module__": __name__,
+                "_fields": staticmethod(_fields_for(cls)),
+                "model": cls,
+            },
+        )
+        # registered before recursing, the model graph has cycles
+        compact.mapping = {
+            tag: compact_class(value)
+            for tag, value in getattr(cls, "mapping", {}).items()
+        }
+        if hasattr(cls, "tag"):
+            compact.tag = cls.tag
+    return compact
+
+
+CompactRoot = compact_class(model.Root)
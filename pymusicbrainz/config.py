@@ -113,3 +113,279 @@ class Config(UserDict):
     @rate_limit_interval.deleter
     def rate_limit_interval(self):
         del self.data["rate_limit_interval"]
+
+    @property
+    def rate_limit_burst(self):
+        return self.data.get("rate_limit_burst", 1)
+
+    @rate_limit_burst.setter
+    def rate_limit_burst(self, value):
+        self.data["rate_limit_burst"] = value
+
+    @rate_limit_burst.deleter
+    def rate_limit_burst(self):
+        del self.data["rate_limit_burst"]
+
+    @property
+    def rate_limit_file(self):
+        return self.data.get("rate_limit_file", None)
+
+    @rate_limit_file.setter
+    def rate_limit_file(self, value):
+        self.data["rate_limit_file"] = value
+
+    @rate_limit_file.deleter
+    def rate_limit_file(self):
+        del self.data["rate_limit_file"]
+
+    @property
+    def max_retries(self):
+        return self.data.get("max_retries", 5)
+
+    @max_retries.setter
+    def max_retries(self, value):
+        self.data["max_retries"] = value
+
+    @max_retries.deleter
+    def max_retries(self):
+        del self.data["max_retries"]
+
+    @property
+    def retry_backoff(self):
+        return self.data.get("retry_backoff", 1)
+
+    @retry_backoff.setter
+    def retry_backoff(self, value):
+        self.data["retry_backoff"] = value
+
+    @retry_backoff.deleter
+    def retry_backoff(self):
+        del self.data["retry_backoff"]
+
+    @property
+    def retry_backoff_max(self):
+        return self.data.get("retry_backoff_max", 60)
+
+    @retry_backoff_max.setter
+    def retry_backoff_max(self, value):
+        self.data["retry_backoff_max"] = value
+
+    @retry_backoff_max.deleter
+    def retry_backoff_max(self):
+        del self.data["retry_backoff_max"]
+
+    @property
+    def servers(self):
+        return self.data.get("servers", None)
+
+    @servers.setter
+    def servers(self, value):
+        self.data["servers"] = value
+
+    @servers.deleter
+    def servers(self):
+        del self.data["servers"]
+
+    @property
+    def http_cache_path(self):
+        return self.data.get("http_cache_path", None)
+
+    @http_cache_path.setter
+    def http_cache_path(self, value):
+        self.data["http_cache_path"] = value
+
+    @http_cache_path.deleter
+    def http_cache_path(self):
+        del self.data["http_cache_path"]
+
+    @property
+    def http_cache_ttl(self):
+        return self.data.get("http_cache_ttl", 3600)
+
+    @http_cache_ttl.setter
+    def http_cache_ttl(self, value):
+        self.data["http_cache_ttl"] = value
+
+    @http_cache_ttl.deleter
+    def http_cache_ttl(self):
+        del self.data["http_cache_ttl"]
+
+    @property
+    def http_cache_max_size(self):
+        return self.data.get("http_cache_max_size", 512 * 1024 * 1024)
+
+    @http_cache_max_size.setter
+    def http_cache_max_size(self, value):
+        self.data["http_cache_max_size"] = value
+
+    @http_cache_max_size.deleter
+    def http_cache_max_size(self):
+        del self.data["http_cache_max_size"]
+
+    @property
+    def entity_cache_size(self):
+        return self.data.get("entity_cache_size", None)
+
+    @entity_cache_size.setter
+    def entity_cache_size(self, value):
+        self.data["entity_cache_size"] = value
+
+    @entity_cache_size.deleter
+    def entity_cache_size(self):
+        del self.data["entity_cache_size"]
+
+    @property
+    def entity_cache_ttl(self):
+        return self.data.get("entity_cache_ttl", 3600)
+
+    @entity_cache_ttl.setter
+    def entity_cache_ttl(self, value):
+        self.data["entity_cache_ttl"] = value
+
+    @entity_cache_ttl.deleter
+    def entity_cache_ttl(self):
+        del self.data["entity_cache_ttl"]
+
+    @property
+    def parsed_cache_path(self):
+        return self.data.get("parsed_cache_path", None)
+
+    @parsed_cache_path.setter
+    def parsed_cache_path(self, value):
+        self.data["parsed_cache_path"] = value
+
+    @parsed_cache_path.deleter
+    def parsed_cache_path(self):
+        del self.data["parsed_cache_path"]
+
+    @property
+    def parsed_cache_ttl(self):
+        return self.data.get("parsed_cache_ttl", 86400)
+
+    @parsed_cache_ttl.setter
+    def parsed_cache_ttl(self, value):
+        self.data["parsed_cache_ttl"] = value
+
+    @parsed_cache_ttl.deleter
+    def parsed_cache_ttl(self):
+        del self.data["parsed_cache_ttl"]
+
+    @property
+    def negative_cache_ttl(self):
+        return self.data.get("negative_cache_ttl", None)
+
+    @negative_cache_ttl.setter
+    def negative_cache_ttl(self, value):
+        self.data["negative_cache_ttl"] = value
+
+    @negative_cache_ttl.deleter
+    def negative_cache_ttl(self):
+        del self.data["negative_cache_ttl"]
+
+    @property
+    def negative_cache_path(self):
+        return self.data.get("negative_cache_path", None)
+
+    @negative_cache_path.setter
+    def negative_cache_path(self, value):
+        self.data["negative_cache_path"] = value
+
+    @negative_cache_path.deleter
+    def negative_cache_path(self):
+        del self.data["negative_cache_path"]
+
+    @property
+    def compact_models(self):
+        return self.data.get("compact_models", False)
+
+    @compact_models.setter
+    def compact_models(self, value):
+        self.data["compact_models"] = value
+
+    @compact_models.deleter
+    def compact_models(self):
+        del self.data["compact_models"]
+
+    @property
+    def lazy_models(self):
+        return self.data.get("lazy_models", False)
+
+    @lazy_models.setter
+    def lazy_models(self, value):
+        self.data["lazy_models"] = value
+
+    @lazy_models.deleter
+    def lazy_models(self):
+        del self.data["lazy_models"]
+
+    @property
+    def response_format(self):
+        return self.data.get("response_format", "xml")
+
+    @response_format.setter
+    def response_format(self, value):
+        self.data["response_format"] = value
+
+    @response_format.deleter
+    def response_format(self):
+        del self.data["response_format"]
+
+    @property
+    def parse_pool(self):
+        return self.data.get("parse_pool", None)
+
+    @parse_pool.setter
+    def parse_pool(self, value):
+        self.data["parse_pool"] = value
+
+    @parse_pool.deleter
+    def parse_pool(self):
+        del self.data["parse_pool"]
+
+    @property
+    def parse_pool_workers(self):
+        return self.data.get("parse_pool_workers", None)
+
+    @parse_pool_workers.setter
+    def parse_pool_workers(self, value):
+        self.data["parse_pool_workers"] = value
+
+    @parse_pool_workers.deleter
+    def parse_pool_workers(self):
+        del self.data["parse_pool_workers"]
+
+    @property
+    def parse_pool_threshold(self):
+        return self.data.get("parse_pool_threshold", 1024 * 1024)
+
+    @parse_pool_threshold.setter
+    def parse_pool_threshold(self, value):
+        self.data["parse_pool_threshold"] = value
+
+    @parse_pool_threshold.deleter
+    def parse_pool_threshold(self):
+        del self.data["parse_pool_threshold"]
+
+    @property
+    def local_store_path(self):
+        return self.data.get("local_store_path", None)
+
+    @local_store_path.setter
+    def local_store_path(self, value):
+        self.data["local_store_path"] = value
+
+    @local_store_path.deleter
+    def local_store_path(self):
+        del self.data["local_store_path"]
+
+    @property
+    def toc_index_path(self):
+        return self.data.get("toc_index_path", None)
+
+    @toc_index_path.setter
+    def toc_index_path(self, value):
+        self.data["toc_index_path"] = value
+
+    @toc_index_path.deleter
+    def toc_index_path(self):
+        del self.data["toc_index_path"]
@@ -0,0 +1,55 @@
+import asyncio
+import glob
+import os
+
+from .parsepool import ParsePool
+
+
+def corpus_paths(source):
+    """Files of a corpus given as a directory, a glob pattern or a file."""
+    source = os.fspath(source)
+    if os.path.isdir(source):
+        for directory, dirnames, filenames in os.walk(source):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                if filename.endswith(".xml"):
+                    yield os.path.join(directory, filename)
+    elif os.path.exists(source):
+        yield source
+    else:
+        yield from sorted(glob.iglob(source, recursive=True))
+
+
+async def load_corpus(source, *args, pool=None, workers=None, max_pending=None):
+    """Parse every file of a corpus, by default in a process pool.
+
+    Yields ``(path, metadata)`` in completion order.  At most
+    ``max_pending`` files are parsed or waiting to be consumed at a time,
+    so memory stays bounded however large the corpus is.
+    """
+    own_pool = pool is None
+    if own_pool:
+        pool = ParsePool("process", workers)
+    if max_pending is None:
+        max_pending = 2 * (pool.workers or os.cpu_count() or 1)
+    paths = corpus_paths(source)
+    pending = {}
+    try:
+        while True:
+            while len(pending) < max_pending:
+                path = next(paths, None)
+                if path is None:
+                    break
+                pending[asyncio.ensure_future(pool.load(path, *args))] = path
+            if not pending:
+                break
+            done, _ = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for future in done:
+                yield pending.pop(future), future.result()
+    finally:
+        for future in pending:
+            future.cancel()
+        if own_pool:
+            pool.close()
@@ -0,0 +1,147 @@
+import asyncio
+from collections import deque, namedtuple
+
+from . import model
+from .scheduler import Priority
+
+Crawled = namedtuple("Crawled", "entity id depth result")
+
+# relation targets that can be looked up and crawled further
+target_types = tuple(
+    sorted(
+        tag
+        for tag, cls in model.Relation.mapping.items()
+        if isinstance(cls, type) and issubclass(cls, model.Entity)
+    )
+)
+
+
+def relation_targets(entity, relation_types=None):
+    """``(entity type, MBID)`` of the relation targets of ``entity``."""
+    for relations in entity.get("relation-list") or ():
+        target_type = relations.get("target-type")
+        if target_type not in target_types:
+            continue
+        for relation in relations.get("data") or ():
+            if relation_types is not None:
+                if relation.get("type") not in relation_types:
+                    continue
+            target = relation.get(target_type)
+            if target is not None and target.get("id"):
+                yield target_type, target["id"]
+
+
+async def crawl(
+    session,
+    start,
+    depth=1,
+    entities=None,
+    includes=None,
+    relation_types=None,
+    max_in_flight=8,
+    priority=Priority.normal,
+    checkpoint=None,
+):
+    """Breadth-first crawl of the relations from the ``(entity type, MBID)``
+    pairs of ``start``.
+
+    Targets up to ``depth`` relations away are looked up when their type is
+    in ``entities``, by default every type in :data:`target_types`.
+    ``includes`` maps an entity type to its lookup includes, by default the
+    ``-rels`` includes of the followed types.  Every MBID is looked up once,
+    at most ``max_in_flight`` at a time, and yields a :class:`Crawled` in
+    completion order; a failed lookup yields its error as ``result``.
+
+    With a :class:`~pymusicbrainz.checkpoint.Checkpoint` the frontier and
+    the finished lookups are saved to it, and a crawl it holds the
+    frontier of is resumed from there rather than from ``start``.  Lookups
+    that failed are retried on resume.  The checkpoint also keeps
+    ``start``, ``depth``, ``entities`` and ``relation_types``; resuming it
+    with different ones raises :class:`ValueError`.
+    """
+    if entities is None:
+        entities = target_types
+    entities = set(entities)
+    for entity in entities:
+        if entity not in target_types:
+            raise ValueError(f"invalid entity {entity}")
+    default_includes = sorted(f"{entity}-rels" for entity in entities)
+    if includes is None:
+        includes = {}
+    if relation_types is not None:
+        relation_types = set(relation_types)
+
+    frontier = deque()
+    seen = set()
+
+    def discover(entity, id, depth):
+        if id.lower() not in seen:
+            seen.add(id.lower())
+            frontier.append((entity, id, depth))
+
+    failed = []
+    pending = {}
+
+    def save():
+        checkpoint.set_state(
+            "frontier", failed + list(pending.values()) + list(frontier)
+        )
+        checkpoint.flush()
+
+    start = [(entity, id) for entity, id in start]
+    job = {
+        "start": [[entity, id.lower()] for entity, id in start],
+        "depth": depth,
+        "entities": sorted(entities),
+        "relation_types": (
+            None if relation_types is None else sorted(relation_types)
+        ),
+    }
+    saved = None if checkpoint is None else checkpoint.state("frontier")
+    if saved is None:
+        if checkpoint is not None:
+            checkpoint.set_state("crawl", job)
+        for entity, id in start:
+            discover(entity, id, 0)
+    else:
+        if checkpoint.state("crawl") != job:
+            raise ValueError("checkpoint holds a different crawl")
+        seen.update(id for _, id in checkpoint.completed())
+        for entity, id, level in saved:
+            discover(entity, id, level)
+    try:
+        while frontier or pending:
+            while frontier and len(pending) < max_in_flight:
+                entity, id, level = frontier.popleft()
+                lookup = session.lookup(
+                    entity,
+                    id,
+                    includes.get(entity, default_includes),
+                    priority,
+                )
+                pending[asyncio.ensure_future(lookup)] = (entity, id, level)
+            done, _ = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for future in done:
+                entity, id, level = pending.pop(future)
+                error = future.exception()
+                result = None if error is not None else future.result()
+                if checkpoint is not None:
+                    if not checkpoint.finish(entity, id, error or result):
+                        failed.append((entity, id, level))
+                if error is not None:
+                    yield Crawled(entity, id, level, error)
+                    continue
+                if level < depth:
+                    for target in relation_targets(result, relation_types):
+                        if target[0] in entities:
+                            discover(*target, level + 1)
+                yield Crawled(entity, id, level, result)
+            if checkpoint is not None and checkpoint.due():
+                save()
+    finally:
+        for future in pending:
+            future.cancel()
+        if checkpoint is not None:
+            save()
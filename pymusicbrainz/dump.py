@@ -0,0 +1,101 @@
+"""Ingest the MusicBrainz JSON data dumps into a local store.
+
+The dumps are tarballs, e.g. ``artist.tar.xz``, holding one
+``mbdump/<entity>`` file with an entity per line in the format of the
+``fmt=json`` web service with every include.  They are read as a stream,
+so a multi-GB dump needs no more memory than one batch of entities.
+
+Run with ``python -m pymusicbrainz.dump STORE DUMP...``.
+"""
+
+import argparse
+import os
+import sys
+import tarfile
+import time
+
+from .jsonparser import build_metadata, loads
+from .localstore import LocalStore
+from .model import Root
+
+entities = (
+    "area",
+    "artist",
+    "event",
+    "instrument",
+    "label",
+    "place",
+    "recording",
+    "release",
+    "release-group",
+    "series",
+    "work",
+)
+
+
+def member_entity(name):
+    directory, _, entity = name.rpartition("/")
+    if directory.rpartition("/")[2] != "mbdump" or entity not in entities:
+        return None
+    return entity
+
+
+def ingest(store, path, batch_size=5000, root=Root):
+    """Stream the dump tarball at ``path`` into ``store``.
+
+    Every batch is committed together with the number of lines read, keyed
+    by the file name of the dump, so running it again after an interruption
+    skips what is already stored.  Returns the number of entities stored.
+    """
+    source = os.path.basename(os.fspath(path))
+    metadata_cls = root.mapping["metadata"]
+    stored = 0
+    with tarfile.open(os.fspath(path), "r|*") as tar:
+        for member in tar:
+            entity = member_entity(member.name)
+            if entity is None or not member.isfile():
+                continue
+            skip, done = store.progress(source, member.name)
+            if done:
+                continue
+            fp = tar.extractfile(member)
+            batch = []
+            lines = 0
+            for lines, line in enumerate(fp, 1):
+                if lines <= skip or not line.strip():
+                    continue
+                obj = loads(line)
+                metadata = build_metadata(metadata_cls, obj, entity)
+                batch.append((obj["id"], metadata[entity]))
+                if len(batch) >= batch_size:
+                    store.put_batch(entity, batch, source, member.name, lines)
+                    stored += len(batch)
+                    batch = []
+            store.put_batch(
+                entity, batch, source, member.name, max(lines, skip), True
+            )
+            stored += len(batch)
+    return stored
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("store", help="SQLite file of the local store")
+    parser.add_argument("dumps", nargs="+", help="JSON dump tarballs")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    store = LocalStore(args.store)
+    try:
+        for path in args.dumps:
+            start = time.perf_counter()
+            stored = ingest(store, path, args.batch_size)
+            elapsed = time.perf_counter() - start
+            print(f"{path}: {stored} entities in {elapsed:.1f} s")
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
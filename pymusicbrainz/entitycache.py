@@ -0,0 +1,93 @@
+import sys
+import time
+from collections import OrderedDict, UserDict, namedtuple
+
+from .compact import Record
+
+CacheEntry = namedtuple("CacheEntry", ("includes", "entity", "size", "expires"))
+
+
+def approximate_size(obj):
+    size = 0
+    stack = [obj]
+    seen = set()
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        if isinstance(obj, UserDict):
+            size += sys.getsizeof(obj.__dict__)
+            obj = obj.data
+            size += sys.getsizeof(obj)
+        elif isinstance(obj, Record):
+            # the key layout is shared between records and not counted
+            stack.append(obj._values)
+            continue
+        if isinstance(obj, dict):
+            # plain dict views, lazily built data must not be materialized
+            stack.extend(dict.keys(obj))
+            stack.extend(dict.values(obj))
+        elif isinstance(obj, (list, tuple)):
+            stack.extend(obj)
+    return size
+
+
+class EntityCache(object):
+    """LRU cache of parsed entities bounded by an approximate byte budget.
+
+    Every copy remembers the includes it was fetched with, so a lookup is
+    answered by any fresh copy fetched with a superset of its includes.
+    """
+
+    def __init__(self, max_size=64 * 1024 * 1024, ttl=3600):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.size = 0
+        self._entries = OrderedDict()
+
+    @classmethod
+    def from_config(cls, config):
+        if not config.entity_cache_size:
+            return None
+        return cls(config.entity_cache_size, config.entity_cache_ttl)
+
+    def __len__(self):
+        return sum(len(entries) for entries in self._entries.values())
+
+    def get(self, name, id, includes):
+        key = (name, id.lower())
+        entries = self._entries.get(key)
+        if not entries:
+            return None
+        includes = frozenset(includes)
+        now = time.monotonic()
+        for entry in entries:
+            if entry.expires > now and entry.includes >= includes:
+                self._entries.move_to_end(key)
+                return entry.entity
+        return None
+
+    def put(self, name, id, includes, entity):
+        key = (name, id.lower())
+        includes = frozenset(includes)
+        now = time.monotonic()
+        entries = []
+        for entry in self._entries.pop(key, []):
+            # copies with fewer includes, or expired ones, are now useless
+            if entry.expires <= now or entry.includes <= includes:
+                self.size -= entry.size
+            else:
+                entries.append(entry)
+        size = approximate_size(entity)
+        entries.append(CacheEntry(includes, entity, size, now + self.ttl))
+        self._entries[key] = entries
+        self.size += size
+        while self.size > self.max_size and self._entries:
+            _, entries = self._entries.popitem(last=False)
+            self.size -= sum(entry.size for entry in entries)
+
+    def clear(self):
+        self._entries.clear()
+        self.size = 0
@@ -0,0 +1,18 @@
+class MusicBrainzError(Exception):
+    pass
+
+
+class ResponseError(MusicBrainzError):
+    def __init__(self, status_code, url=None):
+        super().__init__(f"unexpected response {status_code} from {url}")
+        self.status_code = status_code
+        self.url = url
+
+
+class NotFound(ResponseError):
+    def __init__(self, url=None, entity=None, id=None):
+        super().__init__(404, url)
+        self.entity = entity
+        self.id = id
+        if entity is not None:
+            self.args = (f"{entity} {id} not found",)
@@ -0,0 +1,212 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from logging import getLogger
+
+log = getLogger(__name__)
+
+
+class CacheEntry(object):
+    def __init__(self, cache, key, meta):
+        self.cache = cache
+        self.key = key
+        self.meta = meta
+
+    @property
+    def body_path(self):
+        return self.cache._path(self.key, ".body")
+
+    def is_fresh(self, now=None):
+        if now is None:
+            now = time.time()
+        return now < self.meta["stored"] + self.cache.ttl
+
+    def conditional_headers(self):
+        headers = {}
+        if self.meta.get("etag"):
+            headers["If-None-Match"] = self.meta["etag"]
+        if self.meta.get("last-modified"):
+            headers["If-Modified-Since"] = self.meta["last-modified"]
+        return headers
+
+
+class CachedResponse(object):
+    status_code = 200
+
+    def __init__(self, entry, url=None, chunk_size=65536):
+        self.headers = dict(entry.meta.get("headers", {}))
+        if "size" in entry.meta:
+            self.headers["Content-Length"] = str(entry.meta["size"])
+        self.url = url
+        self._fp = open(entry.body_path, "rb")
+        self._chunk_size = chunk_size
+
+    async def aiter_bytes(self):
+        while True:
+            chunk = self._fp.read(self._chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+    async def aread(self):
+        return self._fp.read()
+
+    async def aclose(self):
+        self._fp.close()
+
+
+class CachingResponse(object):
+    """Passes a response through while writing its body to the cache."""
+
+    def __init__(self, cache, key, response):
+        self._cache = cache
+        self._key = key
+        self._response = response
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.url = response.url
+
+    async def aiter_bytes(self):
+        fd, tmp_path = tempfile.mkstemp(dir=self._cache.path, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fp:
+                async for chunk in self._response.aiter_bytes():
+                    fp.write(chunk)
+                    yield chunk
+            self._cache._commit(self._key, self.headers, tmp_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    async def aread(self):
+        chunks = []
+        async for chunk in self.aiter_bytes():
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    async def aclose(self):
+        await self._response.aclose()
+
+
+class HTTPCache(object):
+    """On-disk store of response bodies and their validators.
+
+    Entries younger than ``ttl`` are served without touching the network,
+    older ones are revalidated with a conditional request.  The least
+    recently used entries are evicted once ``max_size`` bytes are exceeded.
+    """
+
+    kept_headers = ("Content-Type", "ETag", "Last-Modified")
+
+    def __init__(self, path, ttl=3600, max_size=512 * 1024 * 1024):
+        self.path = os.fspath(path)
+        self.ttl = ttl
+        self.max_size = max_size
+        os.makedirs(self.path, exist_ok=True)
+        self._size = None
+
+    @classmethod
+    def from_config(cls, config):
+        if not config.http_cache_path:
+            return None
+        return cls(
+            config.http_cache_path,
+            config.http_cache_ttl,
+            config.http_cache_max_size,
+        )
+
+    @staticmethod
+    def key(path, params):
+        data = json.dumps([path, sorted(params.items())])
+        return hashlib.sha256(data.encode()).hexdigest()
+
+    def _path(self, key, suffix):
+        return os.path.join(self.path, key[:2], key + suffix)
+
+    def get(self, key):
+        try:
+            with open(self._path(key, ".meta")) as fp:
+                meta = json.load(fp)
+        except (OSError, ValueError):
+            return None
+        if not os.path.exists(self._path(key, ".body")):
+            return None
+        return CacheEntry(self, key, meta)
+
+    def open(self, entry, url=None):
+        try:
+            # the modification time of the meta file tracks the last use
+            os.utime(self._path(entry.key, ".meta"))
+        except OSError:
+            pass
+        return CachedResponse(entry, url)
+
+    def wrap(self, key, response):
+        return CachingResponse(self, key, response)
+
+    def revalidated(self, entry):
+        entry.meta["stored"] = time.time()
+        self._write_meta(entry.key, entry.meta)
+
+    def _write_meta(self, key, meta):
+        path = self._path(key, ".meta")
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, "w") as fp:
+            json.dump(meta, fp)
+        os.replace(tmp_path, path)
+
+    def _commit(self, key, headers, tmp_path):
+        os.makedirs(os.path.join(self.path, key[:2]), exist_ok=True)
+        # a refresh replaces the entry, which no longer counts
+        old = self.get(key)
+        old_size = 0 if old is None else old.meta.get("size", 0)
+        size = os.path.getsize(tmp_path)
+        os.replace(tmp_path, self._path(key, ".body"))
+        headers = {
+            name: headers[name] for name in self.kept_headers if name in headers
+        }
+        self._write_meta(
+            key,
+            {
+                "stored": time.time(),
+                "size": size,
+                "etag": headers.get("ETag"),
+                "last-modified": headers.get("Last-Modified"),
+                "headers": headers,
+            },
+        )
+        if self._size is not None:
+            self._size += size - old_size
+        self._evict()
+
+    def _entries(self):
+        for directory in os.scandir(self.path):
+            if not directory.is_dir():
+                continue
+            for entry in os.scandir(directory.path):
+                if entry.name.endswith(".meta"):
+                    key = entry.name[: -len(".meta")]
+                    try:
+                        stat = os.stat(self._path(key, ".body"))
+                    except OSError:
+                        continue
+                    yield entry.stat().st_mtime, stat.st_size, key
+
+    def _evict(self):
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self._entries())
+        if self._size <= self.max_size:
+            return
+        target = self.max_size * 0.9
+        for mtime, size, key in sorted(self._entries()):
+            if self._size <= target:
+                break
+            for suffix in (".meta", ".body"):
+                try:
+                    os.unlink(self._path(key, suffix))
+                except OSError:
+                    pass
+            self._size -= size
+            log.debug("evicted %s from http cache", key)
@@ -0,0 +1,332 @@
+import json
+from collections import defaultdict
+
+from . import model
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# JSON arrays and the XML list elements they stand for
+list_tags = {
+    "aliases": "alias-list",
+    "areas": "area-list",
+    "artists": "artist-list",
+    "attributes": "attribute-list",
+    "collections": "collection-list",
+    "data-tracks": "data-track-list",
+    "discs": "disc-list",
+    "events": "event-list",
+    "genres": "genre-list",
+    "instruments": "instrument-list",
+    "ipis": "ipi-list",
+    "isnis": "isni-list",
+    "iso-3166-1-codes": "iso-3166-1-code-list",
+    "iso-3166-2-codes": "iso-3166-2-code-list",
+    "iso-3166-3-codes": "iso-3166-3-code-list",
+    "isrcs": "isrc-list",
+    "iswcs": "iswc-list",
+    "label-info": "label-info-list",
+    "labels": "label-list",
+    "languages": "language-list",
+    "media": "medium-list",
+    "offsets": "offset-list",
+    "places": "place-list",
+    "recordings": "recording-list",
+    "relations": "relation-list",
+    "release-events": "release-event-list",
+    "release-groups": "release-group-list",
+    "releases": "release-list",
+    "secondary-types": "secondary-type-list",
+    "series": "series-list",
+    "tags": "tag-list",
+    "tracks": "track-list",
+    "urls": "url-list",
+    "user-genres": "user-genre-list",
+    "user-tags": "user-tag-list",
+    "works": "work-list",
+}
+
+# lists the XML web service writes without a count
+uncounted = {
+    "artist-credit",
+    "attribute-list",
+    "ipi-list",
+    "isni-list",
+    "iso-3166-1-code-list",
+    "iso-3166-2-code-list",
+    "iso-3166-3-code-list",
+    "language-list",
+    "relation-list",
+    "secondary-type-list",
+}
+
+# keys written as XML attributes rather than child elements
+attributes = {"count", "id", "joinphrase", "type", "type-id"}
+
+
+def _text(value):
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    return str(value)
+
+
+def _model(cls):
+    return getattr(cls, "model", cls)
+
+
+def _empty(key, value):
+    # the XML web service leaves out what JSON spells as null, "" or false
+    return (
+        value is None
+        or value == ""
+        or (key in ("ended", "video") and not value)
+        or (key == "direction" and value == "forward")
+    )
+
+
+def _record(cls, obj, attrs=None, childs=None):
+    if attrs is None:
+        attrs = {}
+    if childs is None:
+        childs = defaultdict(list)
+    mapping = cls.mapping
+    for key, value in obj.items():
+        if _empty(key, value):
+            continue
+        if key in attributes and key not in mapping:
+            attrs[key] = _text(value)
+            continue
+        if key == "score":
+            attrs[model.ext_score] = _text(value)
+            continue
+        if key == "relations":
+            childs["relation-list"].extend(
+                _relation_lists(mapping["relation-list"], value)
+            )
+            continue
+        tag = list_tags.get(key, key)
+        child_cls = mapping.get(tag)
+        if child_cls is None:
+            continue
+        if hasattr(child_cls, "tag"):
+            if not value:
+                continue
+            child = _list(child_cls, value, obj, key)
+        else:
+            child = _value(child_cls, key, value, obj)
+        if child is not None:
+            childs[tag].append(child)
+    if not attrs and not childs:
+        return None
+    return cls(attrs, childs, None)
+
+
+def _value(cls, key, value, parent):
+    if not isinstance(cls, type):
+        if isinstance(value, dict):
+            # user-rating
+            value = value.get("value")
+            if value is None:
+                return None
+        return cls({}, {}, _text(value))
+    base = _model(cls)
+    if issubclass(base, model.Child) and isinstance(value, str):
+        # gender, status, packaging, format, primary-type and their ids
+        attrs = {}
+        if parent.get(key + "-id"):
+            attrs["id"] = parent[key + "-id"]
+        return cls(attrs, {}, value)
+    builder = _builders.get(base)
+    if builder is not None:
+        return builder(cls, value)
+    return _record(cls, value)
+
+
+def _list(cls, items, parent, key, attrs=None):
+    if attrs is None:
+        attrs = {}
+        tag = list_tags.get(key, key)
+        if tag not in uncounted:
+            prefix = tag[: -len("-list")]
+            attrs["count"] = _text(parent.get(prefix + "-count", len(items)))
+            if parent.get(prefix + "-offset") is not None:
+                attrs["offset"] = _text(parent[prefix + "-offset"])
+    item_cls = cls.mapping[cls.tag]
+    base = _model(item_cls)
+    values = []
+    for index, item in enumerate(items):
+        if base is model.ISRC:
+            value = item_cls({"id": item}, defaultdict(list), None)
+        elif base is model.Offset:
+            value = item_cls({"position": _text(index + 1)}, {}, _text(item))
+        elif base is model.SecondaryType:
+            ids = parent.get("secondary-type-ids") or []
+            value = item_cls(
+                {"id": ids[index]} if index < len(ids) else {}, {}, item
+            )
+        elif base is model.RelationAttribute:
+            value = _relation_attribute(item_cls, item, parent)
+        else:
+            value = _value(item_cls, cls.tag, item, parent)
+        if value is not None:
+            values.append(value)
+    childs = defaultdict(list)
+    childs[cls.tag] = values
+    return cls(attrs, childs, None)
+
+
+def _relation_lists(cls, relations):
+    groups = {}
+    for relation in relations:
+        groups.setdefault(relation["target-type"], []).append(relation)
+    return [
+        _list(cls, items, {}, "relations", {"target-type": target_type})
+        for target_type, items in groups.items()
+    ]
+
+
+def _relation(cls, obj):
+    target_type = obj["target-type"]
+    target = obj.get(target_type) or {}
+    if target_type == "url":
+        target_id = target.get("resource")
+    else:
+        target_id = target.get("id")
+    childs = defaultdict(list)
+    if target_id:
+        childs["target"].append(target_id)
+    return _record(cls, obj, childs=childs)
+
+
+def _relation_attribute(cls, name, relation):
+    attrs = {}
+    for key, attr in (
+        ("attribute-ids", "type-id"),
+        ("attribute-values", "value"),
+        ("attribute-credits", "credited-as"),
+    ):
+        value = (relation.get(key) or {}).get(name)
+        if value:
+            attrs[attr] = value
+    return cls(attrs, {}, name)
+
+
+def _alias(cls, obj):
+    attrs = {}
+    for key, attr in (
+        ("sort-name", "sort-name"),
+        ("locale", "locale"),
+        ("type", "type"),
+        ("type-id", "type-id"),
+        ("begin", "begin-date"),
+        ("end", "end-date"),
+    ):
+        if obj.get(key):
+            attrs[attr] = obj[key]
+    if obj.get("primary"):
+        attrs["primary"] = "primary"
+    return cls(attrs, {}, obj.get("name"))
+
+
+def _work_attribute(cls, obj):
+    attrs = {
+        key: obj[key] for key in ("type", "type-id", "value-id") if obj.get(key)
+    }
+    return cls(attrs, {}, obj.get("value"))
+
+
+def _rating(cls, obj):
+    if obj.get("value") is None:
+        return None
+    return cls(
+        {"votes-count": _text(obj.get("votes-count", 0))},
+        {},
+        _text(obj["value"]),
+    )
+
+
+# Credited names and track titles are only written to XML where they
+# differ from the artist name and the recording title.
+def _name_credit(cls, obj):
+    if obj.get("name") == (obj.get("artist") or {}).get("name"):
+        obj = {key: value for key, value in obj.items() if key != "name"}
+    return _record(cls, obj)
+
+
+def _track(cls, obj):
+    if obj.get("title") == (obj.get("recording") or {}).get("title"):
+        obj = {key: value for key, value in obj.items() if key != "title"}
+    return _record(cls, obj)
+
+
+def _annotation(cls, text):
+    childs = defaultdict(list)
+    childs["text"].append(text)
+    return cls({}, childs, None)
+
+
+_builders = {
+    model.Alias: _alias,
+    model.Annotation: _annotation,
+    model.NameCredit: _name_credit,
+    model.Rating: _rating,
+    model.Relation: _relation,
+    model.Track: _track,
+    model.WorkAttribute: _work_attribute,
+}
+
+
+def build_metadata(metadata_cls, obj, entity):
+    """Turn a decoded JSON response into the tree the XML parser builds.
+
+    ``entity`` names the resource requested, e.g. ``"artist"`` for both a
+    lookup and a browse of artists.
+    """
+    childs = defaultdict(list)
+    if "id" in obj:
+        child = _value(metadata_cls.mapping[entity], entity, obj, {})
+        childs[entity].append(child)
+        return metadata_cls({}, childs, None)
+    for key, value in obj.items():
+        tag = list_tags.get(key)
+        if tag is None or not isinstance(value, list):
+            continue
+        prefix = tag[: -len("-list")]
+        attrs = {"count": _text(obj.get(prefix + "-count", obj.get("count")))}
+        offset = obj.get(prefix + "-offset", obj.get("offset"))
+        if offset is not None:
+            attrs["offset"] = _text(offset)
+        list_cls = metadata_cls.mapping[tag]
+        childs[tag].append(_list(list_cls, value, obj, key, attrs))
+    attrs = {}
+    if obj.get("created"):
+        attrs["created"] = obj["created"]
+    return metadata_cls(attrs, childs, None)
+
+
+class JSONParser(object):
+    """Drop-in for a target ``XMLParser`` reading ``fmt=json`` responses."""
+
+    def __init__(self, root=model.Root, entity=None):
+        self.root = root
+        self.entity = entity
+        self._chunks = []
+
+    def feed(self, data):
+        self._chunks.append(data)
+
+    def close(self):
+        obj = loads(b"".join(self._chunks))
+        self._chunks = []
+        return build_metadata(self.root.mapping["metadata"], obj, self.entity)
@@ -0,0 +1,131 @@
+from collections import UserDict, defaultdict
+
+from lxml import etree
+
+from .model import Parser, Root
+
+_normalize = Parser._normalize
+
+
+class Lazy(object):
+    """Items of a list kept as XML, built the first time they are read."""
+
+    __slots__ = ("cls", "xml")
+
+    def __init__(self, cls, xml):
+        self.cls = cls
+        self.xml = xml
+
+    def materialize(self):
+        element = etree.fromstring(b"<items>" + self.xml + b"</items>")
+        return [_build(self.cls, item, {}) for item in element]
+
+
+class LazyData(dict):
+    """Model data replacing :class:`Lazy` values on first access."""
+
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)
+        if type(value) is Lazy:
+            value = value.materialize()
+            dict.__setitem__(self, key, value)
+        return value
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def values(self):
+        return [self[key] for key in self]
+
+    def items(self):
+        return [(key, self[key]) for key in self]
+
+    def __eq__(self, other):
+        return dict(self.items()) == other
+
+    def __ne__(self, other):
+        return not self == other
+
+
+def _build(cls, element, captured):
+    if element in captured:
+        attrs, xml = captured[element]
+        obj = cls(attrs, {cls.tag: Lazy(cls.mapping[cls.tag], xml)}, None)
+        if isinstance(obj, UserDict):
+            obj.data = LazyData(obj.data)
+        return obj
+    childs = defaultdict(list)
+    for child in element:
+        if not isinstance(child.tag, str):
+            continue
+        name = _normalize(child.tag)
+        try:
+            child_cls = cls.mapping[name]
+        except KeyError:
+            raise ValueError(f"unexcepted tag {name}") from None
+        childs[name].append(_build(child_cls, child, captured))
+    return cls(dict(element.attrib), childs, element.text)
+
+
+class LazyParser(object):
+    """Drop-in for a target ``XMLParser`` building lazily read models.
+
+    Lists below the top level entities are serialized back to XML item by
+    item and dropped from the tree as soon as they are parsed; everything
+    else becomes model objects on :meth:`close`.
+    """
+
+    def __init__(self, root=Root):
+        self.root = root
+        self._parser = etree.XMLPullParser(events=("start", "end"))
+        self._stack = [root]
+        # stack depth of the list being captured
+        self._lazy = None
+        self._items = []
+        self._captured = {}
+
+    def _handle_events(self):
+        stack = self._stack
+        for event, element in self._parser.read_events():
+            if event == "start":
+                if self._lazy is not None:
+                    stack.append(None)
+                    continue
+                cls = stack[-1].mapping[_normalize(element.tag)]
+                # lists directly below metadata are the result of a browse
+                # or search and are built right away
+                if hasattr(cls, "tag") and len(stack) > 2:
+                    self._lazy = len(stack)
+                stack.append(cls)
+                continue
+            stack.pop()
+            if self._lazy is None or len(stack) > self._lazy + 1:
+                continue
+            if len(stack) > self._lazy:
+                self._items.append(etree.tostring(element, with_tail=False))
+                element.clear()
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+                continue
+            self._captured[element] = (
+                dict(element.attrib),
+                b"".join(self._items),
+            )
+            self._items = []
+            self._lazy = None
+            for child in element:
+                element.remove(child)
+
+    def feed(self, data):
+        self._parser.feed(data)
+        self._handle_events()
+
+    def close(self):
+        element = self._parser.close()
+        self._handle_events()
+        cls = self.root.mapping[_normalize(element.tag)]
+        return _build(cls, element, self._captured)
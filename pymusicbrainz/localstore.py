@@ -0,0 +1,224 @@
+import os
+import sqlite3
+import zlib
+
+from . import serialize
+
+# what a dump record holds beyond the entity itself; browse-like lists of
+# other entities and user data are only available from the web service
+_linked = {"recordings", "release-groups", "releases", "works"}
+_dumped_linked = {"release": {"recordings", "release-groups"}}
+
+indexes = ("artist", "barcode", "discid", "isrc")
+
+
+def _items(obj, key):
+    value = obj.get(key)
+    if value is None:
+        return ()
+    return value.get("data") or ()
+
+
+def index_keys(entity, obj):
+    """The ``(index, value)`` pairs ``obj`` is found under.
+
+    ``artist`` holds the MBIDs of the artist credit of recordings, releases
+    and release groups.
+    """
+    keys = set()
+    if entity in ("recording", "release", "release-group"):
+        for credit in _items(obj, "artist-credit"):
+            artist = credit.get("artist")
+            if artist is not None and artist.get("id"):
+                keys.add(("artist", artist["id"].lower()))
+    if entity == "recording":
+        for isrc in _items(obj, "isrc-list"):
+            if isrc.get("id"):
+                keys.add(("isrc", isrc["id"].upper()))
+    elif entity == "release":
+        if obj.get("barcode"):
+            keys.add(("barcode", obj["barcode"]))
+        for medium in _items(obj, "medium-list"):
+            for disc in _items(medium, "disc-list"):
+                if disc.get("id"):
+                    keys.add(("discid", disc["id"]))
+    return keys
+
+
+def _normalize(index, value):
+    if index not in indexes:
+        raise ValueError(f"invalid index {index}")
+    if index == "artist":
+        return value.lower()
+    if index == "isrc":
+        return value.upper()
+    return value
+
+
+class LocalStore(object):
+    """Entities kept in SQLite, queryable by MBID and by the keys of
+    :data:`indexes`.
+
+    Entities come from lookups through :meth:`put_many` or from the JSON
+    dumps through :func:`pymusicbrainz.dump.ingest`, and are stored as
+    compressed :mod:`pymusicbrainz.serialize` data.  They are returned as
+    they were stored, so a session only answers lookups from the store
+    with entities of its own model classes, and not for lazy sessions or
+    projected lookups.
+    """
+
+    def __init__(self, path):
+        self._db = sqlite3.connect(os.fspath(path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entity (entity TEXT NOT NULL,"
+            " id TEXT NOT NULL, data BLOB NOT NULL,"
+            " PRIMARY KEY (entity, id)) WITHOUT ROWID"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entity_key (name TEXT NOT NULL,"
+            " value TEXT NOT NULL, entity TEXT NOT NULL, id TEXT NOT NULL,"
+            " PRIMARY KEY (name, value, entity, id)) WITHOUT ROWID"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS entity_key_owner"
+            " ON entity_key (entity, id)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS progress (source TEXT NOT NULL,"
+            " member TEXT NOT NULL, lines INTEGER NOT NULL,"
+            " done INTEGER NOT NULL, PRIMARY KEY (source, member))"
+        )
+        self._db.commit()
+
+    @classmethod
+    def from_config(cls, config):
+        if not config.local_store_path:
+            return None
+        return cls(config.local_store_path)
+
+    @staticmethod
+    def can_serve(entity, includes):
+        allowed = _dumped_linked.get(entity, ())
+        for inc in includes:
+            if inc.startswith("user-") or inc == "various-artists":
+                return False
+            if inc in _linked and inc not in allowed:
+                return False
+        return True
+
+    def get(self, entity, id):
+        row = self._db.execute(
+            "SELECT data FROM entity WHERE entity = ? AND id = ?",
+            (entity, id.lower()),
+        ).fetchone()
+        if row is None:
+            return None
+        data = zlib.decompress(row[0])
+        if not serialize.is_current(data):
+            return None
+        return serialize.loads(data)
+
+    def __contains__(self, key):
+        entity, id = key
+        row = self._db.execute(
+            "SELECT 1 FROM entity WHERE entity = ? AND id = ?",
+            (entity, id.lower()),
+        ).fetchone()
+        return row is not None
+
+    def count(self, entity=None):
+        if entity is None:
+            row = self._db.execute("SELECT COUNT(*) FROM entity").fetchone()
+        else:
+            row = self._db.execute(
+                "SELECT COUNT(*) FROM entity WHERE entity = ?", (entity,)
+            ).fetchone()
+        return row[0]
+
+    def find_ids(self, index, value, entity=None):
+        """``(entity, id)`` of everything stored under ``value`` of ``index``,
+        e.g. ``find_ids("barcode", "0724384960650")``."""
+        value = _normalize(index, value)
+        if entity is None:
+            rows = self._db.execute(
+                "SELECT entity, id FROM entity_key"
+                " WHERE name = ? AND value = ?",
+                (index, value),
+            )
+        else:
+            rows = self._db.execute(
+                "SELECT entity, id FROM entity_key"
+                " WHERE name = ? AND value = ? AND entity = ?",
+                (index, value, entity),
+            )
+        return rows.fetchall()
+
+    def find(self, index, value, entity=None):
+        """The entities stored under ``value`` of ``index``."""
+        found = []
+        for entity, id in self.find_ids(index, value, entity):
+            obj = self.get(entity, id)
+            if obj is not None:
+                found.append(obj)
+        return found
+
+    def put(self, entity, obj):
+        self.put_many(entity, [obj])
+
+    def put_many(self, entity, objects):
+        """Store parsed entities, e.g. from ``lookup_release``, in one
+        transaction."""
+        with self._db:
+            self._write(entity, [(obj["id"], obj) for obj in objects])
+
+    def _write(self, entity, entities):
+        rows = []
+        keys = []
+        for id, obj in entities:
+            id = id.lower()
+            rows.append((entity, id, zlib.compress(serialize.dumps(obj), 1)))
+            keys.extend(
+                (name, value, entity, id)
+                for name, value in index_keys(entity, obj)
+            )
+        self._db.executemany(
+            "DELETE FROM entity_key WHERE entity = ? AND id = ?",
+            [row[:2] for row in rows],
+        )
+        self._db.executemany(
+            "INSERT OR REPLACE INTO entity (entity, id, data)"
+            " VALUES (?, ?, ?)",
+            rows,
+        )
+        self._db.executemany(
+            "INSERT OR IGNORE INTO entity_key (name, value, entity, id)"
+            " VALUES (?, ?, ?, ?)",
+            keys,
+        )
+
+    def progress(self, source, member):
+        """Lines of ``member`` of ``source`` stored so far and whether the
+        member is complete."""
+        row = self._db.execute(
+            "SELECT lines, done FROM progress WHERE source = ? AND member = ?",
+            (source, member),
+        ).fetchone()
+        if row is None:
+            return 0, False
+        return row[0], bool(row[1])
+
+    def put_batch(self, entity, entities, source, member, lines, done=False):
+        """Store ``(id, entity)`` pairs and the progress they complete in
+        one transaction, so an interrupted ingest resumes exactly."""
+        with self._db:
+            self._write(entity, entities)
+            self._db.execute(
+                "INSERT OR REPLACE INTO progress (source, member, lines, done)"
+                " VALUES (?, ?, ?, ?)",
+                (source, member, lines, int(done)),
+            )
+
+    def close(self):
+        self._db.close()
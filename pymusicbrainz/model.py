@@ -8,6 +8,9 @@ from lxml import etree
 
 log = getLogger(__name__)
 
+# Clark name of the ``ext:score`` attribute on search results
+ext_score = "{http://musicbrainz.org/ns/ext#-2.0}score"
+
 
 def parse_int(attrs, childs, data):
     return int(data)
@@ -48,7 +51,14 @@ def list_factory(name, cls, tag):
         self.data["data"] = childs[tag]
 
     return type(
-        name, (UserDict,), {"mapping": {tag: cls}, "__init__": __init__}
+        name,
+        (UserDict,),
+        {
+            "mapping": {tag: cls},
+            "tag": tag,
+            "__init__": __init__,
+            "__module__": __name__,
+        },
     )
 
 
@@ -70,6 +80,10 @@ class Entity(UserDict):
             "work-rels",
         }
 
+    @staticmethod
+    def valid_browse_include(inc):
+        return Entity.valid_lookup_include(inc)
+
 
 class Area(Entity):
     @staticmethod
@@ -106,6 +120,19 @@ class Area(Entity):
             return True
         return Entity.valid_lookup_include(inc)
 
+    @staticmethod
+    def valid_browse_include(inc):
+        if inc in {
+            "aliases",
+            "annotation",
+            "genres",
+            "tags",
+            "user-genres",
+            "user-tags",
+        }:
+            return True
+        return Entity.valid_browse_include(inc)
+
     @staticmethod
     def valid_linked(linked):
         return linked in {
@@ -171,6 +198,21 @@ class Artist(Entity):
             return True
         return Entity.valid_lookup_include(inc)
 
+    @staticmethod
+    def valid_browse_include(inc):
+        if inc in {
+            "aliases",
+            "annotation",
+            "genres",
+            "ratings",
+            "tags",
+            "user-genres",
+            "user-ratings",
+            "user-tags",
+        }:
+            return True
+        return Entity.valid_browse_include(inc)
+
     @staticmethod
     def valid_linked(linked):
         return linked in {
@@ -278,6 +320,21 @@ class Event(Entity):
             return True
         return Entity.valid_lookup_include(inc)
 
+    @staticmethod
+    def valid_browse_include(inc):
+        if inc in {
+            "aliases",
+            "annotation",
+            "genres",
+            "ratings",
+            "tags",
+            "user-genres",
+            "user-ratings",
+            "user-tags",
+        }:
+            return True
+        return Entity.valid_browse_include(inc)
+
     @staticmethod
     def valid_linked(linked):
         return linked in {
@@ -325,6 +382,19 @@ class Instrument(Entity):
             return True
         return Entity.valid_lookup_include(inc)
 
+    @staticmethod
+    def valid_browse_include(inc):
+        if inc in {
+            "aliases",
+            "annotation",
+            "genres",
+            "tags",
+            "user-genres",
+            "user-tags",
+        }:
+            return True
+        return Entity.valid_browse_include(inc)
+
     @staticmethod
     def valid_linked(linked):
         return linked in {
@@ -382,6 +452,21 @@ class Label(Entity):
             return True
         return Entity.valid_lookup_include(inc)
 
+    @staticmethod
+    def valid_browse_include(inc):
+        if inc in {
+            "aliases",
+            "annotation",
+            "genres",
+            "ratings",
+            "tags",
+            "user-genres",
+            "user-ratings",
+            "user-tags",
+        }:
+            return True
+        return Entity.valid_browse_include(inc)
+
     @staticmethod
     def valid_linked(linked):
         return linked in {
@@ -431,6 +516,19 @@ class Place(Entity):
             return True
         return Entity.valid_lookup_include(inc)
 
+    @staticmethod
+    def valid_browse_include(inc):
+        if inc in {
+            "aliases",
+            "annotation",
+            "genres",
+            "tags",
+            "user-genres",
+            "user-tags",
+        }:
+            return True
+        return Entity.valid_browse_include(inc)
+
     @staticmethod
     def valid_linked(linked):
         return linked in {
@@ -490,10 +588,26 @@ class Recording(Entity):
             return True
         return Entity.valid_lookup_include(inc)
 
+    @staticmethod
+    def valid_browse_include(inc):
+        if inc in {
+            "annotation",
+            "artist-credits",
+            "genres",
+            "isrcs",
+            "ratings",
+            "tags",
+            "user-genres",
+            "user-ratings",
+            "user-tags",
+        }:
+            return True
+        return Entity.valid_browse_include(inc)
+
     @staticmethod
     def valid_linked(linked):
         return linked in {
-            "area",
+            "artist",
             "collection",
             "release",
             "work",
@@ -563,6 +677,25 @@ class Release(Entity):
             return True
         return Entity.valid_lookup_include(inc)
 
+    @staticmethod
+    def valid_browse_include(inc):
+        if inc in {
+            "annotation",
+            "artist-credits",
+            "discids",
+            "genres",
+            "isrcs",
+            "labels",
+            "media",
+            "recordings",
+            "release-groups",
+            "tags",
+            "user-genres",
+            "user-tags",
+        }:
+            return True
+        return Entity.valid_browse_include(inc)
+
     @staticmethod
     def valid_linked(linked):
         return linked in {
@@ -625,6 +758,21 @@ class ReleaseGroup(Entity):
             return True
         return Entity.valid_lookup_include(inc)
 
+    @staticmethod
+    def valid_browse_include(inc):
+        if inc in {
+            "annotation",
+            "artist-credits",
+            "genres",
+            "ratings",
+            "tags",
+            "user-genres",
+            "user-ratings",
+            "user-tags",
+        }:
+            return True
+        return Entity.valid_browse_include(inc)
+
     @staticmethod
     def valid_linked(linked):
         return linked in {
@@ -671,6 +819,19 @@ class Series(Entity):
             return True
         return Entity.valid_lookup_include(inc)
 
+    @staticmethod
+    def valid_browse_include(inc):
+        if inc in {
+            "aliases",
+            "annotation",
+            "genres",
+            "tags",
+            "user-genres",
+            "user-tags",
+        }:
+            return True
+        return Entity.valid_browse_include(inc)
+
     @staticmethod
     def valid_linked(linked):
         return linked in {
@@ -747,6 +908,21 @@ class Work(Entity):
             return True
         return Entity.valid_lookup_include(inc)
 
+    @staticmethod
+    def valid_browse_include(inc):
+        if inc in {
+            "aliases",
+            "annotation",
+            "genres",
+            "ratings",
+            "tags",
+            "user-genres",
+            "user-ratings",
+            "user-tags",
+        }:
+            return True
+        return Entity.valid_browse_include(inc)
+
     @staticmethod
     def valid_linked(linked):
         return linked in {
@@ -1265,8 +1441,8 @@ class Parser(object):
         "StackElement", ("cls", "attrs", "childs", "data")
     )
 
-    def __init__(self):
-        self.stack = [self.StackElement(Root, {}, defaultdict(list), None)]
+    def __init__(self, root=Root):
+        self.stack = [self.StackElement(root, {}, defaultdict(list), None)]
 
     @staticmethod
     def _normalize(tag):
@@ -1291,7 +1467,11 @@ class Parser(object):
         self.stack[-1].childs[tag].append(obj)
 
     def data(self, data):
-        self.stack[-1] = self.stack[-1]._replace(data=data)
+        top = self.stack[-1]
+        # text may arrive in pieces when it spans two fed chunks
+        if top.data is not None:
+            data = top.data + data
+        self.stack[-1] = top._replace(data=data)
 
     def close(self):
         if len(self.stack) != 1:
@@ -1299,6 +1479,54 @@ class Parser(object):
         return self.stack[-1].childs["metadata"][0]
 
 
+ListItem = namedtuple("ListItem", ("tag", "attrs", "item"))
+
+
+class StreamParser(Parser):
+    """Parser handing out the items of top level lists as they complete.
+
+    Items of a list directly below ``metadata`` or below the entity looked
+    up are queued in ``items`` instead of being attached to their list, so
+    the tree returned by :meth:`close` keeps those lists empty.
+    """
+
+    def __init__(self, root=Root):
+        super().__init__(root)
+        self.metadata = root.mapping["metadata"]
+        self.tags = []
+        self.items = []
+        # stack depths of the open lists whose items are streamed
+        self.lists = []
+
+    def start(self, tag, attrs):
+        super().start(tag, attrs)
+        self.tags.append(self._normalize(tag))
+        stack = self.stack
+        if hasattr(stack[-1].cls, "tag") and (
+            stack[-2].cls is self.metadata or stack[-3].cls is self.metadata
+        ):
+            self.lists.append(len(stack))
+
+    def end(self, tag):
+        self.tags.pop(-1)
+        stack = self.stack
+        if self.lists and len(stack) == self.lists[-1] + 1:
+            cls, attrs, childs, data = stack.pop(-1)
+            self.items.append(
+                ListItem(
+                    self.tags[-1], stack[-1].attrs, cls(attrs, childs, data)
+                )
+            )
+            return
+        if self.lists and len(stack) == self.lists[-1]:
+            self.lists.pop(-1)
+        super().end(tag)
+
+    def pop_items(self):
+        items, self.items = self.items, []
+        return items
+
+
 for cls in (
     Area,
     Artist,
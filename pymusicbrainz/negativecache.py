@@ -0,0 +1,73 @@
+import os
+import sqlite3
+import time
+
+
+class NegativeCache(object):
+    """Remembers MBIDs the server reported as not found.
+
+    Entries live for ``ttl`` seconds in memory and, when ``path`` is given,
+    in a SQLite file shared with later sessions.
+    """
+
+    def __init__(self, ttl=3600, path=None):
+        self.ttl = ttl
+        self._entries = {}
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(os.fspath(path), check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS missing (entity TEXT NOT NULL,"
+                " id TEXT NOT NULL, expires REAL NOT NULL,"
+                " PRIMARY KEY (entity, id))"
+            )
+            self._db.commit()
+
+    @classmethod
+    def from_config(cls, config):
+        if not config.negative_cache_ttl:
+            return None
+        return cls(config.negative_cache_ttl, config.negative_cache_path)
+
+    def __contains__(self, key):
+        entity, id = key
+        key = (entity, id.lower())
+        now = time.time()
+        expires = self._entries.get(key)
+        if expires is None and self._db is not None:
+            row = self._db.execute(
+                "SELECT expires FROM missing WHERE entity = ? AND id = ?", key
+            ).fetchone()
+            if row is not None:
+                expires = self._entries[key] = row[0]
+        if expires is None:
+            return False
+        if expires <= now:
+            self.discard(*key)
+            return False
+        return True
+
+    def add(self, entity, id):
+        key = (entity, id.lower())
+        expires = self._entries[key] = time.time() + self.ttl
+        if self._db is not None:
+            with self._db:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO missing (entity, id, expires)"
+                    " VALUES (?, ?, ?)",
+                    key + (expires,),
+                )
+
+    def discard(self, entity, id):
+        key = (entity, id.lower())
+        self._entries.pop(key, None)
+        if self._db is not None:
+            with self._db:
+                self._db.execute(
+                    "DELETE FROM missing WHERE entity = ? AND id = ?", key
+                )
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
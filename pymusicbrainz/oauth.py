@@ -11,8 +11,8 @@ log = getLogger(__name__)
 
 
 class OAuth(Request):
-    def __init__(self, config, client):
-        super().__init__(config, client)
+    def __init__(self, config, client, rate_limiter=None):
+        super().__init__(config, client, rate_limiter)
         self.config = config
 
     def is_authorized(self):
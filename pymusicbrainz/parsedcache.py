@@ -0,0 +1,74 @@
+import json
+import os
+import sqlite3
+import time
+import zlib
+from logging import getLogger
+
+from . import serialize
+
+log = getLogger(__name__)
+
+
+class ParsedCache(object):
+    """Persistent SQLite store of parsed responses, keyed by request.
+
+    Trees are stored with :mod:`pymusicbrainz.serialize` and zlib, so
+    loading them back skips both the network and the XML parser.  Rows
+    written by an incompatible model version are ignored.
+    """
+
+    def __init__(self, path, ttl=86400):
+        self.path = os.fspath(path)
+        self.ttl = ttl
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS parsed"
+            " (key TEXT PRIMARY KEY, stored REAL NOT NULL, data BLOB NOT NULL)"
+        )
+        self._db.commit()
+
+    @classmethod
+    def from_config(cls, config):
+        if not config.parsed_cache_path:
+            return None
+        return cls(config.parsed_cache_path, config.parsed_cache_ttl)
+
+    @staticmethod
+    def key(path, params):
+        return json.dumps([path, sorted(params.items())])
+
+    def get(self, key):
+        row = self._db.execute(
+            "SELECT stored, data FROM parsed WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        stored, data = row
+        if self.ttl is not None and stored + self.ttl < time.time():
+            return None
+        data = zlib.decompress(data)
+        if not serialize.is_current(data):
+            return None
+        return serialize.loads(data)
+
+    def put(self, key, obj):
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO parsed (key, stored, data)"
+                " VALUES (?, ?, ?)",
+                (key, time.time(), zlib.compress(serialize.dumps(obj), 1)),
+            )
+
+    def purge(self):
+        if self.ttl is None:
+            return
+        with self._db:
+            self._db.execute(
+                "DELETE FROM parsed WHERE stored < ?",
+                (time.time() - self.ttl,),
+            )
+
+    def close(self):
+        self._db.close()
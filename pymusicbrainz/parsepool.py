@@ -0,0 +1,122 @@
+import asyncio
+import concurrent.futures
+import mmap
+import os
+
+from lxml import etree
+
+from . import serialize
+from .compact import CompactRoot
+from .jsonparser import JSONParser
+from .lazy import LazyParser
+from .model import Parser, Root
+from .projection import ProjectingParser, compile_fields
+
+
+def make_parser(entity=None, fields=(), fmt="xml", compact=False, lazy=False):
+    if lazy and fmt == "json":
+        raise ValueError("lazy models are only built from xml responses")
+    root = CompactRoot if compact else Root
+    if fields:
+        cls = Root.mapping["metadata"].mapping[entity]
+        plan = compile_fields(cls, tuple(fields))
+        return etree.XMLParser(
+            target=ProjectingParser(root, {"metadata": {entity: plan}})
+        )
+    if entity is not None and fmt == "json":
+        return JSONParser(root, entity)
+    if lazy:
+        return LazyParser(root)
+    return etree.XMLParser(target=Parser(root))
+
+
+def parse(data, *args):
+    parser = make_parser(*args)
+    parser.feed(data)
+    return parser.close()
+
+
+def load_file(path, *args, chunk_size=1024 * 1024):
+    # mapped rather than read into one buffer, only the chunk being fed is
+    # copied out of the page cache; lxml does not accept a memoryview
+    parser = make_parser(*args)
+    with open(path, "rb") as fp:
+        size = os.fstat(fp.fileno()).st_size
+        if size:
+            with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                for offset in range(0, size, chunk_size):
+                    parser.feed(data[offset : offset + chunk_size])
+    return parser.close()
+
+
+# the tree crosses the process boundary as marshal data, which loads far
+# faster than unpickling the model objects
+def _parse_serialized(data, *args):
+    return serialize.dumps(parse(data, *args))
+
+
+def _load_serialized(path, *args):
+    return serialize.dumps(load_file(path, *args))
+
+
+class ParsePool(object):
+    """Parses response bodies of at least ``threshold`` bytes off the loop.
+
+    ``kind`` is ``"thread"`` or ``"process"``; a process pool returns the
+    tree through :mod:`pymusicbrainz.serialize`, so lazily built lists
+    arrive materialized.
+    """
+
+    def __init__(self, kind="thread", workers=None, threshold=1024 * 1024):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"invalid parse pool {kind}")
+        self.kind = kind
+        self.workers = workers
+        self.threshold = threshold
+        self._executor = None
+
+    @classmethod
+    def from_config(cls, config):
+        if not config.parse_pool:
+            return None
+        return cls(
+            config.parse_pool,
+            config.parse_pool_workers,
+            config.parse_pool_threshold,
+        )
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = concurrent.futures.ProcessPoolExecutor(
+                    self.workers
+                )
+            else:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    self.workers, thread_name_prefix="pymusicbrainz-parse"
+                )
+        return self._executor
+
+    async def parse(self, data, *args):
+        loop = asyncio.get_running_loop()
+        if self.kind == "process":
+            data = await loop.run_in_executor(
+                self.executor, _parse_serialized, data, *args
+            )
+            return serialize.loads(data)
+        return await loop.run_in_executor(self.executor, parse, data, *args)
+
+    async def load(self, path, *args):
+        loop = asyncio.get_running_loop()
+        if self.kind == "process":
+            data = await loop.run_in_executor(
+                self.executor, _load_serialized, path, *args
+            )
+            return serialize.loads(data)
+        return await loop.run_in_executor(self.executor, load_file, path, *args)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
@@ -0,0 +1,135 @@
+import time
+
+from .ratelimit import get_endpoint_rate_limiter
+
+
+class Endpoint(object):
+    failure_threshold = 3
+    down_time = 5
+    down_time_max = 300
+
+    def __init__(
+        self,
+        host,
+        port=443,
+        scheme="https",
+        rate_limit_interval=1,
+        rate_limit_burst=1,
+        rate_limit_file=None,
+        max_outstanding=8,
+        overflow=False,
+        rate_limiter=None,
+    ):
+        self.host = host
+        self.port = port
+        self.scheme = scheme
+        self.max_outstanding = max_outstanding
+        self.overflow = overflow
+        if rate_limiter is None:
+            rate_limiter = get_endpoint_rate_limiter(
+                host,
+                port,
+                rate_limit_interval,
+                rate_limit_burst,
+                rate_limit_file,
+            )
+        self.rate_limiter = rate_limiter
+        self.outstanding = 0
+        self.failures = 0
+        self.down_until = 0
+
+    def __repr__(self):
+        return f"<Endpoint {self.base_url} outstanding={self.outstanding}>"
+
+    @property
+    def base_url(self):
+        return f"{self.scheme}://{self.host}:{self.port}/"
+
+    def get_url(self, path):
+        return self.base_url.rstrip("/") + path
+
+    def is_up(self, now=None):
+        if now is None:
+            now = time.monotonic()
+        return now >= self.down_until
+
+    def is_saturated(self):
+        return (
+            self.max_outstanding is not None
+            and self.outstanding >= self.max_outstanding
+        )
+
+    def succeeded(self):
+        self.failures = 0
+        self.down_until = 0
+
+    def failed(self):
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            down_time = min(
+                self.down_time * 2 ** (self.failures - self.failure_threshold),
+                self.down_time_max,
+            )
+            self.down_until = time.monotonic() + down_time
+
+
+class EndpointPool(object):
+    """Spreads requests over mirrors by least outstanding requests.
+
+    Overflow endpoints are only used while every regular endpoint is down or
+    saturated.
+    """
+
+    def __init__(self, endpoints):
+        if not endpoints:
+            raise ValueError("empty endpoint pool")
+        self.endpoints = list(endpoints)
+
+    @classmethod
+    def home(cls, config, rate_limiter=None):
+        return cls(
+            [
+                Endpoint(
+                    config.server_host,
+                    config.server_port,
+                    rate_limit_interval=config.rate_limit_interval,
+                    rate_limit_burst=config.rate_limit_burst,
+                    rate_limit_file=config.rate_limit_file,
+                    max_outstanding=None,
+                    rate_limiter=rate_limiter,
+                )
+            ]
+        )
+
+    @classmethod
+    def from_config(cls, config, rate_limiter=None):
+        """Builds the pool from ``config.servers`` or the home server.
+
+        ``rate_limiter`` only applies to the home server; each entry of
+        ``config.servers`` sets up its own limits, so passing both is an
+        error.
+        """
+        if not config.servers:
+            return cls.home(config, rate_limiter)
+        if rate_limiter is not None:
+            raise ValueError("rate_limiter conflicts with config.servers")
+        return cls([Endpoint(**server) for server in config.servers])
+
+    def select(self, avoid=None):
+        # ``avoid`` is the endpoint that just failed, tried last among equals
+        def key(endpoint):
+            return endpoint.overflow, endpoint is avoid, endpoint.outstanding
+
+        now = time.monotonic()
+        up = [endpoint for endpoint in self.endpoints if endpoint.is_up(now)]
+        for overflow in (False, True):
+            candidates = [
+                endpoint
+                for endpoint in up
+                if endpoint.overflow == overflow and not endpoint.is_saturated()
+            ]
+            if candidates:
+                return min(candidates, key=key)
+        if up:
+            return min(up, key=key)
+        return min(self.endpoints, key=lambda e: e.down_until)
@@ -0,0 +1,88 @@
+import functools
+from collections import defaultdict
+
+from .model import Parser, Root
+
+# attributes are always kept, naming them in ``fields`` is allowed
+attributes = {"id", "type", "type-id"}
+
+
+def _items(cls):
+    # fields of a list apply to its items
+    tag = getattr(cls, "tag", None)
+    if tag is not None:
+        return cls.mapping[tag]
+    return cls
+
+
+@functools.lru_cache(maxsize=256)
+def compile_fields(cls, fields):
+    """Turn ``fields`` paths like ``medium-list/track-list`` into a plan.
+
+    A plan maps the tags to keep to the plan for their children; ``None``
+    keeps the whole subtree.  ``fields`` must be hashable, e.g. a tuple.
+    """
+    plan = {}
+    for field in fields:
+        node, node_cls = plan, cls
+        parts = field.split("/")
+        for index, part in enumerate(parts):
+            mapping = getattr(_items(node_cls), "mapping", {})
+            last = index == len(parts) - 1
+            if part not in mapping:
+                if last and part in attributes:
+                    break
+                raise ValueError(f"invalid field {field}")
+            if last:
+                node[part] = None
+                break
+            if part in node and node[part] is None:
+                # an earlier field already keeps the whole subtree
+                break
+            node = node.setdefault(part, {})
+            node_cls = mapping[part]
+    return plan
+
+
+class ProjectingParser(Parser):
+    """Parser skipping every element outside of a compiled plan.
+
+    ``plan`` applies to the children of ``root``; skipped elements never
+    get a stack element or a model object.
+    """
+
+    def __init__(self, root=Root, plan=None):
+        super().__init__(root)
+        self.plans = [plan]
+        self.skipped = 0
+
+    def start(self, tag, attrs):
+        if self.skipped:
+            self.skipped += 1
+            return
+        plan = self.plans[-1]
+        tag = self._normalize(tag)
+        cls = self.stack[-1].cls
+        if plan is not None and getattr(cls, "tag", None) != tag:
+            if tag not in plan:
+                self.skipped = 1
+                return
+            plan = plan[tag]
+        self.plans.append(plan)
+        self.stack.append(
+            self.StackElement(cls.mapping[tag], attrs, defaultdict(list), None)
+        )
+
+    def end(self, tag):
+        if self.skipped:
+            self.skipped -= 1
+            return
+        self.plans.pop(-1)
+        cls, attrs, childs, data = self.stack.pop(-1)
+        self.stack[-1].childs[self._normalize(tag)].append(
+            cls(attrs, childs, data)
+        )
+
+    def data(self, data):
+        if not self.skipped:
+            super().data(data)
@@ -0,0 +1,146 @@
+import abc
+import os
+import struct
+import time
+from asyncio import sleep
+from threading import Lock
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+
+class RateLimiter(abc.ABC):
+    """Token bucket of ``burst`` tokens refilled every ``interval`` seconds."""
+
+    max_scale = 32
+    relax_factor = 0.9
+
+    def __init__(self, interval, burst=1):
+        self.interval = interval
+        self.burst = burst
+
+    # The bucket is kept as a single theoretical arrival time (GCRA), so each
+    # caller reserves its own future slot instead of polling for a free one.
+    # ``scale`` stretches the interval while the server reports pressure.
+    def _advance(self, state, now):
+        tat, scale = state
+        if tat is None or tat < now:
+            tat = now
+        interval = self.interval * scale
+        wait = tat - (self.burst - 1) * interval - now
+        return max(wait, 0), (tat + interval, scale)
+
+    def _penalize(self, state, now, retry_after):
+        tat, scale = state
+        scale = min(scale * 2, self.max_scale)
+        if retry_after is not None and (tat is None or tat < now + retry_after):
+            tat = now + retry_after
+        return tat, scale
+
+    def _relax(self, state):
+        tat, scale = state
+        return tat, max(scale * self.relax_factor, 1.0)
+
+    @abc.abstractmethod
+    def _update(self, func):
+        """Replace the ``(tat, scale)`` state by the second item of
+        ``func(state, now)`` atomically and return the first."""
+
+    def reserve(self):
+        return self._update(self._advance)
+
+    def penalize(self, retry_after=None):
+        self._update(
+            lambda state, now: (None, self._penalize(state, now, retry_after))
+        )
+
+    def relax(self):
+        self._update(lambda state, now: (None, self._relax(state)))
+
+    @property
+    def scale(self):
+        return self._update(lambda state, now: (state[1], state))
+
+    async def acquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            await sleep(wait)
+
+
+class LocalRateLimiter(RateLimiter):
+    """Rate limiter shared by every thread and event loop of one process."""
+
+    def __init__(self, interval, burst=1):
+        super().__init__(interval, burst)
+        self._lock = Lock()
+        self._state = (None, 1.0)
+
+    def _update(self, func):
+        with self._lock:
+            result, self._state = func(self._state, time.monotonic())
+        return result
+
+
+class FileRateLimiter(RateLimiter):
+    """Rate limiter shared by every process on the host through a lock file."""
+
+    _format = struct.Struct("<dd")
+
+    def __init__(self, path, interval, burst=1):
+        if fcntl is None:
+            raise RuntimeError("FileRateLimiter requires fcntl")
+        super().__init__(interval, burst)
+        self.path = os.fspath(path)
+        self._lock = Lock()
+
+    def _read(self, fd):
+        data = os.pread(fd, self._format.size, 0)
+        if len(data) != self._format.size:
+            return None, 1.0
+        return self._format.unpack(data)
+
+    def _write(self, fd, state):
+        tat, scale = state
+        os.pwrite(fd, self._format.pack(tat or 0.0, scale), 0)
+
+    def _update(self, func):
+        with self._lock:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o666)
+            try:
+                fcntl.lockf(fd, fcntl.LOCK_EX)
+                state = self._read(fd)
+                result, new_state = func(state, time.time())
+                if new_state != state:
+                    self._write(fd, new_state)
+            finally:
+                os.close(fd)
+        return result
+
+
+_limiters = {}
+_limiters_lock = Lock()
+
+
+def get_rate_limiter(config):
+    return get_endpoint_rate_limiter(
+        config.server_host,
+        config.server_port,
+        config.rate_limit_interval,
+        config.rate_limit_burst,
+        config.rate_limit_file,
+    )
+
+
+def get_endpoint_rate_limiter(host, port, interval, burst=1, path=None):
+    key = (host, port, interval, burst, path)
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            if path:
+                limiter = FileRateLimiter(path, interval, burst)
+            else:
+                limiter = LocalRateLimiter(interval, burst)
+            _limiters[key] = limiter
+    return limiter
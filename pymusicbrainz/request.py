@@ -1,14 +1,106 @@
-from asyncio import get_running_loop, sleep
-from threading import Lock
+from .exceptions import ResponseError
+from .httpcache import HTTPCache
+from .pool import EndpointPool
+from .retry import RetryPolicy
+from .scheduler import Priority, get_scheduler
+from asyncio import sleep
+from logging import getLogger
 import httpx
+from httpx.exceptions import NetworkError, TimeoutException
+
+log = getLogger(__name__)
+
+transient_errors = (NetworkError, TimeoutException)
+
+
+class Stream(object):
+    def __init__(self, request, method, path, kwargs, priority):
+        self._request = request
+        self._method = method
+        self._path = path
+        self._kwargs = kwargs
+        self._priority = priority
+        self._context = None
+        self._endpoint = None
+        self._response = None
+
+    async def _open(self, endpoint):
+        self._context = self._request._client.stream(
+            self._method, endpoint.get_url(self._path), **self._kwargs
+        )
+        return await self._context.__aenter__()
+
+    def _cache_key(self):
+        cache = self._request.cache
+        if (
+            cache is None
+            or self._method != "GET"
+            or "Authorization" in self._kwargs["headers"]
+        ):
+            return None
+        return cache.key(self._path, self._kwargs["params"])
+
+    async def __aenter__(self):
+        request = self._request
+        cache = request.cache
+        key = self._cache_key()
+        entry = None
+        if key is not None:
+            entry = cache.get(key)
+            if entry is not None:
+                if entry.is_fresh():
+                    self._response = cache.open(entry)
+                    return self._response
+                self._kwargs["headers"].update(entry.conditional_headers())
+        pool = request._select_pool(self._method, self._kwargs["headers"])
+        self._endpoint, response = await request._send(
+            self._open, pool, self._priority
+        )
+        if key is not None:
+            if response.status_code == 304 and entry is not None:
+                await self._close(None, None, None)
+                cache.revalidated(entry)
+                self._response = cache.open(entry, response.url)
+                return self._response
+            if response.status_code == 200:
+                return cache.wrap(key, response)
+        return response
+
+    async def _close(self, exc_type, exc_val, exc_tb):
+        context, self._context = self._context, None
+        try:
+            await context.__aexit__(exc_type, exc_val, exc_tb)
+        finally:
+            self._endpoint.outstanding -= 1
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self._response is not None:
+            await self._response.aclose()
+        if self._context is not None:
+            await self._close(exc_type, exc_val, exc_tb)
 
 
 class Request(object):
-    def __init__(self, config, client):
+    def __init__(
+        self, config, client, rate_limiter=None, retry_policy=None, pool=None
+    ):
         self.config = config
         self._client = client
-        self._lock = Lock()
-        self._rate_limit_time = None
+        self.home = EndpointPool.home(config, rate_limiter)
+        if pool is None:
+            if config.servers:
+                pool = EndpointPool.from_config(config, rate_limiter)
+            else:
+                pool = self.home
+        self.pool = pool
+        if retry_policy is None:
+            retry_policy = RetryPolicy.from_config(config)
+        self.retry_policy = retry_policy
+        self.cache = HTTPCache.from_config(config)
+
+    @property
+    def rate_limiter(self):
+        return self.home.endpoints[0].rate_limiter
 
     def get_url(self, path, **params):
         url = httpx.URL(
@@ -27,44 +119,100 @@ class Request(object):
             headers["Authorization"] = "Bearer " + self.config.access_token
         return headers
 
-    async def _ratelimit(self):
+    async def _ratelimit(self, endpoint, priority=Priority.normal):
+        await get_scheduler(endpoint.rate_limiter).acquire(priority, self)
+
+    def _select_pool(self, method, headers):
+        # writes and credentials only ever go to the configured home server
+        if method != "GET" or "Authorization" in headers:
+            return self.home
+        return self.pool
+
+    async def _send(self, open, pool, priority=Priority.normal):
+        policy = self.retry_policy
+        attempt = 0
+        endpoint = None
         while True:
-            sleep_time = None
-            with self._lock:
-                now = get_running_loop().time()
-                if self._rate_limit_time and now < self._rate_limit_time:
-                    sleep_time = self._rate_limit_time - now
-                else:
-                    self._rate_limit_time = (
-                        now + self.config.rate_limit_interval
-                    )
-            if sleep_time is None:
-                return
-            await sleep(sleep_time)
-
-    async def get(self, path, **params):
-        await self._ratelimit()
-        return self._client.get(
-            self.get_url(path), params=params, headers=self.get_headers(),
+            endpoint = pool.select(avoid=endpoint)
+            endpoint.outstanding += 1
+            try:
+                await self._ratelimit(endpoint, priority)
+                response = await open(endpoint)
+            except transient_errors as err:
+                endpoint.outstanding -= 1
+                if attempt >= policy.retries:
+                    raise
+                endpoint.failed()
+                endpoint.rate_limiter.penalize()
+                delay = policy.delay(attempt)
+                log.warning(
+                    "request to %s failed (%s), retry in %.1fs",
+                    endpoint.host,
+                    err,
+                    delay,
+                )
+            except BaseException:
+                endpoint.outstanding -= 1
+                raise
+            else:
+                if not policy.should_retry(response.status_code):
+                    endpoint.succeeded()
+                    endpoint.rate_limiter.relax()
+                    return endpoint, response
+                endpoint.outstanding -= 1
+                await response.aclose()
+                if attempt >= policy.retries:
+                    raise ResponseError(response.status_code, response.url)
+                endpoint.failed()
+                retry_after = policy.retry_after(response.headers)
+                endpoint.rate_limiter.penalize(retry_after)
+                delay = policy.delay(attempt, retry_after)
+                log.warning(
+                    "%s responded %s, retry in %.1fs",
+                    endpoint.host,
+                    response.status_code,
+                    delay,
+                )
+            attempt += 1
+            # back off only if there is no other endpoint to try right away
+            if pool.select(avoid=endpoint) is endpoint:
+                await sleep(delay)
+
+    async def _request(self, method, path, priority, **kwargs):
+        async def open(endpoint):
+            return await self._client.request(
+                method, endpoint.get_url(path), **kwargs
+            )
+
+        pool = self._select_pool(method, kwargs["headers"])
+        endpoint, response = await self._send(open, pool, priority)
+        endpoint.outstanding -= 1
+        return response
+
+    async def get(self, path, priority=Priority.normal, **params):
+        return await self._request(
+            "GET", path, priority, params=params, headers=self.get_headers()
         )
 
-    async def post(self, path, **params):
-        await self._ratelimit()
-        return self._client.post(
-            self.get_url(path), data=params, headers=self.get_headers(),
+    async def post(self, path, priority=Priority.normal, **params):
+        return await self._request(
+            "POST", path, priority, data=params, headers=self.get_headers()
         )
 
-    async def get_stream(self, path, **params):
-        await self._ratelimit()
-        return self._client.stream(
+    async def get_stream(self, path, priority=Priority.normal, **params):
+        return Stream(
+            self,
             "GET",
-            self.get_url(path),
-            params=params,
-            headers=self.get_headers(),
+            path,
+            dict(params=params, headers=self.get_headers()),
+            priority,
         )
 
-    async def post_stream(self, path, **params):
-        await self._ratelimit()
-        return self._client.stream(
-            "POST", self.get_url(path), data=params, headers=self.get_headers(),
+    async def post_stream(self, path, priority=Priority.normal, **params):
+        return Stream(
+            self,
+            "POST",
+            path,
+            dict(data=params, headers=self.get_headers()),
+            priority,
         )
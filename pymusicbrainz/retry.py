@@ -0,0 +1,51 @@
+import datetime
+import random
+from email.utils import parsedate_to_datetime
+
+
+class RetryPolicy(object):
+    """Classifies responses and computes jittered exponential backoff."""
+
+    retry_statuses = {429, 500, 502, 503, 504}
+
+    def __init__(self, retries=5, backoff=1, backoff_max=60):
+        self.retries = retries
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            config.max_retries, config.retry_backoff, config.retry_backoff_max
+        )
+
+    def should_retry(self, status_code):
+        return status_code in self.retry_statuses
+
+    @staticmethod
+    def retry_after(headers):
+        value = headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return max(float(value), 0)
+        except ValueError:
+            pass
+        try:
+            date = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if date.tzinfo is None:
+            date = date.replace(tzinfo=datetime.timezone.utc)
+        now = datetime.datetime.now(datetime.timezone.utc)
+        return max((date - now).total_seconds(), 0)
+
+    def delay(self, attempt, retry_after=None):
+        # "full jitter": spread retries of concurrent callers uniformly over
+        # the backoff window so they do not hit the server in lockstep
+        delay = random.uniform(
+            0, min(self.backoff_max, self.backoff * 2**attempt)
+        )
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
@@ -0,0 +1,74 @@
+import asyncio
+import enum
+from collections import OrderedDict, deque
+from weakref import WeakKeyDictionary
+
+
+class Priority(enum.IntEnum):
+    interactive = 0
+    normal = 1
+    bulk = 2
+
+
+class Scheduler(object):
+    """Hands out rate limiter slots by priority, round robin per caller."""
+
+    def __init__(self, rate_limiter):
+        self.rate_limiter = rate_limiter
+        self._queues = [OrderedDict() for _ in Priority]
+        self._waiting = 0
+        self._dispatcher = None
+
+    def __len__(self):
+        return self._waiting
+
+    async def acquire(self, priority=Priority.normal, caller=None):
+        future = asyncio.get_running_loop().create_future()
+        self._queues[priority].setdefault(caller, deque()).append(future)
+        self._waiting += 1
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.ensure_future(self._dispatch())
+        await future
+
+    def _next(self):
+        for callers in self._queues:
+            while callers:
+                caller, queue = next(iter(callers.items()))
+                future = queue.popleft()
+                self._waiting -= 1
+                if queue:
+                    callers.move_to_end(caller)
+                else:
+                    del callers[caller]
+                if not future.done():
+                    return future
+        return None
+
+    async def _dispatch(self):
+        # Only one slot is reserved at a time, so the waiter is picked when
+        # the slot is due and late interactive requests still jump the queue.
+        try:
+            while self._waiting:
+                await self.rate_limiter.acquire()
+                future = self._next()
+                if future is not None:
+                    future.set_result(None)
+        except Exception as err:
+            for callers in self._queues:
+                for queue in callers.values():
+                    for future in queue:
+                        if not future.done():
+                            future.set_exception(err)
+                callers.clear()
+            self._waiting = 0
+
+
+_schedulers = WeakKeyDictionary()
+
+
+def get_scheduler(rate_limiter):
+    schedulers = _schedulers.setdefault(asyncio.get_running_loop(), {})
+    scheduler = schedulers.get(rate_limiter)
+    if scheduler is None:
+        scheduler = schedulers[rate_limiter] = Scheduler(rate_limiter)
+    return scheduler
@@ -0,0 +1,117 @@
+import decimal
+import enum
+import hashlib
+import marshal
+import sys
+from collections import UserDict
+
+from . import model
+from .compact import Record, compact_class
+
+FORMAT_VERSION = 2
+MAGIC = b"PMB"
+
+
+def _model_classes():
+    classes = {}
+    for obj in vars(model).values():
+        if (
+            isinstance(obj, type)
+            and issubclass(obj, UserDict)
+            and obj.__module__ == model.__name__
+        ):
+            classes[obj.__name__] = obj
+    return classes
+
+
+def _enum_classes():
+    return {
+        obj.__name__: obj
+        for obj in vars(model).values()
+        if isinstance(obj, type)
+        and issubclass(obj, enum.Enum)
+        and obj.__module__ == model.__name__
+    }
+
+
+classes = _model_classes()
+enums = _enum_classes()
+
+
+def _schema_hash():
+    # any change to the model layout invalidates previously stored data
+    digest = hashlib.sha1(str(FORMAT_VERSION).encode())
+    for name in sorted(classes):
+        mapping = getattr(classes[name], "mapping", {})
+        digest.update(name.encode())
+        for key in sorted(mapping):
+            value = mapping[key]
+            digest.update(f"{key}={getattr(value, '__name__', value)}".encode())
+    for name in sorted(enums):
+        digest.update(name.encode())
+        digest.update(" ".join(enums[name].__members__).encode())
+    return digest.digest()[:8]
+
+
+HEADER = MAGIC + bytes([FORMAT_VERSION, marshal.version]) + _schema_hash()
+
+
+# Model nodes become ``(class name, {key: value})`` tuples, compact records
+# ``(class name, {key: value}, True)``; the tree never holds tuples
+# otherwise.  Decimals and enums are tagged the same way.
+def _encode(obj):
+    if isinstance(obj, UserDict):
+        return (
+            type(obj).__name__,
+            {sys.intern(key): _encode(value) for key, value in obj.items()},
+        )
+    if isinstance(obj, Record):
+        return (
+            type(obj).__name__,
+            {sys.intern(key): _encode(value) for key, value in obj.items()},
+            True,
+        )
+    if isinstance(obj, list):
+        return [_encode(value) for value in obj]
+    if isinstance(obj, dict):
+        return {key: _encode(value) for key, value in obj.items()}
+    if isinstance(obj, decimal.Decimal):
+        return ("#decimal", str(obj))
+    if isinstance(obj, enum.Enum):
+        return ("#" + type(obj).__name__, obj.name)
+    return obj
+
+
+def _decode(obj):
+    if isinstance(obj, tuple):
+        name, value = obj[:2]
+        if name == "#decimal":
+            return decimal.Decimal(value)
+        if name[0] == "#":
+            return enums[name[1:]][value]
+        data = {key: _decode(item) for key, item in value.items()}
+        if len(obj) == 3:
+            return compact_class(classes[name]).from_dict(data)
+        cls = classes[name]
+        node = cls.__new__(cls)
+        node.data = data
+        return node
+    if isinstance(obj, list):
+        return [_decode(value) for value in obj]
+    if isinstance(obj, dict):
+        return {key: _decode(value) for key, value in obj.items()}
+    return obj
+
+
+def dumps(obj):
+    return HEADER + marshal.dumps(_encode(obj))
+
+
+def loads(data):
+    if not is_current(data):
+        raise ValueError("incompatible serialized model data")
+    return _decode(marshal.loads(memoryview(data)[len(HEADER) :]))
+
+
+def is_current(data):
+    return bytes(data[: len(HEADER)]) == HEADER
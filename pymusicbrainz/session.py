@@ -1,7 +1,23 @@
+from .compact import CompactRoot
 from .config import Config
+from .corpus import load_corpus
+from .crawl import crawl
+from .entitycache import EntityCache
+from .localstore import LocalStore
+from .negativecache import NegativeCache
+from .parsedcache import ParsedCache
+from .parsepool import ParsePool, load_file, make_parser
+from .projection import compile_fields
+from .exceptions import NotFound, ResponseError
 from .oauth import OAuth
+from .scheduler import Priority
+from .singleflight import SingleFlight
+from .tocindex import TOCIndex, discid_regex, parse_toc
 from .model import (
     Parser,
+    Root,
+    StreamParser,
+    ListItem,
     Area,
     Artist,
     Collection,
@@ -15,12 +31,13 @@ from .model import (
     Series,
     Work,
     Url,
+    ext_score,
 )
 
 import re
 import functools
 import asyncio
-from collections import defaultdict
+from collections import defaultdict, deque
 from logging import getLogger
 
 import httpx
@@ -42,8 +59,52 @@ valid_scope = {
     "submit_barcode",
 }
 
+
+def _body_size(headers):
+    """The decoded body size given by the headers, or None if unknown."""
+    if headers.get("Content-Encoding", "identity") != "identity":
+        return None
+    try:
+        return int(headers["Content-Length"])
+    except (KeyError, ValueError):
+        return None
+
+
+def item_score(item):
+    """The ``ext:score`` of a search result, 0 to 100."""
+    return int(item.get(ext_score, 0))
+
+
+# marks the end of an iterator whose items may be None
+_sentinel = object()
+
+entity_classes = {
+    "area": Area,
+    "artist": Artist,
+    "event": Event,
+    "instrument": Instrument,
+    "label": Label,
+    "place": Place,
+    "recording": Recording,
+    "release": Release,
+    "release-group": ReleaseGroup,
+    "series": Series,
+    "url": Url,
+    "work": Work,
+}
+
+
 class AsyncSession(object):
-    def __init__(self, config=None, scopes=None, *args, **kwargs):
+    def __init__(
+        self,
+        config=None,
+        scopes=None,
+        *args,
+        rate_limiter=None,
+        lazy=None,
+        response_format=None,
+        **kwargs,
+    ):
         if config is None:
             config = Config()
         if scopes is None:
@@ -54,10 +115,29 @@ class AsyncSession(object):
                 raise ValueError(f"invalid scope {scope}!")
 
         self.config = config
+        if lazy is None:
+            lazy = config.lazy_models
+        self.lazy = lazy
+        if response_format is None:
+            response_format = config.response_format
+        if response_format not in ("xml", "json"):
+            raise ValueError(f"invalid response format {response_format}")
+        if lazy and response_format == "json":
+            raise ValueError("lazy models need the xml response format")
+        self.response_format = response_format
         self._oauth = OAuth(
-            config, httpx.AsyncClient(http2=True, *args, **kwargs)
+            config,
+            httpx.AsyncClient(http2=True, *args, **kwargs),
+            rate_limiter,
         )
         self.scopes = scopes
+        self._inflight = SingleFlight()
+        self._entity_cache = EntityCache.from_config(config)
+        self._parsed_cache = ParsedCache.from_config(config)
+        self._negative_cache = NegativeCache.from_config(config)
+        self._parse_pool = ParsePool.from_config(config)
+        self._local_store = LocalStore.from_config(config)
+        self._toc_index = TOCIndex.from_config(config)
 
     def get_authorization_url(self):
         return self._oauth.get_authorization_url(self.scopes)
@@ -65,28 +145,164 @@ class AsyncSession(object):
     async def exchange_authorization_code(self, token):
         await self._oauth.exchange_authorization_code(token, self.scopes)
 
-    async def _get_stream(self, path, inc):
-        parser = etree.XMLParser(target=Parser())
-        async with await self._oauth.get_stream(path, inc=" ".join(inc)) as r:
+    def _parser_args(self, entity=None, fields=()):
+        return (
+            entity,
+            fields,
+            self.response_format,
+            self.config.compact_models,
+            self.lazy,
+        )
+
+    def _parser(self, entity=None, fields=()):
+        return make_parser(*self._parser_args(entity, fields))
+
+    async def _get_stream(
+        self,
+        path,
+        inc,
+        priority=Priority.normal,
+        fmt="xml",
+        params=None,
+        on_response=None,
+    ):
+        params = {"inc": " ".join(inc), **(params or {})}
+        if fmt != "xml":
+            params["fmt"] = fmt
+        async with await self._oauth.get_stream(path, priority, **params) as r:
+            if r.status_code == 404:
+                raise NotFound(r.url)
+            if r.status_code >= 400:
+                raise ResponseError(r.status_code, r.url)
+            if on_response is not None:
+                on_response(r)
             async for chunk in r.aiter_bytes():
                 yield chunk
 
-    async def _get_xml(self, path, inc):
-        parser = etree.XMLParser(target=Parser())
-        async for chunk in self._get_stream(path, inc):
+    async def _get_xml(
+        self,
+        path,
+        inc,
+        priority=Priority.normal,
+        fields=(),
+        params=None,
+        fmt=None,
+    ):
+        key = None
+        if self._parsed_cache is not None and not self.config.access_token:
+            key_params = {"inc": " ".join(inc), **(params or {})}
+            if fields:
+                key_params["fields"] = " ".join(fields)
+            key = self._parsed_cache.key(path, key_params)
+            metadata = self._parsed_cache.get(key)
+            if metadata is not None:
+                return metadata
+        # the resource name, e.g. "artist" in /ws/2/artist/<mbid>
+        args = self._parser_args(path.split("/")[3], fields)
+        if fmt is None:
+            # projections are compiled for the XML parser
+            fmt = "xml" if fields else self.response_format
+        args = args[:2] + (fmt,) + args[3:]
+        if self._parse_pool is None:
+            parser = make_parser(*args)
+            async for chunk in self._get_stream(
+                path, inc, priority, fmt, params
+            ):
+                parser.feed(chunk)
+            metadata = parser.close()
+        else:
+            threshold = self._parse_pool.threshold
+            parser = make_parser(*args)
+            chunks = []
+
+            def decide(response):
+                # with the size known up front the body is either parsed as
+                # it arrives or buffered for the pool, never both
+                nonlocal parser, chunks
+                size = _body_size(response.headers)
+                if size is None:
+                    return
+                if size >= threshold:
+                    parser = None
+                else:
+                    chunks = None
+
+            received = 0
+            async for chunk in self._get_stream(
+                path, inc, priority, fmt, params, decide
+            ):
+                received += len(chunk)
+                if chunks is not None:
+                    chunks.append(chunk)
+                    if parser is not None and received >= threshold:
+                        # of unknown size and large after all, the partial
+                        # parse is dropped and the pool parses it whole
+                        parser = None
+                if parser is not None:
+                    parser.feed(chunk)
+            if parser is not None:
+                metadata = parser.close()
+            else:
+                metadata = await self._parse_pool.parse(b"".join(chunks), *args)
+        if key is not None:
+            self._parsed_cache.put(key, metadata)
+        return metadata
+
+    async def _iter_xml(self, path, inc, priority=Priority.normal):
+        target = StreamParser(
+            CompactRoot if self.config.compact_models else Root
+        )
+        parser = etree.XMLParser(target=target)
+        async for chunk in self._get_stream(path, inc, priority):
             parser.feed(chunk)
-        return parser.close()
+            for item in target.pop_items():
+                yield item
+        metadata = parser.close()
+        for item in target.pop_items():
+            yield item
+        for tag, value in metadata.items():
+            yield ListItem(tag, {}, value)
 
     async def _load_xml(self, file_path):
-        parser = etree.XMLParser(target=Parser())
+        parser = self._parser()
         with open(file_path, "rb") as fp:
             for chunk in iter(functools.partial(fp.read, 4096), b''):
                 parser.feed(chunk)
         return parser.close()
 
+    async def load_xml(self, file_path):
+        """Parse a saved response without blocking the event loop."""
+        args = self._parser_args()
+        if self._parse_pool is not None:
+            return await self._parse_pool.load(file_path, *args)
+        return await asyncio.get_running_loop().run_in_executor(
+            None, load_file, file_path, *args
+        )
+
+    async def load_corpus(self, source, workers=None, max_pending=None):
+        """Parse saved responses in a process pool.
+
+        ``source`` is a directory, searched recursively for ``.xml`` files,
+        a glob pattern or a single file.  Yields ``(path, metadata)`` in
+        completion order with at most ``max_pending`` files in flight.
+        """
+        # lazily built lists would be materialized crossing processes
+        args = self._parser_args()[:-1] + (False,)
+        pool = self._parse_pool
+        if pool is not None and pool.kind != "process":
+            pool = None
+        async for item in load_corpus(
+            source,
+            *args,
+            pool=pool,
+            workers=workers,
+            max_pending=max_pending,
+        ):
+            yield item
+
     @staticmethod
     def _check_valid_id(id):
-        if uuid_regex.match(id) is None:
+        if uuid_regex.fullmatch(id) is None:
             raise ValueError(f"Invalid id {id}")
 
     @staticmethod
@@ -94,73 +310,558 @@ class AsyncSession(object):
         if inc.startswith("user-") and not self._oauth.is_logged_in():
             raise ValueError(f"Invalid id {id}")
 
-    async def _lookup(self, id, includes, cls, name):
-        if includes is None:
-            includes = []
+    def _check_lookup(self, id, includes, cls):
         self._check_valid_id(id)
+        has_release = "releases" in includes
         for inc in includes:
             self._check_login_required(inc)
             if cls.valid_lookup_include(inc):
                 continue
+            if cls is Artist and has_release:
+                if inc == "various-artists":
+                    continue
             raise ValueError(f"invalid include {inc}")
-        metadata = await self._get_xml(f"/ws/2/{name}/{id}", includes)
-        return metadata[name]
 
-    async def lookup_artist(self, id, includes=None):
-        self._check_valid_id(id)
+    async def _lookup(self, id, includes, cls, name, priority, fields=None):
+        if includes is None:
+            includes = []
+        self._check_lookup(id, includes, cls)
+        if fields is None:
+            fields = ()
+        fields = tuple(sorted(set(fields)))
+        compile_fields(cls, fields)
+        return await self._fetch(id, includes, name, priority, fields)
+
+    async def _fetch(self, id, includes, name, priority, fields=()):
+        includes = sorted(set(includes))
+        if (
+            self._negative_cache is not None
+            and (name, id) in self._negative_cache
+        ):
+            raise NotFound(entity=name, id=id)
+        if self._entity_cache is not None:
+            # a complete entity also answers a projected lookup
+            entity = self._entity_cache.get(name, id, includes)
+            if entity is not None:
+                return entity
+        if (
+            self._local_store is not None
+            and not fields
+            and not self.lazy
+            and self._local_store.can_serve(name, includes)
+        ):
+            # entities are stored as built, only serve those built with the
+            # model classes this session would parse into
+            root = CompactRoot if self.config.compact_models else Root
+            entity = self._local_store.get(name, id)
+            if type(entity) is root.mapping["metadata"].mapping[name]:
+                return entity
+        key = (name, id.lower(), tuple(includes), fields)
+        return await self._inflight.do(
+            key,
+            lambda: self._fetch_entity(id, includes, name, priority, fields),
+        )
+
+    async def _fetch_entity(self, id, includes, name, priority, fields=()):
+        try:
+            metadata = await self._get_xml(
+                f"/ws/2/{name}/{id}", includes, priority, fields
+            )
+        except NotFound as err:
+            if self._negative_cache is not None:
+                self._negative_cache.add(name, id)
+            raise NotFound(err.url, name, id) from None
+        entity = metadata[name]
+        if self._entity_cache is not None and not fields:
+            self._entity_cache.put(name, id, includes, entity)
+        return entity
+
+    async def stream_lookup(
+        self, entity, id, includes=None, priority=Priority.normal
+    ):
+        """Look up an entity, yielding list items as soon as they are parsed.
+
+        Yields :class:`ListItem` tuples of the list tag, the list attributes
+        and one item, for every list directly below the entity.  The entity
+        itself comes last, with those lists left empty.
+        """
+        try:
+            cls = entity_classes[entity]
+        except KeyError:
+            raise ValueError(f"invalid entity {entity}") from None
+        if includes is None:
+            includes = []
+        self._check_lookup(id, includes, cls)
+        includes = sorted(set(includes))
+        if (
+            self._negative_cache is not None
+            and (entity, id) in self._negative_cache
+        ):
+            raise NotFound(entity=entity, id=id)
+        try:
+            async for item in self._iter_xml(
+                f"/ws/2/{entity}/{id}", includes, priority
+            ):
+                yield item
+        except NotFound as err:
+            if self._negative_cache is not None:
+                self._negative_cache.add(entity, id)
+            raise NotFound(err.url, entity, id) from None
+
+    async def lookup(
+        self, entity, id, includes=None, priority=Priority.normal, fields=None
+    ):
+        try:
+            cls = entity_classes[entity]
+        except KeyError:
+            raise ValueError(f"invalid entity {entity}") from None
+        return await self._lookup(id, includes, cls, entity, priority, fields)
+
+    async def lookup_many(
+        self,
+        entity,
+        ids,
+        includes=None,
+        priority=Priority.normal,
+        fields=None,
+        max_in_flight=8,
+        checkpoint=None,
+    ):
+        """Look up every entity of ``ids``, any iterable of MBIDs.
+
+        Yields ``(id, entity)`` in completion order, or ``(id, error)`` for
+        a lookup that raised or was cancelled.  Repeated ids are looked up once and ``ids`` is
+        consumed only as lookups finish, so at most ``max_in_flight`` of
+        them are pending at a time.
+
+        With a :class:`~pymusicbrainz.checkpoint.Checkpoint`, ids it has as
+        finished are skipped and finished lookups are added to it, so the
+        same call resumes an interrupted job; the results of earlier runs
+        are in :meth:`~pymusicbrainz.checkpoint.Checkpoint.results`.
+        """
+        if entity not in entity_classes:
+            raise ValueError(f"invalid entity {entity}")
+        ids = iter(ids)
+        seen = set()
+        if checkpoint is not None:
+            seen = checkpoint.completed(entity)
+        pending = {}
+        try:
+            while True:
+                while len(pending) < max_in_flight:
+                    id = next(ids, _sentinel)
+                    if id is _sentinel:
+                        break
+                    # anything but a string is left to the lookup to reject
+                    key = id.lower() if isinstance(id, str) else id
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    lookup = self.lookup(entity, id, includes, priority, fields)
+                    pending[asyncio.ensure_future(lookup)] = id
+                if not pending:
+                    break
+                done, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for future in done:
+                    id = pending.pop(future)
+                    if future.cancelled():
+                        # not finished, a checkpoint retries it on resume
+                        yield id, asyncio.CancelledError()
+                        continue
+                    error = future.exception()
+                    result = future.result() if error is None else error
+                    if checkpoint is not None:
+                        checkpoint.finish(entity, id, result)
+                    yield id, result
+                if checkpoint is not None and checkpoint.due():
+                    checkpoint.flush()
+        finally:
+            for future in pending:
+                future.cancel()
+            if checkpoint is not None:
+                checkpoint.flush()
+
+    def crawl(self, entity, id, depth=1, **kwargs):
+        """Crawl the relations of an entity breadth-first, see
+        :func:`pymusicbrainz.crawl.crawl` for the arguments."""
+        # returned rather than wrapped, so closing it saves a checkpoint
+        return crawl(self, [(entity, id)], depth, **kwargs)
+
+    async def _pages(self, entity, inc, priority, params, limit, prefetch):
+        """Yield the ``<entity>-list`` of every page of a browse or search.
+
+        Once the first page gives the count, up to ``prefetch`` further
+        pages are requested ahead; without prefetching the next page is
+        only requested when the consumer asks for it.
+        """
+        path = f"/ws/2/{entity}"
+        tag = f"{entity}-list"
+
+        def fetch(offset):
+            page_params = {**params, "limit": str(limit), "offset": str(offset)}
+            return asyncio.ensure_future(
+                self._get_xml(path, inc, priority, params=page_params)
+            )
+
+        pending = deque([fetch(0)])
+        offset = limit
+        try:
+            while pending:
+                page = (await pending.popleft())[tag]
+                count = int(page["count"])
+                while len(pending) < prefetch and offset < count:
+                    pending.append(fetch(offset))
+                    offset += limit
+                yield page
+                if not pending and offset < count:
+                    pending.append(fetch(offset))
+                    offset += limit
+        finally:
+            for future in pending:
+                future.cancel()
+
+    async def browse(
+        self,
+        entity,
+        linked,
+        id,
+        includes=None,
+        priority=Priority.normal,
+        limit=100,
+        prefetch=2,
+    ):
+        """Browse every ``entity`` linked to the ``linked`` entity ``id``.
+
+        Yields the entities of all pages.  Once the first page gives the
+        count, up to ``prefetch`` further pages are requested ahead, so
+        fetching them overlaps parsing and consuming the current one.  A
+        url browsed by ``resource`` is a single entity, yielded if it
+        exists.
+        """
+        try:
+            cls = entity_classes[entity]
+        except KeyError:
+            raise ValueError(f"invalid entity {entity}") from None
+        if not cls.valid_linked(linked):
+            raise ValueError(f"invalid linked entity {linked}")
+        # editors are browsed by name and urls by resource
+        if linked not in ("editor", "resource"):
+            self._check_valid_id(id)
         if includes is None:
             includes = []
-        has_release = "releases" in includes
         for inc in includes:
             self._check_login_required(inc)
-            if Artist.valid_lookup_include(inc):
-                continue
-            if has_release:
-                if inc == "various-artists":
-                    continue
-            raise ValueError(f"invalid include {inc}")
+            if not cls.valid_browse_include(inc):
+                raise ValueError(f"invalid include {inc}")
+        includes = sorted(set(includes))
+        if not 1 <= limit <= 100:
+            raise ValueError(f"invalid limit {limit}")
+
+        params = {linked: id}
+        if entity == "url":
+            try:
+                metadata = await self._get_xml(
+                    "/ws/2/url", includes, priority, params=params
+                )
+            except NotFound:
+                return
+            if "url" in metadata:
+                yield metadata["url"]
+            return
+        async for page in self._pages(
+            entity, includes, priority, params, limit, prefetch
+        ):
+            for item in page["data"]:
+                yield item
+
+    def browse_area(self, linked, id, *args, **kwargs):
+        return self.browse("area", linked, id, *args, **kwargs)
+
+    def browse_artist(self, linked, id, *args, **kwargs):
+        return self.browse("artist", linked, id, *args, **kwargs)
+
+    def browse_event(self, linked, id, *args, **kwargs):
+        return self.browse("event", linked, id, *args, **kwargs)
+
+    def browse_instrument(self, linked, id, *args, **kwargs):
+        return self.browse("instrument", linked, id, *args, **kwargs)
+
+    def browse_label(self, linked, id, *args, **kwargs):
+        return self.browse("label", linked, id, *args, **kwargs)
+
+    def browse_place(self, linked, id, *args, **kwargs):
+        return self.browse("place", linked, id, *args, **kwargs)
+
+    def browse_recording(self, linked, id, *args, **kwargs):
+        return self.browse("recording", linked, id, *args, **kwargs)
+
+    def browse_release(self, linked, id, *args, **kwargs):
+        return self.browse("release", linked, id, *args, **kwargs)
+
+    def browse_release_group(self, linked, id, *args, **kwargs):
+        return self.browse("release-group", linked, id, *args, **kwargs)
+
+    def browse_series(self, linked, id, *args, **kwargs):
+        return self.browse("series", linked, id, *args, **kwargs)
+
+    def browse_url(self, linked, id, *args, **kwargs):
+        return self.browse("url", linked, id, *args, **kwargs)
+
+    def browse_work(self, linked, id, *args, **kwargs):
+        return self.browse("work", linked, id, *args, **kwargs)
+
+    async def search(
+        self,
+        entity,
+        query,
+        priority=Priority.normal,
+        limit=100,
+        min_score=None,
+        prefetch=0,
+    ):
+        """Search ``entity`` with the Lucene ``query``.
+
+        Yields the results of all pages, best first.  With ``min_score`` it
+        stops at the first result scoring below it, before requesting any
+        page beyond; prefetching pages would spend requests on results
+        that may never be read, so it is off by default.
+        """
+        if entity not in entity_classes:
+            raise ValueError(f"invalid entity {entity}")
+        if not 1 <= limit <= 100:
+            raise ValueError(f"invalid limit {limit}")
+        params = {"query": query}
+        async for page in self._pages(
+            entity, [], priority, params, limit, prefetch
+        ):
+            for item in page["data"]:
+                if min_score is not None and item_score(item) < min_score:
+                    return
+                yield item
+
+    def search_area(self, query, *args, **kwargs):
+        return self.search("area", query, *args, **kwargs)
+
+    def search_artist(self, query, *args, **kwargs):
+        return self.search("artist", query, *args, **kwargs)
+
+    def search_event(self, query, *args, **kwargs):
+        return self.search("event", query, *args, **kwargs)
+
+    def search_instrument(self, query, *args, **kwargs):
+        return self.search("instrument", query, *args, **kwargs)
+
+    def search_label(self, query, *args, **kwargs):
+        return self.search("label", query, *args, **kwargs)
+
+    def search_place(self, query, *args, **kwargs):
+        return self.search("place", query, *args, **kwargs)
+
+    def search_recording(self, query, *args, **kwargs):
+        return self.search("recording", query, *args, **kwargs)
+
+    def search_release(self, query, *args, **kwargs):
+        return self.search("release", query, *args, **kwargs)
+
+    def search_release_group(self, query, *args, **kwargs):
+        return self.search("release-group", query, *args, **kwargs)
+
+    def search_series(self, query, *args, **kwargs):
+        return self.search("series", query, *args, **kwargs)
+
+    def search_url(self, query, *args, **kwargs):
+        return self.search("url", query, *args, **kwargs)
 
-        metadata = await self._get_xml(f"/ws/2/artist/{id}", includes)
-        return metadata["artist"]
+    def search_work(self, query, *args, **kwargs):
+        return self.search("work", query, *args, **kwargs)
 
-    async def lookup_area(self, id, includes=None):
-        return await self._lookup(id, includes, Area, 'area')
+    async def lookup_artist(
+        self, id, includes=None, priority=Priority.normal, fields=None
+    ):
+        return await self._lookup(
+            id, includes, Artist, "artist", priority, fields
+        )
 
-    async def lookup_event(self, id, includes=None):
-        return await self._lookup(id, includes, Event, 'event')
+    async def lookup_area(
+        self, id, includes=None, priority=Priority.normal, fields=None
+    ):
+        return await self._lookup(id, includes, Area, "area", priority, fields)
 
-    async def lookup_instrument(self, id, includes=None):
-        return await self._lookup(id, includes, Instrument, 'instrument')
+    async def lookup_event(
+        self, id, includes=None, priority=Priority.normal, fields=None
+    ):
+        return await self._lookup(
+            id, includes, Event, "event", priority, fields
+        )
 
-    async def lookup_label(self, id, includes=None):
-        return await self._lookup(id, includes, Label, 'label')
+    async def lookup_instrument(
+        self, id, includes=None, priority=Priority.normal, fields=None
+    ):
+        return await self._lookup(
+            id, includes, Instrument, "instrument", priority, fields
+        )
 
-    async def lookup_place(self, id, includes=None):
-        return await self._lookup(id, includes, Place, 'place')
+    async def lookup_label(
+        self, id, includes=None, priority=Priority.normal, fields=None
+    ):
+        return await self._lookup(
+            id, includes, Label, "label", priority, fields
+        )
 
-    async def lookup_recording(self, id, includes=None):
-        return await self._lookup(id, includes, Recording, 'recording')
+    async def lookup_place(
+        self, id, includes=None, priority=Priority.normal, fields=None
+    ):
+        return await self._lookup(
+            id, includes, Place, "place", priority, fields
+        )
 
-    async def lookup_release(self, id, includes=None):
-        return await self._lookup(id, includes, Release, 'release')
+    async def lookup_recording(
+        self, id, includes=None, priority=Priority.normal, fields=None
+    ):
+        return await self._lookup(
+            id, includes, Recording, "recording", priority, fields
+        )
+
+    async def lookup_release(
+        self, id, includes=None, priority=Priority.normal, fields=None
+    ):
+        return await self._lookup(
+            id, includes, Release, "release", priority, fields
+        )
 
-    async def lookup_release_group(self, id, includes=None):
-        return await self._lookup(id, includes, ReleaseGroup, 'release-group')
+    async def lookup_release_group(
+        self, id, includes=None, priority=Priority.normal, fields=None
+    ):
+        return await self._lookup(
+            id, includes, ReleaseGroup, "release-group", priority, fields
+        )
 
-    async def lookup_series(self, id, includes=None):
-        return await self._lookup(id, includes, Series, 'series')
+    async def lookup_series(
+        self, id, includes=None, priority=Priority.normal, fields=None
+    ):
+        return await self._lookup(
+            id, includes, Series, "series", priority, fields
+        )
 
-    async def lookup_url(self, id, includes=None):
-        return await self._lookup(id, includes, Url, 'url')
+    async def lookup_url(
+        self, id, includes=None, priority=Priority.normal, fields=None
+    ):
+        return await self._lookup(id, includes, Url, "url", priority, fields)
+
+    async def lookup_work(
+        self, id, includes=None, priority=Priority.normal, fields=None
+    ):
+        return await self._lookup(id, includes, Work, "work", priority, fields)
+
+    async def lookup_discid(
+        self,
+        discid,
+        includes=None,
+        toc=None,
+        cdstubs=True,
+        priority=Priority.normal,
+    ):
+        """Look up a disc ID, or with ``discid`` ``"-"`` only a TOC.
+
+        Returns the :class:`Disc`, a :class:`CDStub`, or for a TOC without
+        a known disc ID the :class:`ReleaseList` of the fuzzy TOC lookup.
+        With a TOC index configured, discs looked up before are answered
+        from it, and a TOC near one of theirs by their releases.
+        """
+        if discid != "-" and discid_regex.fullmatch(discid) is None:
+            raise ValueError(f"invalid disc id {discid}")
+        if includes is None:
+            includes = []
+        for inc in includes:
+            self._check_login_required(inc)
+            if not Release.valid_lookup_include(inc):
+                raise ValueError(f"invalid include {inc}")
+        includes = sorted(set(includes))
+        params = {}
+        if toc is not None:
+            toc = parse_toc(toc)
+            params["toc"] = " ".join(str(value) for value in toc)
+        elif discid == "-":
+            raise ValueError("a toc is needed without disc id")
+        if not cdstubs:
+            params["cdstubs"] = "no"
+
+        index = self._toc_index
+        if index is not None:
+            if discid != "-":
+                disc = index.get(discid, includes)
+                if disc is not None:
+                    return disc
+            else:
+                # the server may know a disc ID exactly, so a TOC is only
+                # answered locally when there is no ID to ask for
+                releases = self._toc_releases(toc, includes)
+                if releases is not None:
+                    return releases
 
-    async def lookup_work(self, id, includes=None):
-        return await self._lookup(id, includes, Work, 'work')
+        try:
+            metadata = await self._get_xml(
+                f"/ws/2/discid/{discid}",
+                includes,
+                priority,
+                params=params,
+                fmt="xml",
+            )
+        except NotFound as err:
+            if index is not None and toc is not None:
+                releases = self._toc_releases(toc, includes)
+                if releases is not None:
+                    return releases
+            raise NotFound(err.url, "discid", discid) from None
+        for tag in ("disc", "cdstub", "release-list"):
+            if tag in metadata:
+                result = metadata[tag]
+                break
+        else:
+            raise NotFound(entity="discid", id=discid)
+        if index is not None and tag == "disc":
+            index.add(result, includes)
+        return result
+
+    def _toc_releases(self, toc, includes):
+        """The releases of the indexed discs near ``toc``, or ``None``."""
+        releases = {}
+        for id, distance in self._toc_index.match(toc):
+            disc = self._toc_index.get(id, includes)
+            if disc is None or "release-list" not in disc:
+                continue
+            for release in disc["release-list"]["data"]:
+                releases.setdefault(release["id"], release)
+        if not releases:
+            return None
+        root = CompactRoot if self.config.compact_models else Root
+        release_list = root.mapping["metadata"].mapping["release-list"]
+        return release_list(
+            {"count": str(len(releases))},
+            {"release": list(releases.values())},
+            None,
+        )
 
     async def __aenter__(self) -> "AsyncSession":
         return self
 
-    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+    async def _close(self):
         await self._oauth._client.aclose()
+        if self._parsed_cache is not None:
+            self._parsed_cache.close()
+        if self._negative_cache is not None:
+            self._negative_cache.close()
+        if self._parse_pool is not None:
+            self._parse_pool.close()
+        if self._local_store is not None:
+            self._local_store.close()
+        if self._toc_index is not None:
+            self._toc_index.close()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self._close()
 
 
 class Session(AsyncSession):
@@ -187,7 +888,7 @@ class Session(AsyncSession):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:
-        self._await(self._oauth._client.aclose())
+        self._await(self._close())
         loop = self._loop
         try:
             to_cancel = asyncio.tasks.all_tasks(loop)
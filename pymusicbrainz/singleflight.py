@@ -0,0 +1,27 @@
+import asyncio
+
+
+class SingleFlight(object):
+    """Shares one in-flight call between all concurrent callers of a key."""
+
+    def __init__(self):
+        self._calls = {}
+
+    def __contains__(self, key):
+        return key in self._calls
+
+    def _done(self, key, future):
+        if self._calls.get(key) is future:
+            del self._calls[key]
+        if not future.cancelled():
+            # mark the exception as retrieved even if every caller went away
+            future.exception()
+
+    async def do(self, key, func):
+        future = self._calls.get(key)
+        if future is None:
+            future = asyncio.ensure_future(func())
+            self._calls[key] = future
+            future.add_done_callback(lambda f: self._done(key, f))
+        # a cancelled caller must not cancel the call the others wait for
+        return await asyncio.shield(future)
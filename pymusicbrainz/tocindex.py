@@ -0,0 +1,180 @@
+import array
+import os
+import re
+import sqlite3
+import zlib
+
+from . import serialize
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+discid_regex = re.compile(r"[A-Za-z0-9._-]{27}-|[A-Za-z0-9._-]{28}")
+
+
+def parse_toc(toc):
+    """``[first, last, leadout, offset...]`` from a TOC given as a string
+    like ``"1 2 267257 150 22767"``, with spaces or ``+``, or a sequence."""
+    if isinstance(toc, str):
+        toc = toc.replace("+", " ").split()
+    try:
+        values = [int(value) for value in toc]
+    except ValueError:
+        raise ValueError(f"invalid toc {toc}") from None
+    if (
+        len(values) < 4
+        or not 1 <= values[0] <= values[1] <= 99
+        or len(values) != values[1] - values[0] + 4
+    ):
+        raise ValueError(f"invalid toc {toc}")
+    # track offsets rise from the start of the disc up to the leadout
+    leadout, offsets = values[2], values[3:]
+    if offsets[0] < 0 or offsets[-1] >= leadout:
+        raise ValueError(f"invalid toc {toc}")
+    if any(a >= b for a, b in zip(offsets, offsets[1:])):
+        raise ValueError(f"invalid toc {toc}")
+    return values
+
+
+def disc_toc(disc):
+    """The TOC of a :class:`~pymusicbrainz.model.Disc` of a lookup."""
+    offsets = sorted(
+        (int(offset["position"]), int(offset["data"]))
+        for offset in disc["offset-list"]["data"]
+    )
+    return [
+        offsets[0][0],
+        offsets[-1][0],
+        int(disc["sectors"]),
+        *(offset for _, offset in offsets),
+    ]
+
+
+def _row(toc):
+    # offsets then leadout, as they lie on the disc
+    return toc[3:] + toc[2:3]
+
+
+def _match_numpy(ids, rows, query, tolerance):
+    table = numpy.frombuffer(rows, dtype=numpy.int32).reshape(
+        len(ids), len(query)
+    )
+    query = numpy.array(query, dtype=numpy.int32)
+    distances = numpy.abs((table - table[:, :1]) - (query - query[0])).max(
+        axis=1
+    )
+    found = numpy.flatnonzero(distances <= tolerance)
+    return [(ids[i], int(distances[i])) for i in found]
+
+
+def _match_python(ids, rows, query, tolerance):
+    width = len(query)
+    matches = []
+    for i, id in enumerate(ids):
+        row = rows[i * width : (i + 1) * width]
+        distance = max(
+            abs((value - row[0]) - (expected - query[0]))
+            for value, expected in zip(row, query)
+        )
+        if distance <= tolerance:
+            matches.append((id, distance))
+    return matches
+
+
+class TOCIndex(object):
+    """Discs looked up before, found again by disc ID or by a near TOC.
+
+    The TOCs of all discs with the same number of tracks are the rows of
+    one ``array("i")``, which is compared as a whole with numpy when it is
+    installed.  Disc lookups are kept in a SQLite file at ``path`` and
+    loaded when opened.
+    """
+
+    def __init__(self, path, tolerance=75):
+        self.tolerance = tolerance
+        self._db = sqlite3.connect(os.fspath(path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS disc (id TEXT PRIMARY KEY,"
+            " toc BLOB NOT NULL, includes TEXT NOT NULL, data BLOB NOT NULL)"
+        )
+        self._db.commit()
+        # track count -> (disc ids, TOC rows)
+        self._groups = {}
+        for id, toc in self._db.execute("SELECT id, toc FROM disc"):
+            self._insert(id, array.array("i", toc).tolist())
+
+    @classmethod
+    def from_config(cls, config):
+        if not config.toc_index_path:
+            return None
+        return cls(config.toc_index_path)
+
+    def _insert(self, id, toc):
+        tracks = toc[1] - toc[0] + 1
+        ids, rows = self._groups.setdefault(tracks, ([], array.array("i")))
+        ids.append(id)
+        rows.extend(_row(toc))
+
+    def __len__(self):
+        return sum(len(ids) for ids, _ in self._groups.values())
+
+    def add(self, disc, includes=()):
+        """Remember a disc looked up with ``includes``."""
+        toc = disc_toc(disc)
+        data = zlib.compress(serialize.dumps(disc), 1)
+        with self._db:
+            known = self._db.execute(
+                "SELECT 1 FROM disc WHERE id = ?", (disc["id"],)
+            ).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO disc (id, toc, includes, data)"
+                " VALUES (?, ?, ?, ?)",
+                (
+                    disc["id"],
+                    array.array("i", toc).tobytes(),
+                    " ".join(sorted(includes)),
+                    data,
+                ),
+            )
+        if known is None:
+            self._insert(disc["id"], toc)
+
+    def get(self, id, includes=()):
+        """The disc ``id`` if it was looked up with at least ``includes``."""
+        row = self._db.execute(
+            "SELECT includes, data FROM disc WHERE id = ?", (id,)
+        ).fetchone()
+        if row is None or not set(includes) <= set(row[0].split()):
+            return None
+        data = zlib.decompress(row[1])
+        if not serialize.is_current(data):
+            return None
+        return serialize.loads(data)
+
+    def match(self, toc, tolerance=None):
+        """``(disc id, distance)`` of the discs with the same track count
+        whose TOC differs from ``toc`` by at most ``tolerance`` sectors,
+        closest first.
+
+        TOCs are compared relative to their first track, so a disc pressed
+        with all tracks shifted by a constant still matches exactly.
+        """
+        if tolerance is None:
+            tolerance = self.tolerance
+        toc = parse_toc(toc)
+        group = self._groups.get(toc[1] - toc[0] + 1)
+        if group is None:
+            return []
+        ids, rows = group
+        if numpy is not None:
+            matches = _match_numpy(ids, rows, _row(toc), tolerance)
+        else:
+            matches = _match_python(ids, rows, _row(toc), tolerance)
+        matches.sort(key=lambda match: match[1])
+        return matches
+
+    def close(self):
+        self._db.close()
@@ -0,0 +1,63 @@
+class FakeResponse(object):
+    def __init__(self, status_code=200, body=b"", headers=None, url=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.url = url
+        self._body = body
+        self.closed = False
+
+    async def aiter_bytes(self):
+        for i in range(0, len(self._body), 1024):
+            yield self._body[i : i + 1024]
+
+    async def aread(self):
+        return self._body
+
+    async def aclose(self):
+        self.closed = True
+
+
+class FakeStream(object):
+    def __init__(self, response):
+        self.response = response
+
+    async def __aenter__(self):
+        return self.response
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.response.aclose()
+
+
+class FakeClient(object):
+    """Stands in for ``httpx.AsyncClient``.
+
+    ``handler`` receives ``(method, url, params, headers)`` and returns a
+    ``FakeResponse`` or raises.
+    """
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.calls = []
+
+    def _respond(self, method, url, params=None, headers=None, data=None):
+        self.calls.append((method, url, params, headers))
+        response = self.handler(method, url, params or {}, headers or {})
+        response.url = url
+        return response
+
+    def stream(self, method, url, **kwargs):
+        return FakeStream(self._respond(method, url, **kwargs))
+
+    async def request(self, method, url, **kwargs):
+        return self._respond(method, url, **kwargs)
+
+    async def aclose(self):
+        pass
+
+
+def fake_session(handler, config=None):
+    from pymusicbrainz import AsyncSession, LocalRateLimiter
+
+    session = AsyncSession(config, rate_limiter=LocalRateLimiter(0))
+    session._oauth._client = FakeClient(handler)
+    return session
@@ -0,0 +1,89 @@
+from pymusicbrainz.checkpoint import Checkpoint
+import pytest
+
+from .fake import fake_session
+from .test_crawl import mbid, names, serve_graph
+
+
+async def take(iterator, count):
+    items = [await iterator.__anext__() for _ in range(count)]
+    await iterator.aclose()
+    return items
+
+
+@pytest.mark.asyncio
+async def test_lookup_many_resumes(tmp_path):
+    ids = [mbid(name) for name in "ABCDE"] + [mbid("Z")]
+    checkpoint = Checkpoint(tmp_path / "job.db", interval=3600)
+    async with fake_session(serve_graph) as session:
+        first = await take(
+            session.lookup_many(
+                "artist", ids, max_in_flight=1, checkpoint=checkpoint
+            ),
+            2,
+        )
+    checkpoint.close()
+
+    checkpoint = Checkpoint(tmp_path / "job.db")
+    async with fake_session(serve_graph) as session:
+        rest = [
+            item
+            async for item in session.lookup_many(
+                "artist", ids, checkpoint=checkpoint
+            )
+        ]
+        assert len(session._oauth._client.calls) == 4
+    assert {id for id, _ in first + rest} == set(ids)
+    results = {id: result for _, id, result in checkpoint.results("artist")}
+    assert results[mbid("Z")] is None
+    assert results[mbid("A")]["name"] == "A"
+    assert checkpoint.completed("artist") == set(ids)
+
+
+@pytest.mark.asyncio
+async def test_crawl_resumes(tmp_path):
+    checkpoint = Checkpoint(tmp_path / "crawl.db", interval=3600)
+    async with fake_session(serve_graph) as session:
+        first = await take(
+            session.crawl(
+                "artist",
+                mbid("A"),
+                depth=2,
+                max_in_flight=1,
+                checkpoint=checkpoint,
+            ),
+            2,
+        )
+        calls = len(session._oauth._client.calls)
+    checkpoint.close()
+
+    checkpoint = Checkpoint(tmp_path / "crawl.db")
+    async with fake_session(serve_graph) as session:
+        rest = [
+            item
+            async for item in session.crawl(
+                "artist", mbid("A"), depth=2, checkpoint=checkpoint
+            )
+        ]
+        calls += len(session._oauth._client.calls)
+    crawled = {names[item.id]: item.depth for item in first + rest}
+    assert crawled == {"A": 0, "B": 1, "C": 1, "L": 1, "D": 2}
+    assert calls == 5
+
+    # a finished crawl has nothing left to do
+    async with fake_session(serve_graph) as session:
+        assert [
+            item
+            async for item in session.crawl(
+                "artist", mbid("A"), depth=2, checkpoint=checkpoint
+            )
+        ] == []
+
+    # a checkpoint only resumes the crawl it was written by
+    for start, depth in ((mbid("B"), 2), (mbid("A"), 3)):
+        async with fake_session(serve_graph) as session:
+            with pytest.raises(ValueError):
+                async for item in session.crawl(
+                    "artist", start, depth=depth, checkpoint=checkpoint
+                ):
+                    pass
@@ -0,0 +1,89 @@
+from pymusicbrainz import AsyncSession, Config, serialize
+from pymusicbrainz.compact import Record, compact_class
+from pymusicbrainz.entitycache import approximate_size
+from pymusicbrainz.model import Direction, Metadata
+from pathlib import Path
+import pytest
+
+data_dir = Path(__file__).parent / "data" / "artist"
+
+
+def assert_same_mapping(a, b):
+    if isinstance(a, list):
+        assert isinstance(b, list)
+        assert len(a) == len(b)
+        for x, y in zip(a, b):
+            assert_same_mapping(x, y)
+    elif hasattr(a, "keys"):
+        assert isinstance(b, Record)
+        assert type(b).model is type(a)
+        assert list(a.keys()) == list(b.keys())
+        for key in a:
+            assert_same_mapping(a[key], b[key])
+    else:
+        assert a == b
+
+
+@pytest.mark.asyncio
+async def test_same_tree():
+    config = Config()
+    config.compact_models = True
+    async with AsyncSession() as session, AsyncSession(config) as compact:
+        for path in sorted(data_dir.glob("*.xml")):
+            metadata = await session._load_xml(path)
+            records = await compact._load_xml(path)
+            assert_same_mapping(metadata, records)
+            assert approximate_size(records) < approximate_size(metadata)
+
+
+@pytest.mark.asyncio
+async def test_record():
+    config = Config()
+    config.compact_models = True
+    async with AsyncSession(config) as session:
+        metadata = await session._load_xml(
+            data_dir / "b3785a55-2cf6-497d-b8e3-cfa21a36f997-artist-rels.xml"
+        )
+    artist = metadata["artist"]
+    relation = artist["relation-list"][0]["data"][0]
+    assert relation["direction"] is Direction.backward
+    assert "direction" in relation
+    assert relation.get("no-such-key") is None
+    with pytest.raises(KeyError):
+        relation["no-such-key"]
+    with pytest.raises(AttributeError):
+        relation.extra = 1
+    assert relation.data == dict(relation.items())
+    # records of the same layout share their key index
+    first, second = artist["relation-list"][0]["data"][:2]
+    assert first._shape is second._shape
+
+    data = serialize.dumps(metadata)
+    loaded = serialize.loads(data)
+    assert loaded == metadata
+    assert type(loaded["artist"]) is type(artist)
+
+
+def model_classes():
+    seen = set()
+    pending = [Metadata]
+    while pending:
+        cls = pending.pop()
+        if not isinstance(cls, type) or cls in seen:
+            continue
+        seen.add(cls)
+        pending.extend(getattr(cls, "mapping", {}).values())
+    return sorted(seen, key=lambda cls: cls.__name__)
+
+
+@pytest.mark.parametrize("cls", model_classes(), ids=lambda cls: cls.__name__)
+def test_fields_match_model(cls):
+    # every child the parser may collect, each seen twice
+    def childs():
+        return {
+            tag: [f"{tag} 0", f"{tag} 1"] for tag in getattr(cls, "mapping", {})
+        }
+
+    attrs = {"id": "00000000-0000-0000-0000-000000000000", "type": "Other"}
+    expected = cls(attrs, childs(), "1").data
+    assert compact_class(cls)._fields(attrs, childs(), "1") == expected
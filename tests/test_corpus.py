@@ -0,0 +1,44 @@
+from pymusicbrainz import AsyncSession, Config
+from pymusicbrainz.corpus import corpus_paths
+from pathlib import Path
+import pytest
+
+data_dir = Path(__file__).parent / "data" / "artist"
+
+
+def test_corpus_paths(tmp_path):
+    xml = sorted(str(path) for path in data_dir.glob("*.xml"))
+    assert list(corpus_paths(data_dir)) == xml
+    assert list(corpus_paths(data_dir / "*-aliases.xml")) == [
+        path for path in xml if path.endswith("-aliases.xml")
+    ]
+    assert list(corpus_paths(xml[0])) == xml[:1]
+    assert list(corpus_paths(tmp_path / "*.xml")) == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("compact", [False, True])
+async def test_load_corpus(compact):
+    config = Config()
+    config.compact_models = compact
+    async with AsyncSession(config) as session:
+        loaded = {}
+        async for path, metadata in session.load_corpus(
+            data_dir, workers=1, max_pending=1
+        ):
+            loaded[path] = metadata
+        assert sorted(loaded) == sorted(map(str, data_dir.glob("*.xml")))
+        for path, metadata in loaded.items():
+            expected = await session._load_xml(path)
+            assert type(metadata) is type(expected)
+            assert metadata == expected
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("pool", [None, "thread", "process"])
+async def test_load_xml(pool):
+    config = Config()
+    config.parse_pool = pool
+    async with AsyncSession(config) as session:
+        for path in data_dir.glob("*.xml"):
+            assert await session.load_xml(path) == await session._load_xml(path)
@@ -0,0 +1,149 @@
+from pymusicbrainz import NotFound
+from pymusicbrainz.crawl import relation_targets
+import pytest
+
+from .fake import FakeResponse, fake_session
+
+
+def mbid(name):
+    return f"00000000-0000-0000-0000-{ord(name):012d}"
+
+
+# entity type, relations as (relation type, target type, target name)
+graph = {
+    "A": (
+        "artist",
+        [
+            ("member of band", "artist", "B"),
+            ("collaboration", "artist", "C"),
+            ("recording contract", "label", "L"),
+        ],
+    ),
+    "B": (
+        "artist",
+        [("member of band", "artist", "A"), ("collaboration", "artist", "D")],
+    ),
+    "C": ("artist", []),
+    "D": ("artist", [("collaboration", "artist", "E")]),
+    "E": ("artist", []),
+    "L": ("label", [("recording contract", "artist", "A")]),
+}
+names = {mbid(name): name for name in graph}
+
+
+def entity_xml(name):
+    entity, relations = graph[name]
+    lists = {}
+    for type, target_type, target in relations:
+        lists.setdefault(target_type, []).append(
+            f'<relation type="{type}"><target>{mbid(target)}</target>'
+            f'<{target_type} id="{mbid(target)}"><name>{target}</name>'
+            f"</{target_type}></relation>"
+        )
+    relation_lists = "".join(
+        f'<relation-list target-type="{target_type}">{"".join(items)}'
+        "</relation-list>"
+        for target_type, items in lists.items()
+    )
+    return (
+        '<metadata xmlns="http://musicbrainz.org/ns/mmd-2.0#">'
+        f'<{entity} id="{mbid(name)}"><name>{name}</name>{relation_lists}'
+        f"</{entity}></metadata>"
+    ).encode()
+
+
+def serve_graph(method, url, params, headers):
+    name = names.get(url.rsplit("/", 1)[-1])
+    if name is None:
+        return FakeResponse(404, b"")
+    return FakeResponse(200, entity_xml(name))
+
+
+@pytest.mark.asyncio
+async def test_relation_targets():
+    async with fake_session(serve_graph) as session:
+        artist = await session.lookup_artist(mbid("A"), ["artist-rels"])
+    assert sorted(relation_targets(artist)) == [
+        ("artist", mbid("B")),
+        ("artist", mbid("C")),
+        ("label", mbid("L")),
+    ]
+    assert list(relation_targets(artist, {"collaboration"})) == [
+        ("artist", mbid("C"))
+    ]
+
+
+@pytest.mark.asyncio
+async def test_crawl():
+    async with fake_session(serve_graph) as session:
+        crawled = [
+            item
+            async for item in session.crawl(
+                "artist", mbid("A"), depth=2, max_in_flight=2
+            )
+        ]
+        calls = session._oauth._client.calls
+    found = {names[item.id]: item.depth for item in crawled}
+    assert found == {"A": 0, "B": 1, "C": 1, "L": 1, "D": 2}
+    assert all(item.result["name"] == names[item.id] for item in crawled)
+    # every entity is fetched once, although A is reached again from B
+    assert len(calls) == 5
+    assert calls[0][2]["inc"].split() == sorted(
+        f"{entity}-rels"
+        for entity in (
+            "area",
+            "artist",
+            "event",
+            "instrument",
+            "label",
+            "place",
+            "recording",
+            "release",
+            "release-group",
+            "series",
+            "work",
+        )
+    )
+
+
+@pytest.mark.asyncio
+async def test_crawl_filters():
+    async with fake_session(serve_graph) as session:
+        crawled = [
+            item
+            async for item in session.crawl(
+                "artist",
+                mbid("A"),
+                depth=3,
+                entities=["artist"],
+                includes={"artist": ["artist-rels"]},
+                relation_types=["member of band", "collaboration"],
+            )
+        ]
+        calls = session._oauth._client.calls
+    assert sorted(names[item.id] for item in crawled) == list("ABCDE")
+    assert {params["inc"] for _, _, params, _ in calls} == {"artist-rels"}
+
+    with pytest.raises(ValueError):
+        async with fake_session(serve_graph) as session:
+            async for item in session.crawl(
+                "artist", mbid("A"), entities=["url"]
+            ):
+                pass
+
+
+@pytest.mark.asyncio
+async def test_crawl_errors():
+    def serve_without_c(method, url, params, headers):
+        if url.endswith(mbid("C")):
+            return FakeResponse(404, b"")
+        return serve_graph(method, url, params, headers)
+
+    async with fake_session(serve_without_c) as session:
+        crawled = {
+            names[item.id]: item.result
+            async for item in session.crawl("artist", mbid("A"))
+        }
+    assert sorted(crawled) == ["A", "B", "C", "L"]
+    assert isinstance(crawled["C"], NotFound)
+    assert crawled["B"]["name"] == "B"
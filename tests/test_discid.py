@@ -0,0 +1,176 @@
+from pymusicbrainz import Config, NotFound
+from pymusicbrainz.compact import Record
+from pymusicbrainz.parsepool import parse
+from pymusicbrainz import tocindex
+from pymusicbrainz.tocindex import TOCIndex, disc_toc, parse_toc
+import random
+import pytest
+
+from .fake import FakeResponse, fake_session
+
+disc_id = "arIS30RPWowvwNEqsqdDnZzDGhk-"
+release_id = "8cfce059-80ab-5a37-a45b-9ab1df0881e3"
+toc = [1, 3, 60000, 150, 20000, 41000]
+
+
+def disc_xml(id=disc_id, toc=toc):
+    offsets = "".join(
+        f'<offset position="{position}">{offset}</offset>'
+        for position, offset in enumerate(toc[3:], toc[0])
+    )
+    return (
+        '<metadata xmlns="http://musicbrainz.org/ns/mmd-2.0#">'
+        f'<disc id="{id}"><sectors>{toc[2]}</sectors>'
+        f'<offset-list count="{len(toc) - 3}">{offsets}</offset-list>'
+        f'<release-list count="1"><release id="{release_id}">'
+        "<title>Release</title></release></release-list></disc></metadata>"
+    ).encode()
+
+
+def test_parse_toc():
+    assert parse_toc("1 3 60000 150 20000 41000") == toc
+    assert parse_toc("1+3+60000+150+20000+41000") == toc
+    assert parse_toc(toc) == toc
+    for invalid in (
+        "1 3 60000 150 20000",
+        "1 x 60000 150",
+        "0 0 1 1",
+        "1 3 60000 150 20000 20000",
+        "1 3 60000 150 41000 20000",
+        "1 3 60000 150 20000 60000",
+        "1 3 60000 -150 20000 41000",
+    ):
+        with pytest.raises(ValueError):
+            parse_toc(invalid)
+    assert disc_toc(parse(disc_xml())["disc"]) == toc
+
+
+def test_toc_index(tmp_path):
+    index = TOCIndex(tmp_path / "toc.db")
+    index.add(parse(disc_xml())["disc"], ["artists"])
+    other = [1, 3, 90000, 150, 30000, 61000]
+    index.add(parse(disc_xml(disc_id[:-1] + "A", other))["disc"])
+    assert len(index) == 2
+    assert index.get(disc_id)["release-list"]["data"][0]["id"] == release_id
+    assert index.get(disc_id, ["artists"]) is not None
+    assert index.get(disc_id, ["labels"]) is None
+
+    assert index.match(toc) == [(disc_id, 0)]
+    # the same disc pressed with every track 32 sectors later
+    assert index.match([1, 3, 60032, 182, 20032, 41032]) == [(disc_id, 0)]
+    assert index.match([1, 3, 60040, 150, 20010, 41000]) == [(disc_id, 40)]
+    assert index.match([1, 3, 60040, 150, 20010, 41000], tolerance=39) == []
+    assert index.match([1, 2, 60000, 150, 20000]) == []
+    index.close()
+
+    index = TOCIndex(tmp_path / "toc.db")
+    assert len(index) == 2
+    assert index.match(other) == [(disc_id[:-1] + "A", 0)]
+
+
+def random_toc(rng, tracks):
+    offsets = [150]
+    for _ in range(tracks):
+        offsets.append(offsets[-1] + rng.randrange(5000, 30000))
+    return [1, tracks, offsets[-1], *offsets[:-1]]
+
+
+def test_toc_index_numpy(tmp_path, monkeypatch):
+    if tocindex.numpy is None:
+        pytest.skip("numpy is not installed")
+    rng = random.Random(1)
+    index = TOCIndex(tmp_path / "toc.db")
+    tocs = [random_toc(rng, rng.randrange(8, 11)) for _ in range(300)]
+    for number, toc in enumerate(tocs):
+        index._insert(f"{number:027d}-", toc)
+    queries = [
+        toc[:2] + [value + rng.randrange(-40, 40) for value in toc[2:]]
+        for toc in tocs[:50]
+    ]
+    with_numpy = [index.match(query, tolerance=100) for query in queries]
+    monkeypatch.setattr(tocindex, "numpy", None)
+    without_numpy = [index.match(query, tolerance=100) for query in queries]
+    assert with_numpy == without_numpy
+    assert all(matches for matches in with_numpy)
+
+
+@pytest.mark.asyncio
+async def test_lookup_discid(tmp_path):
+    def handler(method, url, params, headers):
+        if url.endswith(f"/ws/2/discid/{disc_id}"):
+            return FakeResponse(200, disc_xml())
+        return FakeResponse(404, b"")
+
+    config = Config()
+    config.toc_index_path = tmp_path / "toc.db"
+    async with fake_session(handler, config) as session:
+        disc = await session.lookup_discid(
+            disc_id, toc="1 3 60000 150 20000 41000"
+        )
+        assert disc["sectors"] == 60000
+        calls = session._oauth._client.calls
+        assert calls[0][2]["toc"] == "1 3 60000 150 20000 41000"
+
+        assert await session.lookup_discid(disc_id) == disc
+        releases = await session.lookup_discid(
+            "-", toc=[1, 3, 60040, 150, 20010, 41000]
+        )
+        assert [release["id"] for release in releases["data"]] == [release_id]
+        assert len(calls) == 1
+
+        # includes the indexed lookup did not have go to the web service
+        await session.lookup_discid(disc_id, ["artists"])
+        assert len(calls) == 2
+
+        with pytest.raises(ValueError):
+            await session.lookup_discid("not a disc id")
+        with pytest.raises(ValueError):
+            await session.lookup_discid("-")
+
+
+@pytest.mark.asyncio
+async def test_lookup_discid_compact(tmp_path):
+    def handler(method, url, params, headers):
+        return FakeResponse(200, disc_xml())
+
+    config = Config()
+    config.toc_index_path = tmp_path / "toc.db"
+    config.compact_models = True
+    async with fake_session(handler, config) as session:
+        await session.lookup_discid(disc_id)
+        releases = await session.lookup_discid("-", toc=toc)
+    assert isinstance(releases, Record)
+    assert [release["id"] for release in releases["data"]] == [release_id]
+
+
+@pytest.mark.asyncio
+async def test_lookup_discid_unknown_id(tmp_path):
+    other_id = disc_id[:-1] + "A"
+    missing_id = disc_id[:-1] + "B"
+    near_toc = "1 3 60040 150 20010 41000"
+
+    def handler(method, url, params, headers):
+        if url.endswith(f"/ws/2/discid/{disc_id}"):
+            return FakeResponse(200, disc_xml())
+        if url.endswith(f"/ws/2/discid/{other_id}"):
+            return FakeResponse(200, disc_xml(other_id, parse_toc(near_toc)))
+        return FakeResponse(404, b"")
+
+    config = Config()
+    config.toc_index_path = tmp_path / "toc.db"
+    async with fake_session(handler, config) as session:
+        await session.lookup_discid(disc_id)
+        calls = session._oauth._client.calls
+
+        # a disc ID not in the index is asked for even with a near TOC
+        disc = await session.lookup_discid(other_id, toc=near_toc)
+        assert disc["id"] == other_id
+        assert len(calls) == 2
+
+        # the index answers for a TOC the server has no disc for
+        releases = await session.lookup_discid(missing_id, toc=near_toc)
+        assert [release["id"] for release in releases["data"]] == [release_id]
+        assert len(calls) == 3
+
+        with pytest.raises(NotFound):
+            await session.lookup_discid(missing_id, toc="1 1 500 150")
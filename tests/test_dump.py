@@ -0,0 +1,126 @@
+from pymusicbrainz import Config
+from pymusicbrainz.compact import CompactRoot, Record
+from pymusicbrainz.dump import ingest, member_entity
+from pymusicbrainz.localstore import LocalStore
+from pathlib import Path
+import io
+import json
+import tarfile
+import pytest
+
+from .fake import fake_session
+from .test_session import prokofiev_id, serve_files
+
+data_dir = Path(__file__).parent / "data" / "artist"
+
+
+def dump_lines():
+    # one compact JSON document per line, as in the dumps
+    return [
+        json.dumps(json.loads(path.read_bytes())).encode()
+        for path in sorted(data_dir.glob("*.json"))
+    ]
+
+
+def write_dump(path, lines):
+    data = b"".join(line + b"\n" for line in lines)
+    with tarfile.open(path, "w:xz") as tar:
+        for name, body in (
+            ("TIMESTAMP", b"2020-01-01"),
+            ("mbdump/artist", data),
+        ):
+            info = tarfile.TarInfo(name)
+            info.size = len(body)
+            tar.addfile(info, io.BytesIO(body))
+
+
+def test_member_entity():
+    assert member_entity("mbdump/artist") == "artist"
+    assert member_entity("mbdump/release-group") == "release-group"
+    assert member_entity("TIMESTAMP") is None
+    assert member_entity("mbdump/unknown") is None
+
+
+def test_ingest(tmp_path):
+    lines = dump_lines()
+    write_dump(tmp_path / "artist.tar.xz", lines)
+    store = LocalStore(tmp_path / "store.db")
+    assert ingest(store, tmp_path / "artist.tar.xz", batch_size=2) == 3
+    assert store.count("artist") == 3
+    artist = store.get("artist", prokofiev_id.upper())
+    assert artist["name"] == "Сергей Сергеевич Прокофьев"
+    assert ("artist", prokofiev_id) in store
+    assert store.get("release", prokofiev_id) is None
+    # finished dumps are skipped
+    assert ingest(store, tmp_path / "artist.tar.xz") == 0
+
+
+def test_ingest_resumes(tmp_path):
+    lines = dump_lines()
+    write_dump(tmp_path / "artist.tar.xz", lines[:2] + [b"{broken"])
+    store = LocalStore(tmp_path / "store.db")
+    with pytest.raises(ValueError):
+        ingest(store, tmp_path / "artist.tar.xz", batch_size=1)
+    assert store.progress("artist.tar.xz", "mbdump/artist") == (2, False)
+    assert store.count() == 2
+
+    write_dump(tmp_path / "artist.tar.xz", lines)
+    assert ingest(store, tmp_path / "artist.tar.xz", batch_size=1) == 1
+    assert store.progress("artist.tar.xz", "mbdump/artist") == (3, True)
+    assert store.count() == 3
+
+
+@pytest.mark.asyncio
+async def test_lookup_local(tmp_path):
+    write_dump(tmp_path / "artist.tar.xz", dump_lines())
+    store = LocalStore(tmp_path / "store.db")
+    ingest(store, tmp_path / "artist.tar.xz")
+    store.close()
+
+    config = Config()
+    config.local_store_path = tmp_path / "store.db"
+    async with fake_session(serve_files, config) as session:
+        artist = await session.lookup_artist(prokofiev_id, ["aliases"])
+        assert artist["name"] == "Сергей Сергеевич Прокофьев"
+        assert session._oauth._client.calls == []
+
+        # releases are not part of the dumps
+        await session.lookup_artist(prokofiev_id, ["releases"])
+        assert len(session._oauth._client.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_lookup_local_models(tmp_path):
+    write_dump(tmp_path / "artist.tar.xz", dump_lines())
+    store = LocalStore(tmp_path / "store.db")
+    ingest(store, tmp_path / "artist.tar.xz")
+    store.close()
+
+    # a session building other models than the stored ones asks the server
+    for setting in ("compact_models", "lazy_models"):
+        config = Config()
+        config.local_store_path = tmp_path / "store.db"
+        setattr(config, setting, True)
+        async with fake_session(serve_files, config) as session:
+            await session.lookup_artist(prokofiev_id, ["aliases"])
+            assert len(session._oauth._client.calls) == 1
+
+    config = Config()
+    config.local_store_path = tmp_path / "store.db"
+    async with fake_session(serve_files, config) as session:
+        artist = await session.lookup_artist(
+            prokofiev_id, ["aliases"], fields=["name"]
+        )
+        assert len(session._oauth._client.calls) == 1
+        assert "alias-list" not in artist
+
+    store = LocalStore(tmp_path / "compact.db")
+    ingest(store, tmp_path / "artist.tar.xz", root=CompactRoot)
+    store.close()
+    config = Config()
+    config.local_store_path = tmp_path / "compact.db"
+    config.compact_models = True
+    async with fake_session(serve_files, config) as session:
+        artist = await session.lookup_artist(prokofiev_id, ["aliases"])
+        assert session._oauth._client.calls == []
+        assert isinstance(artist, Record)
@@ -0,0 +1,47 @@
+from pymusicbrainz import Config
+from pymusicbrainz.entitycache import EntityCache, approximate_size
+import pytest
+
+from .fake import fake_session
+from .test_session import prokofiev_id, serve_files
+
+
+def test_include_superset():
+    cache = EntityCache()
+    entity = {"id": "a"}
+    cache.put("artist", "A", ["aliases", "tags"], entity)
+    assert cache.get("artist", "a", ["aliases"]) is entity
+    assert cache.get("artist", "a", []) is entity
+    assert cache.get("artist", "a", ["genres"]) is None
+    assert cache.get("release", "a", []) is None
+
+    cache.put("artist", "a", ["aliases", "tags", "genres"], entity)
+    assert len(cache) == 1
+
+
+def test_ttl():
+    cache = EntityCache(ttl=0)
+    cache.put("artist", "a", [], {"id": "a"})
+    assert cache.get("artist", "a", []) is None
+
+
+def test_byte_budget():
+    entity = {"name": "x" * 1000}
+    size = approximate_size(entity)
+    assert size > 1000
+    cache = EntityCache(max_size=size * 3)
+    for id in "abcd":
+        cache.put("artist", id, [], dict(entity))
+    assert cache.size <= size * 3
+    assert cache.get("artist", "a", []) is None
+    assert cache.get("artist", "d", []) is not None
+
+
+@pytest.mark.asyncio
+async def test_session_cache():
+    config = Config()
+    config.entity_cache_size = 1024 * 1024
+    async with fake_session(serve_files, config) as session:
+        artist = await session.lookup_artist(prokofiev_id, ["aliases"])
+        assert await session.lookup_artist(prokofiev_id) is artist
+        assert len(session._oauth._client.calls) == 1
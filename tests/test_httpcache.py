@@ -0,0 +1,92 @@
+from pymusicbrainz import Config, LocalRateLimiter
+from pymusicbrainz.httpcache import HTTPCache
+from pymusicbrainz.request import Request
+import pytest
+
+from .fake import FakeClient, FakeResponse
+
+
+async def fetch(request, path, **params):
+    async with await request.get_stream(path, **params) as r:
+        return r.status_code, b"".join(
+            [chunk async for chunk in r.aiter_bytes()]
+        )
+
+
+def make_request(tmp_path, handler, ttl):
+    config = Config()
+    config.http_cache_path = str(tmp_path / "cache")
+    config.http_cache_ttl = ttl
+    client = FakeClient(handler)
+    return client, Request(config, client, LocalRateLimiter(0))
+
+
+def etag_handler(method, url, params, headers):
+    if headers.get("If-None-Match") == '"v1"':
+        return FakeResponse(304)
+    return FakeResponse(200, b"<metadata/>" * 1000, {"ETag": '"v1"'})
+
+
+@pytest.mark.asyncio
+async def test_fresh_hit(tmp_path):
+    client, request = make_request(tmp_path, etag_handler, 3600)
+    first = await fetch(request, "/ws/2/artist/x", inc="aliases")
+    second = await fetch(request, "/ws/2/artist/x", inc="aliases")
+    assert first == second == (200, b"<metadata/>" * 1000)
+    assert len(client.calls) == 1
+
+    await fetch(request, "/ws/2/artist/x", inc="tags")
+    assert len(client.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_revalidation(tmp_path):
+    client, request = make_request(tmp_path, etag_handler, 0)
+    first = await fetch(request, "/ws/2/artist/x")
+    second = await fetch(request, "/ws/2/artist/x")
+    assert first == second == (200, b"<metadata/>" * 1000)
+    assert len(client.calls) == 2
+    assert client.calls[1][3]["If-None-Match"] == '"v1"'
+
+
+@pytest.mark.asyncio
+async def test_errors_are_not_cached(tmp_path):
+    def handler(method, url, params, headers):
+        return FakeResponse(404, b"not found")
+
+    client, request = make_request(tmp_path, handler, 3600)
+    assert (await fetch(request, "/ws/2/artist/x"))[0] == 404
+    assert (await fetch(request, "/ws/2/artist/x"))[0] == 404
+    assert len(client.calls) == 2
+
+
+def test_eviction(tmp_path):
+    cache = HTTPCache(tmp_path, max_size=2500)
+    for i in range(5):
+        key = cache.key(f"/ws/2/artist/{i}", {})
+        body = tmp_path / "body.tmp"
+        body.write_bytes(b"x" * 1000)
+        cache._commit(key, {}, str(body))
+    stored = [cache.get(cache.key(f"/ws/2/artist/{i}", {})) for i in range(5)]
+    assert sum(entry is not None for entry in stored) == 2
+    assert stored[-1] is not None
+
+
+def test_overwrite_size(tmp_path):
+    cache = HTTPCache(tmp_path / "cache", max_size=10000)
+    for body in (b"x" * 3000, b"y" * 4000, b"z" * 4000):
+        tmp = tmp_path / "body.tmp"
+        tmp.write_bytes(body)
+        cache._commit("ab" * 32, {}, str(tmp))
+    assert cache._size == 4000
+    assert cache.get("ab" * 32) is not None
+
+
+def test_cached_content_length(tmp_path):
+    cache = HTTPCache(tmp_path / "cache")
+    tmp = tmp_path / "body.tmp"
+    tmp.write_bytes(b"x" * 3000)
+    cache._commit("ab" * 32, {"ETag": '"v1"'}, str(tmp))
+    response = cache.open(cache.get("ab" * 32))
+    assert response.headers == {"ETag": '"v1"', "Content-Length": "3000"}
+    response._fp.close()
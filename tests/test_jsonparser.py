@@ -0,0 +1,75 @@
+from pymusicbrainz import AsyncSession, Config
+from pymusicbrainz.jsonparser import JSONParser, build_metadata
+from pymusicbrainz.model import Metadata
+from pathlib import Path
+import pytest
+
+from .fake import FakeResponse, fake_session
+from .test_session import prokofiev_id
+
+data_dir = Path(__file__).parent / "data" / "artist"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("compact", [False, True])
+async def test_same_tree(compact):
+    config = Config()
+    config.compact_models = compact
+    async with AsyncSession(config) as session:
+        session.response_format = "json"
+        for path in sorted(data_dir.glob("*.json")):
+            expected = await session._load_xml(path.with_suffix(".xml"))
+            parser = session._parser("artist")
+            assert isinstance(parser, JSONParser)
+            parser.feed(path.read_bytes())
+            metadata = parser.close()
+            assert type(metadata) is type(expected)
+            assert metadata == expected
+
+
+def test_browse():
+    metadata = build_metadata(
+        Metadata,
+        {
+            "release-count": 42,
+            "release-offset": 25,
+            "releases": [
+                {
+                    "id": "00000000-0000-0000-0000-000000000001",
+                    "title": "A",
+                    "status": "Official",
+                    "status-id": "4e304316-386d-3409-af2e-78857eec5cfe",
+                    "score": 100,
+                },
+            ],
+        },
+        "release",
+    )
+    releases = metadata["release-list"]
+    assert releases["count"] == "42"
+    assert releases["offset"] == "25"
+    release = releases["data"][0]
+    assert release["title"] == "A"
+    assert release["status"]["data"] == "Official"
+    assert release["status"]["id"] == "4e304316-386d-3409-af2e-78857eec5cfe"
+    assert release["{http://musicbrainz.org/ns/ext#-2.0}score"] == "100"
+
+
+@pytest.mark.asyncio
+async def test_lookup_json():
+    body = (data_dir / f"{prokofiev_id}-aliases.json").read_bytes()
+
+    def handler(method, url, params, headers):
+        return FakeResponse(200, body)
+
+    async with fake_session(handler) as session:
+        session.response_format = "json"
+        artist = await session.lookup_artist(prokofiev_id, ["aliases"])
+        method, url, params, headers = session._oauth._client.calls[0]
+        assert params == {"inc": "aliases", "fmt": "json"}
+    assert artist["name"] == "Сергей Сергеевич Прокофьев"
+    assert artist["gender"]["data"] == "Male"
+    assert len(artist["alias-list"]["data"]) == 34
+
+    with pytest.raises(ValueError):
+        AsyncSession(response_format="yaml")
@@ -0,0 +1,66 @@
+from pymusicbrainz import AsyncSession, Config, serialize
+from pymusicbrainz.lazy import Lazy
+from pymusicbrainz.parsepool import make_parser
+from pathlib import Path
+import pytest
+
+from .fake import fake_session
+from .test_session import prokofiev_id, serve_files
+
+data_dir = Path(__file__).parent / "data" / "artist"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("compact", [False, True])
+async def test_same_tree(compact):
+    config = Config()
+    config.compact_models = compact
+    async with AsyncSession(config) as eager, AsyncSession(
+        config, lazy=True
+    ) as lazy:
+        for path in sorted(data_dir.glob("*.xml")):
+            expected = await eager._load_xml(path)
+            metadata = await lazy._load_xml(path)
+            assert type(metadata) is type(expected)
+            assert metadata == expected
+            assert expected == metadata
+
+
+@pytest.mark.asyncio
+async def test_materialize_on_access():
+    async with AsyncSession(lazy=True) as session:
+        metadata = await session._load_xml(
+            data_dir / "0e43fe9d-c472-4b62-be9e-55f971a023e1-aliases.xml"
+        )
+    artist = metadata["artist"]
+    aliases = artist["alias-list"]
+    assert aliases["count"] == "34"
+    assert isinstance(dict.__getitem__(aliases.data, "data"), Lazy)
+    assert len(aliases["data"]) == 34
+    assert isinstance(dict.__getitem__(aliases.data, "data"), list)
+    assert aliases["data"][0]["sort-name"]
+
+    data = serialize.loads(serialize.dumps(metadata))
+    assert data == metadata
+
+
+@pytest.mark.asyncio
+async def test_lazy_config():
+    config = Config()
+    config.lazy_models = True
+    async with fake_session(serve_files, config) as session:
+        artist = await session.lookup_artist(prokofiev_id, ["aliases"])
+        assert isinstance(
+            dict.__getitem__(artist["alias-list"].data, "data"), Lazy
+        )
+        assert artist["name"] == "Сергей Сергеевич Прокофьев"
+
+
+def test_lazy_json():
+    config = Config()
+    config.lazy_models = True
+    config.response_format = "json"
+    with pytest.raises(ValueError):
+        AsyncSession(config)
+    with pytest.raises(ValueError):
+        make_parser("artist", (), "json", False, True)
@@ -0,0 +1,70 @@
+from pymusicbrainz.localstore import LocalStore, index_keys
+from pymusicbrainz.parsepool import parse
+import pytest
+
+recording_xml = (
+    b'<metadata xmlns="http://musicbrainz.org/ns/mmd-2.0#">'
+    b'<recording id="b5f600ee-b10e-55f6-86ff-1f1362bb597f">'
+    b"<title>Track</title><artist-credit><name-credit>"
+    b'<artist id="3de1bca3-9b6d-54b0-b554-83ebfc7d733e"><name>A</name>'
+    b"</artist></name-credit></artist-credit>"
+    b'<isrc-list count="2"><isrc id="USRC17607839"/><isrc id="gbaye0000001"/>'
+    b"</isrc-list></recording></metadata>"
+)
+
+artist_id = "3de1bca3-9b6d-54b0-b554-83ebfc7d733e"
+disc_id = "arIS30RPWowvwNEqsqdDnZzDGhk-"
+release_xml = (
+    b'<metadata xmlns="http://musicbrainz.org/ns/mmd-2.0#">'
+    b'<release id="8cfce059-80ab-5a37-a45b-9ab1df0881e3">'
+    b"<title>Release</title><barcode>0123456789012</barcode>"
+    b"<artist-credit><name-credit>"
+    b'<artist id="3DE1BCA3-9B6D-54B0-B554-83EBFC7D733E"><name>A</name>'
+    b'</artist></name-credit></artist-credit><medium-list count="1">'
+    b'<medium><position>1</position><disc-list count="1">'
+    b'<disc id="arIS30RPWowvwNEqsqdDnZzDGhk-"><sectors>1000</sectors></disc>'
+    b"</disc-list></medium></medium-list></release></metadata>"
+)
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_index_keys(compact):
+    recording = parse(recording_xml, "recording", (), "xml", compact)
+    assert index_keys("recording", recording["recording"]) == {
+        ("artist", artist_id),
+        ("isrc", "USRC17607839"),
+        ("isrc", "GBAYE0000001"),
+    }
+    release = parse(release_xml, "release", (), "xml", compact)
+    assert index_keys("release", release["release"]) == {
+        ("artist", artist_id),
+        ("barcode", "0123456789012"),
+        ("discid", disc_id),
+    }
+
+
+def test_find(tmp_path):
+    store = LocalStore(tmp_path / "store.db")
+    recording = parse(recording_xml)["recording"]
+    release = parse(release_xml)["release"]
+    store.put("recording", recording)
+    store.put_many("release", [release])
+
+    assert store.find_ids("isrc", "gbaye0000001") == [
+        ("recording", recording["id"])
+    ]
+    assert store.find("barcode", "0123456789012") == [release]
+    assert store.find("discid", disc_id) == [release]
+    assert sorted(store.find_ids("artist", artist_id.upper())) == [
+        ("recording", recording["id"]),
+        ("release", release["id"]),
+    ]
+    assert store.find_ids("isrc", "USRC17607839", "release") == []
+    with pytest.raises(ValueError):
+        store.find_ids("title", "Track")
+
+    # replacing an entity replaces its keys
+    del recording["isrc-list"]
+    store.put("recording", recording)
+    assert store.find_ids("isrc", "USRC17607839") == []
+    assert store.get("recording", recording["id"]) == recording
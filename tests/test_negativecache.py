@@ -0,0 +1,43 @@
+from pymusicbrainz import Config, NotFound
+from pymusicbrainz.negativecache import NegativeCache
+import pytest
+
+from .fake import fake_session
+from .test_session import serve_files
+
+missing_id = "00000000-0000-0000-0000-000000000000"
+
+
+def test_negative_cache(tmp_path):
+    cache = NegativeCache(ttl=60, path=tmp_path / "missing.db")
+    cache.add("artist", missing_id.upper())
+    assert ("artist", missing_id) in cache
+    assert ("release", missing_id) not in cache
+    cache.close()
+
+    cache = NegativeCache(ttl=60, path=tmp_path / "missing.db")
+    assert ("artist", missing_id) in cache
+    cache.discard("artist", missing_id)
+    assert ("artist", missing_id) not in cache
+
+
+def test_negative_cache_ttl():
+    cache = NegativeCache(ttl=-1)
+    cache.add("artist", missing_id)
+    assert ("artist", missing_id) not in cache
+
+
+@pytest.mark.asyncio
+async def test_session_not_found():
+    config = Config()
+    config.negative_cache_ttl = 60
+    async with fake_session(serve_files, config) as session:
+        for _ in range(3):
+            with pytest.raises(NotFound) as excinfo:
+                await session.lookup_release(missing_id)
+            assert excinfo.value.entity == "release"
+            assert excinfo.value.id == missing_id
+        assert len(session._oauth._client.calls) == 1
+
+        with pytest.raises(ValueError):
+            await session.lookup_release(missing_id + "0")
@@ -0,0 +1,102 @@
+from pymusicbrainz import Config
+from pymusicbrainz.parsepool import ParsePool, parse
+from pathlib import Path
+import pytest
+
+from .fake import fake_session
+from .test_session import prokofiev_id, serve_files
+
+data_dir = Path(__file__).parent / "data" / "artist"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("kind", ["thread", "process"])
+@pytest.mark.parametrize("compact", [False, True])
+async def test_parse(kind, compact):
+    pool = ParsePool(kind, workers=1)
+    try:
+        for path in sorted(data_dir.glob("*.xml")):
+            data = path.read_bytes()
+            args = ("artist", (), "xml", compact, False)
+            expected = parse(data, *args)
+            metadata = await pool.parse(data, *args)
+            assert type(metadata) is type(expected)
+            assert metadata == expected
+    finally:
+        pool.close()
+
+
+@pytest.mark.asyncio
+async def test_threshold():
+    config = Config()
+    config.parse_pool = "thread"
+    config.parse_pool_threshold = 3000
+    async with fake_session(serve_files, config) as session:
+        await session.lookup_artist("2736bad5-6280-4c8f-92c8-27a5e63bbab2")
+        assert session._parse_pool._executor is None
+        artist = await session.lookup_artist(prokofiev_id, ["aliases"])
+        assert session._parse_pool._executor is not None
+        assert artist["name"] == "Сергей Сергеевич Прокофьев"
+
+    with pytest.raises(ValueError):
+        ParsePool("fiber")
+
+
+def record_feeds(monkeypatch):
+    from pymusicbrainz import session as session_module
+
+    fed = []
+    original = session_module.make_parser
+
+    def make_parser(*args):
+        parser = original(*args)
+
+        class Recording(object):
+            def feed(self, data):
+                fed.append(len(data))
+                parser.feed(data)
+
+            def close(self):
+                return parser.close()
+
+        return Recording()
+
+    monkeypatch.setattr(session_module, "make_parser", make_parser)
+    return fed
+
+
+@pytest.mark.asyncio
+async def test_small_responses_stream(monkeypatch):
+    fed = record_feeds(monkeypatch)
+    config = Config()
+    config.parse_pool = "thread"
+    async with fake_session(serve_files, config) as session:
+        artist = await session.lookup_artist(prokofiev_id, ["aliases"])
+        assert session._parse_pool._executor is None
+    assert artist["name"] == "Сергей Сергеевич Прокофьев"
+    # fed chunk by chunk as the fake response yields them
+    assert len(fed) > 1 and max(fed) <= 1024
+
+
+def serve_sized(method, url, params, headers):
+    response = serve_files(method, url, params, headers)
+    response.headers = {"Content-Length": str(len(response._body))}
+    return response
+
+
+@pytest.mark.asyncio
+async def test_known_size(monkeypatch):
+    fed = record_feeds(monkeypatch)
+    config = Config()
+    config.parse_pool = "thread"
+    config.parse_pool_threshold = 3000
+    async with fake_session(serve_sized, config) as session:
+        await session.lookup_artist("2736bad5-6280-4c8f-92c8-27a5e63bbab2")
+        assert session._parse_pool._executor is None
+        assert fed
+        # a body known to be large is only parsed in the pool
+        fed.clear()
+        artist = await session.lookup_artist(prokofiev_id, ["aliases"])
+        assert session._parse_pool._executor is not None
+    assert fed == []
+    assert artist["name"] == "Сергей Сергеевич Прокофьев"
@@ -0,0 +1,122 @@
+from pymusicbrainz import (
+    AsyncSession,
+    Config,
+    FileRateLimiter,
+    LocalRateLimiter,
+)
+from pymusicbrainz.pool import Endpoint, EndpointPool
+from pymusicbrainz.ratelimit import get_endpoint_rate_limiter
+from pymusicbrainz.request import Request
+from pymusicbrainz.retry import RetryPolicy
+import pytest
+
+from .fake import FakeClient, FakeResponse
+
+
+def make_config():
+    config = Config()
+    config.servers = [
+        {
+            "host": "mirror1",
+            "port": 5000,
+            "scheme": "http",
+            "rate_limit_interval": 0,
+            "max_outstanding": 2,
+        },
+        {
+            "host": "mirror2",
+            "port": 5000,
+            "scheme": "http",
+            "rate_limit_interval": 0,
+            "max_outstanding": 2,
+        },
+        {"host": "musicbrainz.org", "rate_limit_interval": 0, "overflow": True},
+    ]
+    return config
+
+
+def test_least_outstanding():
+    pool = EndpointPool.from_config(make_config())
+    mirror1, mirror2, public = pool.endpoints
+    assert pool.select() is mirror1
+    mirror1.outstanding = 1
+    assert pool.select() is mirror2
+    mirror2.outstanding = 2
+    assert pool.select() is mirror1
+    mirror1.outstanding = 2
+    assert pool.select() is public
+
+
+def test_endpoint_rate_limiter(tmp_path):
+    limiter = get_endpoint_rate_limiter("musicbrainz.org", 443, 1)
+    assert limiter is get_endpoint_rate_limiter("musicbrainz.org", 443, 1)
+    assert isinstance(limiter, LocalRateLimiter)
+    assert get_endpoint_rate_limiter("localhost", 5000, 1) is not limiter
+
+    path = str(tmp_path / "ratelimit")
+    limiter = get_endpoint_rate_limiter("musicbrainz.org", 443, 1, path=path)
+    assert isinstance(limiter, FileRateLimiter)
+
+
+def test_rate_limiter_with_servers():
+    config = make_config()
+    with pytest.raises(ValueError):
+        EndpointPool.from_config(config, LocalRateLimiter(0))
+    del config.servers
+    rate_limiter = LocalRateLimiter(0)
+    (home,) = EndpointPool.from_config(config, rate_limiter).endpoints
+    assert home.rate_limiter is rate_limiter
+
+
+def test_session_rate_limiter_with_servers():
+    with pytest.raises(ValueError):
+        AsyncSession(make_config(), rate_limiter=LocalRateLimiter(0))
+
+
+def test_failover():
+    pool = EndpointPool.from_config(make_config())
+    mirror1, mirror2, public = pool.endpoints
+    for _ in range(Endpoint.failure_threshold):
+        mirror1.failed()
+    assert not mirror1.is_up()
+    assert pool.select() is mirror2
+    for _ in range(Endpoint.failure_threshold):
+        mirror2.failed()
+    assert pool.select() is public
+    mirror1.succeeded()
+    assert pool.select() is mirror1
+
+
+@pytest.mark.asyncio
+async def test_request_spreads_over_mirrors():
+    def handler(method, url, params, headers):
+        if url.startswith("http://mirror1"):
+            return FakeResponse(503)
+        return FakeResponse(200, b"ok")
+
+    client = FakeClient(handler)
+    request = Request(
+        make_config(), client, retry_policy=RetryPolicy(backoff=0.001)
+    )
+    async with await request.get_stream("/ws/2/artist/x") as r:
+        assert r.status_code == 200
+    urls = [call[1] for call in client.calls]
+    assert urls == [
+        "http://mirror1:5000/ws/2/artist/x",
+        "http://mirror2:5000/ws/2/artist/x",
+    ]
+    assert all(e.outstanding == 0 for e in request.pool.endpoints)
+
+
+@pytest.mark.asyncio
+async def test_credentials_go_home():
+    def handler(method, url, params, headers):
+        return FakeResponse(200, b"ok")
+
+    config = make_config()
+    config.access_token = "secret"
+    config.rate_limit_interval = 0
+    client = FakeClient(handler)
+    request = Request(config, client)
+    await request.get("/ws/2/artist/x")
+    assert client.calls[0][1] == "https://musicbrainz.org:443/ws/2/artist/x"
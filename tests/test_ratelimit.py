@@ -0,0 +1,47 @@
+from pymusicbrainz import Config, RateLimiter, LocalRateLimiter, FileRateLimiter
+from pymusicbrainz.ratelimit import get_rate_limiter
+import pytest
+
+
+def test_local_rate_limiter():
+    limiter = LocalRateLimiter(10)
+    assert limiter.reserve() == 0
+    assert 9 < limiter.reserve() <= 10
+    assert 19 < limiter.reserve() <= 20
+
+
+def test_local_rate_limiter_burst():
+    limiter = LocalRateLimiter(10, burst=3)
+    assert [limiter.reserve() for _ in range(3)] == [0, 0, 0]
+    assert 9 < limiter.reserve() <= 10
+
+
+def test_file_rate_limiter_is_shared(tmp_path):
+    path = tmp_path / "ratelimit"
+    first = FileRateLimiter(path, 10)
+    second = FileRateLimiter(path, 10)
+    assert first.reserve() == 0
+    assert 9 < second.reserve() <= 10
+    assert 19 < first.reserve() <= 20
+
+
+def test_get_rate_limiter(tmp_path):
+    config = Config()
+    assert get_rate_limiter(config) is get_rate_limiter(Config())
+    assert isinstance(get_rate_limiter(config), LocalRateLimiter)
+
+    config.rate_limit_file = str(tmp_path / "ratelimit")
+    assert isinstance(get_rate_limiter(config), FileRateLimiter)
+
+
+@pytest.mark.asyncio
+async def test_acquire():
+    limiter = LocalRateLimiter(0.01)
+    for _ in range(3):
+        await limiter.acquire()
+    assert limiter.reserve() > 0
+
+
+def test_rate_limiter_is_abstract():
+    with pytest.raises(TypeError):
+        RateLimiter(1)
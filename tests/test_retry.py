@@ -0,0 +1,87 @@
+from pymusicbrainz import Config, LocalRateLimiter, ResponseError
+from pymusicbrainz.request import Request
+from pymusicbrainz.retry import RetryPolicy
+from httpx.exceptions import NetworkError
+import pytest
+
+from .fake import FakeClient, FakeResponse
+
+
+def make_request(handler, retries=3):
+    client = FakeClient(handler)
+    request = Request(
+        Config(),
+        client,
+        LocalRateLimiter(0),
+        RetryPolicy(retries=retries, backoff=0.001, backoff_max=0.001),
+    )
+    return client, request
+
+
+def test_retry_after():
+    assert RetryPolicy.retry_after({}) is None
+    assert RetryPolicy.retry_after({"Retry-After": "3"}) == 3
+    assert RetryPolicy.retry_after({"Retry-After": "garbage"}) is None
+    past = "Wed, 21 Oct 2015 07:28:00 GMT"
+    assert RetryPolicy.retry_after({"Retry-After": past}) == 0
+
+
+def test_delay():
+    policy = RetryPolicy(backoff=1, backoff_max=4)
+    for attempt in range(10):
+        assert 0 <= policy.delay(attempt) <= 4
+    assert policy.delay(0, retry_after=2) >= 2
+
+
+@pytest.mark.asyncio
+async def test_retry_on_503():
+    statuses = [503, 503, 200]
+
+    def handler(method, url, params, headers):
+        return FakeResponse(statuses.pop(0), b"ok", {"Retry-After": "0"})
+
+    client, request = make_request(handler)
+    async with await request.get_stream("/ws/2/artist") as r:
+        assert r.status_code == 200
+    assert len(client.calls) == 3
+    assert request.rate_limiter.scale > 1
+
+
+@pytest.mark.asyncio
+async def test_retry_exhausted():
+    def handler(method, url, params, headers):
+        return FakeResponse(503)
+
+    client, request = make_request(handler, retries=2)
+    with pytest.raises(ResponseError) as excinfo:
+        await request.get("/ws/2/artist")
+    assert excinfo.value.status_code == 503
+    assert len(client.calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_retry_network_error():
+    failures = [NetworkError("boom")]
+
+    def handler(method, url, params, headers):
+        if failures:
+            raise failures.pop()
+        return FakeResponse(404)
+
+    client, request = make_request(handler)
+    response = await request.get("/ws/2/artist")
+    assert response.status_code == 404
+    assert len(client.calls) == 2
+
+
+def test_rate_limiter_feedback():
+    limiter = LocalRateLimiter(1)
+    limiter.penalize()
+    limiter.penalize()
+    assert limiter.scale == 4
+    for _ in range(100):
+        limiter.relax()
+    assert limiter.scale == 1
+
+    limiter.penalize(retry_after=30)
+    assert limiter.reserve() > 29
@@ -0,0 +1,69 @@
+from pymusicbrainz import LocalRateLimiter, Priority
+from pymusicbrainz.scheduler import Scheduler, get_scheduler
+import asyncio
+import pytest
+
+
+async def run(scheduler, order, name, priority, caller):
+    await scheduler.acquire(priority, caller)
+    order.append(name)
+
+
+@pytest.mark.asyncio
+async def test_priority():
+    scheduler = Scheduler(LocalRateLimiter(0.01))
+    order = []
+    tasks = [
+        asyncio.ensure_future(
+            run(scheduler, order, f"bulk{i}", Priority.bulk, "crawler")
+        )
+        for i in range(4)
+    ]
+    await asyncio.sleep(0.015)
+    tasks.append(
+        asyncio.ensure_future(
+            run(scheduler, order, "ui", Priority.interactive, "ui")
+        )
+    )
+    await asyncio.gather(*tasks)
+    assert order.index("ui") < 3
+    assert [name for name in order if name != "ui"] == [
+        f"bulk{i}" for i in range(4)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_fair_between_callers():
+    scheduler = Scheduler(LocalRateLimiter(0))
+    order = []
+    tasks = [
+        asyncio.ensure_future(
+            run(scheduler, order, caller, Priority.normal, caller)
+        )
+        for caller in ["a", "a", "a", "b", "b", "b"]
+    ]
+    await asyncio.gather(*tasks)
+    assert order == ["a", "b", "a", "b", "a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter():
+    scheduler = Scheduler(LocalRateLimiter(0.01))
+    order = []
+    first = asyncio.ensure_future(
+        run(scheduler, order, "first", Priority.normal, None)
+    )
+    second = asyncio.ensure_future(
+        run(scheduler, order, "second", Priority.normal, None)
+    )
+    await asyncio.sleep(0)
+    second.cancel()
+    await first
+    assert order == ["first"]
+    assert second.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_get_scheduler():
+    limiter = LocalRateLimiter(0)
+    assert get_scheduler(limiter) is get_scheduler(limiter)
@@ -0,0 +1,70 @@
+from pymusicbrainz import AsyncSession, Config, serialize
+from pymusicbrainz.model import Direction
+from pymusicbrainz.parsedcache import ParsedCache
+from pathlib import Path
+import pytest
+
+from .fake import fake_session
+from .test_session import prokofiev_id, serve_files
+
+data_dir = Path(__file__).parent / "data" / "artist"
+
+
+def assert_same_tree(a, b):
+    assert type(a) is type(b)
+    if isinstance(a, list):
+        assert len(a) == len(b)
+        for x, y in zip(a, b):
+            assert_same_tree(x, y)
+    elif hasattr(a, "keys"):
+        assert list(a.keys()) == list(b.keys())
+        for key in a:
+            assert_same_tree(a[key], b[key])
+    else:
+        assert a == b
+
+
+@pytest.mark.asyncio
+async def test_round_trip():
+    async with AsyncSession() as session:
+        for path in sorted(data_dir.glob("*.xml")):
+            metadata = await session._load_xml(path)
+            data = serialize.dumps(metadata)
+            assert_same_tree(serialize.loads(data), metadata)
+
+        metadata = await session._load_xml(
+            data_dir / "b3785a55-2cf6-497d-b8e3-cfa21a36f997-artist-rels.xml"
+        )
+        relation = metadata["artist"]["relation-list"][0]["data"][0]
+        assert (
+            serialize.loads(serialize.dumps(relation))["direction"]
+            is Direction.backward
+        )
+
+
+def test_schema_mismatch():
+    data = bytearray(serialize.dumps({"a": 1}))
+    data[len(serialize.MAGIC)] += 1
+    assert not serialize.is_current(data)
+    with pytest.raises(ValueError):
+        serialize.loads(bytes(data))
+
+
+def test_parsed_cache_ttl(tmp_path):
+    cache = ParsedCache(tmp_path / "parsed.db", ttl=-1)
+    cache.put("key", {"a": 1})
+    assert cache.get("key") is None
+    cache.ttl = None
+    assert cache.get("key") == {"a": 1}
+
+
+@pytest.mark.asyncio
+async def test_warm_restart(tmp_path):
+    config = Config()
+    config.parsed_cache_path = str(tmp_path / "parsed.db")
+    async with fake_session(serve_files, config) as session:
+        cold = await session.lookup_artist(prokofiev_id, ["aliases"])
+    async with fake_session(serve_files, config) as session:
+        warm = await session.lookup_artist(prokofiev_id, ["aliases"])
+        assert not session._oauth._client.calls
+    assert_same_tree(warm, cold)
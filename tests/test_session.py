@@ -0,0 +1,359 @@
+from pymusicbrainz import Config, ResponseError
+from pymusicbrainz.checkpoint import Checkpoint
+from pymusicbrainz.model import StreamParser
+from pymusicbrainz.session import item_score
+from xml.etree import ElementTree as etree
+from pathlib import Path
+import asyncio
+import pytest
+
+from .fake import FakeResponse, fake_session
+
+data_dir = Path(__file__).parent / "data" / "artist"
+prokofiev_id = "0e43fe9d-c472-4b62-be9e-55f971a023e1"
+
+
+def serve_files(method, url, params, headers):
+    id = url.rsplit("/", 1)[-1]
+    for path in data_dir.glob(f"{id}-*.xml"):
+        return FakeResponse(200, path.read_bytes())
+    return FakeResponse(404, b"")
+
+
+@pytest.mark.asyncio
+async def test_lookup():
+    async with fake_session(serve_files) as session:
+        artist = await session.lookup_artist(prokofiev_id, ["aliases"])
+        assert artist["name"] == "Сергей Сергеевич Прокофьев"
+        method, url, params, headers = session._oauth._client.calls[0]
+        assert url.endswith(f"/ws/2/artist/{prokofiev_id}")
+        assert params == {"inc": "aliases"}
+
+        with pytest.raises(ResponseError):
+            await session.lookup_artist("00000000-0000-0000-0000-000000000000")
+
+
+@pytest.mark.asyncio
+async def test_lookup_single_flight():
+    async with fake_session(serve_files) as session:
+        artists = await asyncio.gather(
+            session.lookup_artist(prokofiev_id, ["aliases"]),
+            session.lookup_artist(prokofiev_id.upper(), ["aliases"]),
+            session.lookup_artist(prokofiev_id, ["aliases", "aliases"]),
+        )
+        assert all(artist is artists[0] for artist in artists)
+        assert len(session._oauth._client.calls) == 1
+
+        await session.lookup_artist(prokofiev_id, ["aliases"])
+        assert len(session._oauth._client.calls) == 2
+
+
+def artist_with_releases(count):
+    releases = "".join(
+        f'<release id="00000000-0000-0000-0000-{i:012d}">'
+        f"<title>Release {i}</title></release>"
+        for i in range(count)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<metadata xmlns="http://musicbrainz.org/ns/mmd-2.0#">'
+        f'<artist id="{prokofiev_id}"><name>Prokofiev</name>'
+        f'<release-list count="{count}">{releases}</release-list>'
+        "</artist></metadata>"
+    ).encode()
+
+
+def test_stream_parser_nested_lists():
+    releases = "".join(
+        f'<release id="00000000-0000-0000-0000-{i:012d}">'
+        f"<title>Release {i}</title>"
+        '<label-info-list count="1"><label-info>'
+        "<catalog-number>CAT</catalog-number>"
+        "</label-info></label-info-list></release>"
+        for i in range(3)
+    )
+    target = StreamParser()
+    parser = etree.XMLParser(target=target)
+    parser.feed(
+        '<metadata xmlns="http://musicbrainz.org/ns/mmd-2.0#">'
+        f'<release-list count="3">{releases}</release-list></metadata>'
+    )
+    items = target.pop_items()
+    assert [item.tag for item in items] == ["release-list"] * 3
+    label_info = items[0].item["label-info-list"]["data"][0]
+    assert label_info["catalog-number"] == "CAT"
+
+
+@pytest.mark.asyncio
+async def test_stream_lookup():
+    response = FakeResponse(200, artist_with_releases(200))
+    chunks = []
+
+    async def aiter_bytes():
+        async for chunk in FakeResponse.aiter_bytes(response):
+            chunks.append(chunk)
+            yield chunk
+
+    response.aiter_bytes = aiter_bytes
+    async with fake_session(lambda *args: response) as session:
+        items = []
+        async for item in session.stream_lookup(
+            "artist", prokofiev_id, ["releases"]
+        ):
+            if not items:
+                first_seen_after = len(chunks)
+            items.append(item)
+    assert first_seen_after < len(chunks)
+    releases, (artist,) = items[:-1], items[-1:]
+    assert [item.tag for item in releases] == ["release-list"] * 200
+    assert releases[0].attrs == {"count": "200"}
+    assert releases[7].item["title"] == "Release 7"
+    assert artist.tag == "artist"
+    assert artist.item["name"] == "Prokofiev"
+    assert artist.item["release-list"]["data"] == []
+
+    async with fake_session(serve_files) as session:
+        with pytest.raises(ValueError):
+            async for item in session.stream_lookup(
+                "artist", prokofiev_id, ["x"]
+            ):
+                pass
+
+
+@pytest.mark.asyncio
+async def test_lookup_fields():
+    exo_id = "b3785a55-2cf6-497d-b8e3-cfa21a36f997"
+    async with fake_session(serve_files) as session:
+        artist = await session.lookup_artist(
+            exo_id,
+            ["artist-rels"],
+            fields=["id", "name", "relation-list/artist"],
+        )
+        assert set(artist) == {"id", "type", "type-id", "name", "relation-list"}
+        relation = artist["relation-list"][0]["data"][0]
+        assert set(relation) == {"type", "type-id", "artist"}
+        assert relation["artist"]["name"] == "鹿晗"
+
+        full = await session.lookup_artist(exo_id, ["artist-rels"])
+        assert "life-span" in full
+        assert len(session._oauth._client.calls) == 2
+
+        with pytest.raises(ValueError):
+            await session.lookup_artist(exo_id, fields=["no-such-field"])
+        with pytest.raises(ValueError):
+            await session.lookup_artist(exo_id, fields=["name/data"])
+
+
+@pytest.mark.asyncio
+async def test_lookup_many():
+    missing_id = "00000000-0000-0000-0000-000000000000"
+    ids = [path.name[:36] for path in sorted(data_dir.glob("*.xml"))]
+    pulled = []
+
+    def source():
+        for id in [ids[0], ids[0].upper(), *ids[1:], missing_id]:
+            pulled.append(id)
+            yield id
+
+    async with fake_session(serve_files) as session:
+        results = {}
+        async for id, result in session.lookup_many(
+            "artist", source(), ["aliases"], max_in_flight=2
+        ):
+            if not results:
+                assert len(pulled) == 3
+            results[id] = result
+        assert len(session._oauth._client.calls) == 4
+    assert set(results) == {*ids, missing_id}
+    assert results[prokofiev_id]["name"] == "Сергей Сергеевич Прокофьев"
+    assert isinstance(results[missing_id], ResponseError)
+
+
+@pytest.mark.asyncio
+async def test_lookup_many_none_and_cancelled(tmp_path):
+    async with fake_session(serve_files) as session:
+        results = [
+            result
+            async for result in session.lookup_many(
+                "artist", [None, prokofiev_id]
+            )
+        ]
+    assert {id for id, _ in results} == {None, prokofiev_id}
+    assert isinstance(dict(results)[None], Exception)
+
+    async def cancelled(*args):
+        raise asyncio.CancelledError()
+
+    checkpoint = Checkpoint(tmp_path / "many.db")
+    async with fake_session(serve_files) as session:
+        session.lookup = cancelled
+        results = [
+            result
+            async for result in session.lookup_many(
+                "artist", [prokofiev_id], checkpoint=checkpoint
+            )
+        ]
+    assert len(results) == 1
+    assert isinstance(results[0][1], asyncio.CancelledError)
+    assert checkpoint.completed() == set()
+    checkpoint.close()
+
+
+def serve_recording_browse(count):
+    def handler(method, url, params, headers):
+        offset, limit = int(params["offset"]), int(params["limit"])
+        recordings = "".join(
+            f'<recording id="00000000-0000-0000-0000-{i:012d}">'
+            f"<title>Recording {i}</title></recording>"
+            for i in range(offset, min(offset + limit, count))
+        )
+        return FakeResponse(
+            200,
+            (
+                '<?xml version="1.0" encoding="UTF-8"?>'
+                '<metadata xmlns="http://musicbrainz.org/ns/mmd-2.0#">'
+                f'<recording-list count="{count}" offset="{offset}">'
+                f"{recordings}</recording-list></metadata>"
+            ).encode(),
+        )
+
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_browse():
+    async with fake_session(serve_recording_browse(250)) as session:
+        titles = []
+        async for recording in session.browse_recording(
+            "artist", prokofiev_id, ["isrcs"], limit=100
+        ):
+            if len(titles) == 100:
+                # the following pages were requested along with the second
+                assert len(session._oauth._client.calls) == 3
+            titles.append(recording["title"])
+        assert titles == [f"Recording {i}" for i in range(250)]
+        calls = session._oauth._client.calls
+        assert [params["offset"] for _, _, params, _ in calls] == [
+            "0",
+            "100",
+            "200",
+        ]
+        method, url, params, headers = calls[0]
+        assert url.endswith("/ws/2/recording")
+        assert params["artist"] == prokofiev_id
+        assert params["inc"] == "isrcs"
+
+        with pytest.raises(ValueError):
+            async for recording in session.browse_recording("label", "x"):
+                pass
+        with pytest.raises(ValueError):
+            async for recording in session.browse_recording(
+                "artist", prokofiev_id, limit=101
+            ):
+                pass
+
+
+@pytest.mark.asyncio
+async def test_browse_includes():
+    async with fake_session(serve_recording_browse(1)) as session:
+        async for recording in session.browse_recording(
+            "artist", prokofiev_id, ["isrcs", "artist-rels"]
+        ):
+            pass
+        # releases are a lookup include, not a browse include
+        with pytest.raises(ValueError):
+            async for recording in session.browse_recording(
+                "artist", prokofiev_id, ["releases"]
+            ):
+                pass
+        with pytest.raises(ValueError):
+            async for artist in session.browse_artist(
+                "area", prokofiev_id, ["release-groups"]
+            ):
+                pass
+        assert len(session._oauth._client.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_browse_url():
+    resource = "https://www.wikidata.org/wiki/Q47"
+    url_id = "00000000-0000-0000-0000-000000000001"
+
+    def handler(method, url, params, headers):
+        if params["resource"] != resource:
+            return FakeResponse(404, b"")
+        return FakeResponse(
+            200,
+            (
+                '<metadata xmlns="http://musicbrainz.org/ns/mmd-2.0#">'
+                f'<url id="{url_id}"><resource>{resource}</resource></url>'
+                "</metadata>"
+            ).encode(),
+        )
+
+    async with fake_session(handler) as session:
+        urls = [url async for url in session.browse_url("resource", resource)]
+        assert [url["id"] for url in urls] == [url_id]
+        method, url, params, headers = session._oauth._client.calls[0]
+        assert url.endswith("/ws/2/url")
+        assert "offset" not in params
+        assert [
+            url async for url in session.browse_url("resource", "https://x")
+        ] == []
+
+
+def serve_artist_search(count):
+    def handler(method, url, params, headers):
+        offset, limit = int(params["offset"]), int(params["limit"])
+        artists = "".join(
+            f'<artist id="00000000-0000-0000-0000-{i:012d}" ext:score="{100 - i}">'
+            f"<name>Artist {i}</name></artist>"
+            for i in range(offset, min(offset + limit, count))
+        )
+        return FakeResponse(
+            200,
+            (
+                '<?xml version="1.0" encoding="UTF-8"?>'
+                '<metadata xmlns="http://musicbrainz.org/ns/mmd-2.0#"'
+                ' xmlns:ext="http://musicbrainz.org/ns/ext#-2.0"'
+                ' created="2020-01-01T00:00:00.000Z">'
+                f'<artist-list count="{count}" offset="{offset}">'
+                f"{artists}</artist-list></metadata>"
+            ).encode(),
+        )
+
+    return handler
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("compact", [False, True])
+async def test_search(compact):
+    config = Config()
+    config.compact_models = compact
+    async with fake_session(serve_artist_search(60), config) as session:
+        names = [
+            artist["name"]
+            async for artist in session.search_artist("prokofiev", limit=25)
+        ]
+        assert names == [f"Artist {i}" for i in range(60)]
+        calls = session._oauth._client.calls
+        assert [params["offset"] for _, _, params, _ in calls] == [
+            "0",
+            "25",
+            "50",
+        ]
+        assert calls[0][1].endswith("/ws/2/artist")
+        assert calls[0][2]["query"] == "prokofiev"
+
+    async with fake_session(serve_artist_search(60), config) as session:
+        artists = [
+            artist
+            async for artist in session.search_artist(
+                "prokofiev", limit=25, min_score=80
+            )
+        ]
+        assert [item_score(artist) for artist in artists] == list(
+            range(100, 79, -1)
+        )
+        # the cut-off came within the first page
+        assert len(session._oauth._client.calls) == 1